@@ -0,0 +1,239 @@
+"""Weekly room utilisation: occupancy per room and building, peak hours and idle rooms.
+
+build_utilisation() takes the timetable parsed once by loader.load_timetable()
+and builds a minute-resolution occupancy bitmap for every room and day over
+the room finder's opening hours with NumPy: each class adds +1 at its start
+minute and -1 at its end minute of one flat int32 array (np.add.at), and
+a cumulative sum along the minutes, in place, gives how many classes hold
+the room at each minute. Every report is a reduction of that bitmap, computed once:
+
+    booked[d, r]     minutes room r is in use on day d
+    in_use[d, m]     rooms in use at minute m of day d
+
+Classes hold their room from start to end, half-open: 9:00-10:00 is sixty
+minutes. Parts of a class outside opening hours are not counted.
+
+    python analytics.py --csv room-usage.csv --json usage.json --heatmap usage.png
+"""
+import argparse
+import csv
+import json
+
+import numpy as np
+
+import metrics
+from availability import DAYS, format_clock
+from free_time import DAY_END, DAY_START
+from room_search import room_building
+
+
+class Utilisation:
+    """Occupancy bitmap of shape (days, rooms, minutes) and the reports reduced from it.
+
+    `occupied[d, r, m]` is True when `rooms[r]` has a class at minute
+    `day_start + m` on `days[d]`.
+    """
+
+    def __init__(self, occupied, days, rooms, buildings, day_start=DAY_START):
+        self.occupied = occupied
+        self.days = list(days)
+        self.rooms = list(rooms)
+        self.buildings = list(buildings)
+        self.day_start = day_start
+        self.minutes = occupied.shape[2]
+        self.day_end = day_start + self.minutes
+
+        self.booked = occupied.sum(axis=2)
+        self.in_use = occupied.sum(axis=1)
+
+        # Whole hours from opening; a last partial hour is averaged over its own minutes
+        hour_starts = np.arange(0, self.minutes, 60)
+        self.hours = [format_clock(day_start + m) for m in hour_starts.tolist()]
+        hour_minutes = np.diff(np.append(hour_starts, self.minutes))
+        if self.minutes:
+            in_use_by_hour = np.add.reduceat(self.in_use, hour_starts, axis=1)
+        else:
+            in_use_by_hour = np.zeros((len(self.days), 0))
+        # Share of rooms in use, averaged over the minutes of each hour: (days, hours)
+        self.hourly_load = in_use_by_hour / np.maximum(hour_minutes * max(1, len(self.rooms)), 1)
+
+        self.room_occupancy = self.booked.sum(axis=0) / max(1, self.minutes * len(self.days))
+        self.day_occupancy = self.booked / max(1, self.minutes)
+        self.idle = self.booked == 0
+
+    def building_occupancy(self):
+        """{building: share of its room-minutes in use over the week}."""
+        names, index = np.unique(np.array(self.buildings, dtype=str), return_inverse=True)
+        booked = np.bincount(index, weights=self.booked.sum(axis=0), minlength=len(names))
+        rooms = np.bincount(index, minlength=len(names))
+        return dict(zip(names.tolist(), (booked / np.maximum(rooms * self.minutes * len(self.days), 1)).tolist()))
+
+    def peak_hours(self):
+        """{day: (hour, share of rooms in use)} for the busiest hour of each day; days without classes are left out."""
+        if not self.hours:
+            return {}
+        busiest = self.hourly_load.argmax(axis=1).tolist()
+        return {
+            day: (self.hours[h], float(self.hourly_load[d, h]))
+            for d, (day, h) in enumerate(zip(self.days, busiest)) if self.hourly_load[d, h] > 0
+        }
+
+    def idle_rooms(self):
+        """{day: rooms with no class that day}."""
+        return {day: [self.rooms[r] for r in np.flatnonzero(self.idle[d]).tolist()] for d, day in enumerate(self.days)}
+
+    def to_dict(self):
+        """Every report as plain data (percentages), ready for json.dumps."""
+        return {
+            "days": self.days,
+            "day_start": format_clock(self.day_start),
+            "day_end": format_clock(self.day_end),
+            "rooms": [
+                {
+                    "room": room,
+                    "building": building,
+                    "booked_minutes": booked,
+                    "occupancy_pct": round(100 * share, 2),
+                    "by_day_pct": dict(zip(self.days, np.round(100 * by_day, 2).tolist())),
+                }
+                for room, building, booked, share, by_day in zip(
+                    self.rooms, self.buildings, self.booked.sum(axis=0).tolist(), self.room_occupancy.tolist(),
+                    self.day_occupancy.T,
+                )
+            ],
+            "buildings_pct": {name: round(100 * share, 2) for name, share in self.building_occupancy().items()},
+            "hourly_load_pct": {
+                day: dict(zip(self.hours, np.round(100 * load, 2).tolist())) for day, load in zip(self.days, self.hourly_load)
+            },
+            "peak_hours": {day: {"hour": hour, "load_pct": round(100 * load, 2)} for day, (hour, load) in self.peak_hours().items()},
+            "idle_rooms": self.idle_rooms(),
+        }
+
+    def save_json(self, path):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def save_csv(self, path):
+        """One row per room: booked minutes and occupancy over the week and per day, in percent."""
+        week = np.round(100 * self.room_occupancy, 2).tolist()
+        by_day = np.round(100 * self.day_occupancy.T, 2).tolist()
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["room", "building", "booked_minutes", "occupancy_pct", *(f"{day}_pct" for day in self.days)])
+            for row in zip(self.rooms, self.buildings, self.booked.sum(axis=0).tolist(), week, by_day):
+                writer.writerow([*row[:4], *row[4]])
+
+    def heatmap(self, bucket=15):
+        """(days, buckets) share of rooms in use, averaged over `bucket`-minute columns."""
+        starts = np.arange(0, self.minutes, bucket)
+        if not len(starts):
+            return np.zeros((len(self.days), 0))
+        sums = np.add.reduceat(self.in_use, starts, axis=1)
+        return sums / (np.diff(np.append(starts, self.minutes)) * max(1, len(self.rooms)))
+
+    def save_heatmap(self, path, bucket=15, cell=(16, 28)):
+        """Render the day x time heatmap to an image file; no display is needed.
+
+        White is idle and dark blue every room in use; each column is
+        `bucket` minutes and each cell `cell` (width, height) pixels.
+        """
+        from PIL import Image, ImageDraw
+
+        load = np.clip(self.heatmap(bucket), 0, 1)
+        # White -> dark blue
+        low, high = np.array([255, 255, 255]), np.array([0, 51, 153])
+        colours = (low + (high - low) * load[..., None]).astype(np.uint8)
+        cells = np.repeat(np.repeat(colours, cell[1], axis=0), cell[0], axis=1)
+
+        left, top = 90, 24
+        image = Image.new("RGB", (left + cells.shape[1] + 10, top + cells.shape[0] + 10), "white")
+        image.paste(Image.fromarray(cells), (left, top))
+        draw = ImageDraw.Draw(image)
+        for d, day in enumerate(self.days):
+            draw.text((6, top + d * cell[1] + cell[1] // 3), day, fill="black")
+        for h, hour in enumerate(self.hours):
+            x = left + h * (60 // bucket) * cell[0]
+            draw.line([(x, top - 4), (x, top)], fill="black")
+            draw.text((x + 2, 4), hour, fill="black")
+        image.save(path)
+
+
+@metrics.timed("build_utilisation")
+def build_utilisation(table, all_rooms, days=DAYS, day_start=DAY_START, day_end=DAY_END):
+    """Utilisation of every room in rooms.csv (and any other room in the timetable) on `days`.
+
+    `table` is a loader.TimetableTable, e.g. from load_timetable() or a snapshot.
+    """
+    rows = {}
+    for row in all_rooms:
+        rows.setdefault(row["room"], row)
+    for room in table.rooms:
+        rows.setdefault(room, {"room": room})
+    rooms = list(rows)
+    room_index = {room: i for i, room in enumerate(rooms)}
+    day_index = {day.lower(): i for i, day in enumerate(days)}
+    width = max(0, day_end - day_start)
+
+    # Table codes -> bitmap indexes; days the report leaves out map to -1
+    room_of = np.array([room_index[room] for room in table.rooms], dtype=np.int64)
+    day_of = np.array([day_index.get(day.lower(), -1) for day in table.days], dtype=np.int64)
+    room = room_of[np.asarray(table.room)] if len(table) else np.zeros(0, dtype=np.int64)
+    day = day_of[np.asarray(table.day)] if len(table) else np.zeros(0, dtype=np.int64)
+    start = np.clip(np.asarray(table.start, dtype=np.int64) - day_start, 0, width)
+    end = np.clip(np.asarray(table.end, dtype=np.int64) - day_start, 0, width)
+    keep = (day >= 0) & (end > start)
+    room, day, start, end = room[keep], day[keep], start[keep], end[keep]
+
+    # +1 at each start and -1 at each end of one flat (days, rooms, width + 1)
+    # int32 array, summed in place: the only full-size arrays are that one
+    # and the bool bitmap
+    changes = np.zeros(len(days) * len(rooms) * (width + 1), dtype=np.int32)
+    base = (day * len(rooms) + room) * (width + 1)
+    np.add.at(changes, base + start, 1)
+    np.add.at(changes, base + end, -1)
+    changes = changes.reshape(len(days), len(rooms), width + 1)
+    np.cumsum(changes, axis=2, out=changes)
+    occupied = changes[..., :width] > 0
+    return Utilisation(occupied, days, rooms, [room_building(rows[name]) for name in rooms], day_start)
+
+
+def main():
+    import core
+    from loader import load_timetable
+
+    parser = argparse.ArgumentParser(description="Weekly room utilisation from timetable.csv and rooms.csv")
+    parser.add_argument("--timetable", default=core.TIMETABLE_FILE)
+    parser.add_argument("--rooms", default=core.ROOMS_FILE)
+    parser.add_argument("--csv", help="write per-room occupancy here")
+    parser.add_argument("--json", help="write every report here")
+    parser.add_argument("--heatmap", help="write the day x time heatmap here (.png)")
+    parser.add_argument("--top", type=int, default=5, help="busiest rooms listed")
+    args = parser.parse_args()
+
+    with open(args.rooms, mode="r", newline="") as file:
+        all_rooms = list(csv.DictReader(file))
+    usage = build_utilisation(load_timetable(args.timetable), all_rooms)
+
+    print(f"{len(usage.rooms)} rooms, {format_clock(usage.day_start)} - {format_clock(usage.day_end)}, "
+          f"{100 * usage.room_occupancy.mean():.1f}% of room time in use")
+    for i in np.argsort(-usage.room_occupancy, kind="stable")[:args.top].tolist():
+        print(f"  {usage.rooms[i]:<16} {100 * usage.room_occupancy[i]:5.1f}%")
+    idle = usage.idle_rooms()
+    peaks = usage.peak_hours()
+    for day in usage.days:
+        if day in peaks:
+            hour, load = peaks[day]
+            print(f"  {day:<10} peak {hour:>8} ({100 * load:.0f}% of rooms in use), {len(idle[day])} rooms idle all day")
+        else:
+            print(f"  {day:<10} no classes")
+
+    if args.csv:
+        usage.save_csv(args.csv)
+    if args.json:
+        usage.save_json(args.json)
+    if args.heatmap:
+        usage.save_heatmap(args.heatmap)
+
+
+if __name__ == "__main__":
+    main()
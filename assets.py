@@ -0,0 +1,138 @@
+"""Decode-once asset cache for the pygame screens.
+
+Images and GIF frames are decoded and scaled once per (file, size) and kept in
+memory, so going back and forth between screens does not reload them. Scaled
+pixels are also written to ASSET_CACHE_DIR, keyed by a hash of the source file
+and the target size, so the next start skips decoding and resizing entirely.
+"""
+import hashlib
+import os
+import struct
+
+import pygame
+
+import metrics
+
+ASSET_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".asset_cache")
+
+_HEADER = struct.Struct("<4sIII")  # pixel format, width, height, frame count
+_loaded = {}
+stats = {"memory_hits": 0, "disk_hits": 0, "decoded": 0}
+
+
+def _source_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_path(path, size, kind):
+    return os.path.join(ASSET_CACHE_DIR, f"{_source_hash(path)}-{kind}-{size[0]}x{size[1]}.raw")
+
+
+def _read_cache(cache_path):
+    """Frames stored in a cache file, or None if it is missing, truncated or corrupted (it is rebuilt)."""
+    try:
+        with open(cache_path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    fmt, width, height, count = _HEADER.unpack_from(data)
+    fmt = fmt.rstrip(b"\0").decode("ascii", "replace")
+    if fmt not in ("RGB", "RGBA") or not count:
+        return None
+    frame_bytes = width * height * len(fmt)
+    if len(data) != _HEADER.size + frame_bytes * count:
+        return None
+    offset = _HEADER.size
+    frames = []
+    for _ in range(count):
+        frames.append(pygame.image.frombuffer(data[offset:offset + frame_bytes], (width, height), fmt))
+        offset += frame_bytes
+    return frames
+
+
+def _write_cache(cache_path, frames, fmt):
+    width, height = frames[0].get_size()
+    try:
+        os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(_HEADER.pack(fmt.encode(), width, height, len(frames)))
+            for frame in frames:
+                file.write(pygame.image.tostring(frame, fmt))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write asset cache {cache_path}: {e}")
+
+
+def _for_display(surface, alpha):
+    # Match the display's pixel format once, so every later blit is a plain copy
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def _load(path, size, kind, alpha, decode):
+    key = (path, tuple(size), kind)
+    frames = _loaded.get(key)
+    if frames is not None:
+        stats["memory_hits"] += 1
+        metrics.count("asset_memory_hits")
+        return frames
+
+    with metrics.timer(f"asset_load_{kind}"):
+        frames = _load_uncached(path, size, kind, alpha, decode)
+    _loaded[key] = frames
+    return frames
+
+
+def _load_uncached(path, size, kind, alpha, decode):
+    cache_path = _cache_path(path, size, kind)
+    frames = _read_cache(cache_path)
+    if frames is not None:
+        stats["disk_hits"] += 1
+        metrics.count("asset_disk_hits")
+    else:
+        stats["decoded"] += 1
+        metrics.count("asset_decoded")
+        frames = decode()
+        if frames:
+            _write_cache(cache_path, frames, "RGBA" if alpha else "RGB")
+
+    return [_for_display(frame, alpha) for frame in frames]
+
+
+def load_image(path, size, alpha=False):
+    """Image file scaled to `size`, decoded at most once."""
+    def decode():
+        return [pygame.transform.scale(pygame.image.load(path), size)]
+
+    return _load(path, size, "image", alpha, decode)[0]
+
+
+def load_gif_frames(path, size):
+    """Every frame of a GIF resized to `size` with Lanczos filtering, decoded at most once."""
+    def decode():
+        from PIL import Image
+
+        frames = []
+        try:
+            gif = Image.open(path)
+            while True:
+                frame = gif.convert("RGBA").resize(size, Image.LANCZOS)
+                frames.append(pygame.image.fromstring(frame.tobytes(), frame.size, frame.mode))
+                gif.seek(gif.tell() + 1)
+        except EOFError:
+            pass  # End of GIF frames
+        return frames
+
+    return _load(path, size, "gif", True, decode)
+
+
+def clear_memory_cache():
+    _loaded.clear()
@@ -0,0 +1,179 @@
+"""Timetable audit: double bookings and rows that do not parse.
+
+Every row is parsed once by loader.load_timetable(); rows whose room, day or
+time cannot be read are reported with their line and reason. Clashes are
+looked for per room, and per teacher and per section when timetable.csv has
+those columns, with one sort and sweep over the parsed intervals in NumPy
+(O(n log n)): after sorting by (room, day, start), a class clashes when it
+starts before the latest end seen so far for the same room and day. A clash
+is a run of such classes; classes that meet end to start (9-10 and 10-11)
+do not clash, and classes with a blank teacher or section never clash on it.
+
+    python audit.py timetable.csv
+    python audit.py timetable.csv --json audit.json --limit 50
+    python main.py --audit
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+import metrics
+from availability import format_clock
+from loader import load_timetable
+
+CLASH_COLUMNS = ("room", "teacher", "section")
+
+# Minutes per (key, day) block in the sweep; more than any end time (24:00 is 1440)
+_SPAN = 24 * 60 + 1
+
+
+class Clash:
+    """Classes with the same room, teacher or section whose times overlap on one day.
+
+    `rows` are row indexes of the TimetableTable in start order; `start` and
+    `end` span the whole run.
+    """
+
+    __slots__ = ("kind", "name", "day", "start", "end", "rows")
+
+    def __init__(self, kind, name, day, start, end, rows):
+        self.kind = kind
+        self.name = name
+        self.day = day
+        self.start = start
+        self.end = end
+        self.rows = rows
+
+    def __repr__(self):
+        return f"Clash({self.kind}={self.name!r}, {self.day} {format_clock(self.start)}-{format_clock(self.end)}, {len(self.rows)} classes)"
+
+
+def _key_column(table, kind):
+    if kind == "room":
+        return table.room, table.rooms
+    return table.codes[kind], table.names[kind]
+
+
+@metrics.timed("find_clashes")
+def find_clashes(table, kind="room"):
+    """Every clash among the classes of a loader.TimetableTable that share `kind`."""
+    codes, names = _key_column(table, kind)
+    if not len(table):
+        return []
+    key = np.asarray(codes, dtype=np.int64)
+    day = np.asarray(table.day, dtype=np.int64)
+    # A blank teacher or section is not a name; those classes can't clash on it
+    named = np.array([bool(name.strip()) for name in names], dtype=bool)
+    keep = np.flatnonzero(named[key])
+    if not len(keep):
+        return []
+    start = np.asarray(table.start, dtype=np.int64)
+    order = keep[np.lexsort((start[keep], day[keep], key[keep]))]
+    start = start[order]
+    end = np.asarray(table.end, dtype=np.int64)[order]
+
+    # Offsetting each (key, day) block past the previous one lets one running
+    # maximum of end times serve every block: a class clashes when it starts
+    # before the latest end so far, which can only come from its own block.
+    offset = (key[order] * len(table.days) + day[order]) * _SPAN
+    latest_end = np.maximum.accumulate(offset + end)
+    clashes = np.zeros(len(order), dtype=bool)
+    clashes[1:] = offset[1:] + start[1:] < latest_end[:-1]
+
+    # A clash run is a class that does not clash plus the ones after it that do
+    first = np.flatnonzero(~clashes)
+    sizes = np.diff(np.append(first, len(order)))
+    runs = sizes > 1
+    begin, size = first[runs], sizes[runs]
+    last = begin + size - 1
+    rows = order.tolist()
+    found = [
+        Clash(kind, names[code], table.days[day_code], run_start, run_end, rows[a:a + n])
+        for code, day_code, run_start, run_end, a, n in zip(
+            key[order[begin]].tolist(), day[order[begin]].tolist(), start[begin].tolist(),
+            (latest_end[last] - offset[last]).tolist(), begin.tolist(), size.tolist(),
+        )
+    ]
+    metrics.count(f"audit_{kind}_clashes", len(found))
+    return found
+
+
+def audit(table, columns=CLASH_COLUMNS):
+    """{kind: [Clash, ...]} for each of `columns` that the timetable has."""
+    kinds = [kind for kind in columns if kind == "room" or kind in table.codes]
+    return {kind: find_clashes(table, kind) for kind in kinds}
+
+
+def to_dict(table, clashes):
+    """The audit as plain data, ready for json.dumps."""
+    lines = np.asarray(table.line)
+    return {
+        "rows": len(table),
+        "bad_rows": [{"line": error.line, "reason": error.reason, "values": error.values} for error in table.errors],
+        "clashes": {
+            kind: [
+                {
+                    kind: clash.name,
+                    "day": clash.day,
+                    "start": format_clock(clash.start),
+                    "end": format_clock(clash.end),
+                    "classes": [{"line": int(lines[i]), **table.row(i)} for i in clash.rows],
+                }
+                for clash in found
+            ]
+            for kind, found in clashes.items()
+        },
+    }
+
+
+def format_report(table, clashes, limit=20):
+    """Human-readable report; at most `limit` bad rows and clashes of each kind are listed."""
+    lines = np.asarray(table.line)
+    report = [f"{len(table):,} classes, {len(table.errors):,} rows that do not parse"]
+    for error in table.errors[:limit]:
+        report.append(f"  line {error.line}: {error.reason}")
+    if len(table.errors) > limit:
+        report.append(f"  ... and {len(table.errors) - limit:,} more")
+
+    for kind, found in clashes.items():
+        report.append(f"{len(found):,} {kind} clashes")
+        for clash in found[:limit]:
+            report.append(f"  {clash.name}, {clash.day} {format_clock(clash.start)} - {format_clock(clash.end)}:")
+            for i in clash.rows:
+                row = table.row(i)
+                report.append(f"    line {int(lines[i])}: {row['time']} {row.get('subject', '')}".rstrip())
+        if len(found) > limit:
+            report.append(f"  ... and {len(found) - limit:,} more")
+    return "\n".join(report)
+
+
+def run(file_path, json_path=None, limit=20):
+    """Audit timetable.csv, print the report and return 1 if anything was found, else 0."""
+    started = time.perf_counter()
+    table = load_timetable(file_path)
+    parsed = time.perf_counter()
+    clashes = audit(table)
+    swept = time.perf_counter()
+    print(format_report(table, clashes, limit))
+    print(f"Parsed in {parsed - started:.2f} s, clashes found in {swept - parsed:.2f} s")
+    if json_path:
+        with open(json_path, "w") as file:
+            json.dump(to_dict(table, clashes), file, indent=2)
+        print(f"Audit written to {json_path}")
+    return 1 if table.errors or any(clashes.values()) else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check timetable.csv for double bookings and rows that do not parse")
+    parser.add_argument("timetable", help="timetable CSV (room, subject, time, day, optional teacher and section)")
+    parser.add_argument("--json", help="also write the full audit here")
+    parser.add_argument("--limit", type=int, default=20, help="bad rows and clashes of each kind listed in the report")
+    args = parser.parse_args()
+    sys.exit(run(args.timetable, args.json, args.limit))
+
+
+if __name__ == "__main__":
+    main()
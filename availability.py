@@ -0,0 +1,236 @@
+"""Prebuilt room availability index for timetable queries."""
+import bisect
+from collections import defaultdict
+
+# Time slots and days offered by the room finder dropdowns
+TIME_SLOTS = ["7:00 AM", "8:00 AM", "9:00 AM", "10:00 AM", "11:00 AM", "12:00 PM", "1:00 PM", "2:00 PM", "3:00 PM", "4:00 PM", "5:00 PM", "6:00 PM", "7:00 PM"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+_CLOCK_CACHE = {}
+
+
+# Convert a clock string such as "8:00 AM" to minutes since midnight
+def parse_clock(text):
+    minutes = _CLOCK_CACHE.get(text)
+    if minutes is not None:
+        return minutes
+
+    value = text.strip().upper()
+    meridiem = None
+    if value.endswith("AM") or value.endswith("PM"):
+        meridiem = value[-2:]
+        value = value[:-2].strip()
+
+    hours, _, mins = value.partition(":")
+    hours = int(hours)
+    mins = int(mins) if mins else 0
+    if not (0 <= mins < 60):
+        raise ValueError(f"Invalid time: {text!r}")
+
+    if meridiem is not None:
+        if not (1 <= hours <= 12):
+            raise ValueError(f"Invalid time: {text!r}")
+        hours = hours % 12 + (12 if meridiem == "PM" else 0)
+    elif not (0 <= hours <= 24):
+        raise ValueError(f"Invalid time: {text!r}")
+
+    minutes = hours * 60 + mins
+    _CLOCK_CACHE[text] = minutes
+    return minutes
+
+
+# Convert "8:00 AM - 9:00 AM" to (480, 540); returns None for malformed ranges
+def parse_time_range(text):
+    parts = text.split(" - ")
+    if len(parts) != 2:
+        return None
+    try:
+        start, end = parse_clock(parts[0]), parse_clock(parts[1])
+    except ValueError:
+        return None
+    if end < start:
+        return None
+    return start, end
+
+
+def room_name(text):
+    """A timetable room name as every index keys it, whether read from the CSV or a snapshot."""
+    return text.strip()
+
+
+# (day, room, start, end) for every timetable row whose time parses; day is lower-case
+def iter_bookings(timetable):
+    for entry in timetable:
+        time_range = parse_time_range(entry["time"])
+        if time_range is not None:
+            yield entry["day"].strip().lower(), room_name(entry["room"]), time_range[0], time_range[1]
+
+
+def format_clock(minutes):
+    """Format minutes since midnight the same way timetable.csv does."""
+    hours, mins = divmod(minutes, 60)
+    meridiem = "AM" if hours % 24 < 12 else "PM"
+    hours = hours % 12 or 12
+    return f"{hours}:{mins:02d} {meridiem}"
+
+
+class AvailabilityIndex:
+    """Per-day, per-room interval index built once from the timetable rows.
+
+    Every time in the timetable is parsed once into minutes since midnight.
+    For each day the distinct start/end times split the day into a sorted
+    list of points and the open gaps between them, and the free rooms for
+    each piece are stored up front, so a point query is one bisect plus
+    copying out the answer.
+    """
+
+    def __init__(self, timetable, all_rooms):
+        self.rooms = []
+        seen = set()
+        for row in all_rooms:
+            room = row["room"]
+            if room not in seen:
+                seen.add(room)
+                self.rooms.append(room)
+
+        # day -> room -> sorted [(start, end), ...]
+        self.intervals = defaultdict(lambda: defaultdict(list))
+        # A loader.TimetableTable has its times parsed already
+        bookings = timetable.bookings() if hasattr(timetable, "bookings") else iter_bookings(timetable)
+        for day, room, start, end in bookings:
+            self.intervals[day][room].append((start, end))
+
+        # Running maximum of end times, so is_free() only needs one bisect
+        self._max_end = {}
+        for day, rooms in self.intervals.items():
+            for room, ranges in rooms.items():
+                ranges.sort()
+                self._max_end[day, room] = self._running_max(ranges)
+
+        # Bit i of a free-room mask stands for self.rooms[i]
+        self._room_bits = {room: 1 << i for i, room in enumerate(self.rooms)}
+        self._all_free = tuple(self.rooms)
+        self._all_mask = (1 << len(self.rooms)) - 1
+        self._days = {day: self._build_day(rooms) for day, rooms in self.intervals.items()}
+
+    @staticmethod
+    def _running_max(ranges):
+        running, max_end = -1, []
+        for _, end in ranges:
+            running = max(running, end)
+            max_end.append(running)
+        return max_end
+
+    def update(self, added=(), removed=()):
+        """Apply added and removed timetable rows, rebuilding only the days they touch.
+
+        Returns the set of (day, room) pairs whose bookings changed. Removing a
+        row that is not in the index raises KeyError.
+        """
+        touched = set()
+        for entry in removed:
+            time_range = parse_time_range(entry["time"])
+            if time_range is None:
+                continue
+            day = entry["day"].strip().lower()
+            room = room_name(entry["room"])
+            ranges = self.intervals.get(day, {}).get(room, [])
+            i = bisect.bisect_left(ranges, time_range)
+            if i == len(ranges) or ranges[i] != time_range:
+                raise KeyError(f"No booking of {entry['room']} at {entry['time']} on {entry['day']}")
+            del ranges[i]
+            touched.add((day, room))
+
+        for entry in added:
+            time_range = parse_time_range(entry["time"])
+            if time_range is None:
+                continue
+            day = entry["day"].strip().lower()
+            room = room_name(entry["room"])
+            bisect.insort(self.intervals[day][room], time_range)
+            touched.add((day, room))
+
+        for day, room in touched:
+            self._max_end[day, room] = self._running_max(self.intervals[day][room])
+        for day in {day for day, _ in touched}:
+            self._days[day] = self._build_day(self.intervals[day])
+        return touched
+
+    def _build_day(self, rooms):
+        starts = defaultdict(list)
+        ends = defaultdict(list)
+        for room, ranges in rooms.items():
+            for start, end in ranges:
+                starts[start].append(room)
+                ends[end].append(room)
+
+        points = sorted(set(starts) | set(ends))
+        at_point = []
+        after_point = []
+        active = defaultdict(int)
+        free_cache = {}
+
+        def free_for(occupied):
+            key = frozenset(occupied)
+            if key not in free_cache:
+                mask = self._all_mask
+                for room in key:
+                    mask &= ~self._room_bits.get(room, 0)
+                free_cache[key] = (tuple(room for room in self.rooms if room not in key), mask)
+            return free_cache[key]
+
+        # Sweep the day: a class occupies its room from start to end inclusive,
+        # matching the original bfs_csp_search check (start <= time <= end).
+        for point in points:
+            starting = starts.get(point, ())
+            occupied_here = {room for room, count in active.items() if count} | set(starting)
+            at_point.append(free_for(occupied_here))
+
+            for room in starting:
+                active[room] += 1
+            for room in ends.get(point, ()):
+                active[room] -= 1
+            after_point.append(free_for(room for room, count in active.items() if count))
+
+        return points, at_point, after_point
+
+    def _free_at(self, time, day):
+        """(free rooms, free-room mask) at `time` on `day`."""
+        if isinstance(time, str):
+            time = parse_clock(time)
+        day_index = self._days.get(day.strip().lower())
+        if day_index is None:
+            return self._all_free, self._all_mask
+
+        points, at_point, after_point = day_index
+        i = bisect.bisect_right(points, time) - 1
+        if i < 0:
+            return self._all_free, self._all_mask
+        if points[i] == time:
+            return at_point[i]
+        return after_point[i]
+
+    def free_rooms(self, time, day):
+        """Return the rooms with no class at `time` on `day`, in rooms.csv order."""
+        return list(self._free_at(time, day)[0])
+
+    def free_mask(self, time, day):
+        """Free rooms at `time` on `day` as an int with bit i set for self.rooms[i]."""
+        return self._free_at(time, day)[1]
+
+    def has_room(self, room):
+        """Whether `room` is in rooms.csv."""
+        return room in self._room_bits
+
+    def room_intervals(self, room, day):
+        """Return the sorted (start, end) bookings of `room` on `day`."""
+        return self.intervals.get(day.strip().lower(), {}).get(room, [])
+
+    def is_free(self, room, day, time):
+        if isinstance(time, str):
+            time = parse_clock(time)
+        day = day.strip().lower()
+        ranges = self.room_intervals(room, day)
+        # Only bookings starting at or before `time` can contain it
+        i = bisect.bisect_right(ranges, (time, float("inf")))
+        return i == 0 or self._max_end[day, room][i - 1] < time
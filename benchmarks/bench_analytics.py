@@ -0,0 +1,97 @@
+"""Weekly utilisation analytics on a semester timetable across many buildings.
+
+Each size is a number of buildings with --rooms rooms each and a full
+semester's weekly classes in them (about --load of every room's opening
+hours booked). The timetable is parsed once by load_timetable(); the bitmap,
+every report, the CSV and JSON exports and the heatmap are then timed
+together against the one-second budget, and the peak memory they allocate
+is traced in a second run. The booked minutes per room are checked
+against, and timed with, a plain Python loop over the classes.
+
+    python -m benchmarks.bench_analytics
+    python -m benchmarks.bench_analytics --buildings 50 --rooms 100 --skip-python
+"""
+import argparse
+import os
+import random
+import tempfile
+import tracemalloc
+
+from analytics import build_utilisation
+from benchmarks.synthetic import make_timetable, timed, write_csv
+from free_time import DAY_END, DAY_START
+from loader import load_timetable
+
+BUDGET = 1.0
+
+
+def make_rooms(n_buildings, n_rooms):
+    return [
+        {"room": f"B{b:02d} {r:03d}", "building": f"B{b:02d}"}
+        for b in range(n_buildings) for r in range(n_rooms)
+    ]
+
+
+def python_booked(table, usage):
+    """Booked minutes per (day, room) by walking every class's minutes."""
+    index = {room: i for i, room in enumerate(usage.rooms)}
+    days = {day.lower(): d for d, day in enumerate(usage.days)}
+    booked = {}
+    for room, day, start, end in zip(table.room, table.day, table.start, table.end):
+        d = days.get(table.days[day].lower())
+        if d is None:
+            continue
+        minutes = booked.setdefault((d, index[table.rooms[room]]), set())
+        minutes.update(range(max(start, DAY_START), min(end, DAY_END)))
+    return {key: len(minutes) for key, minutes in booked.items()}
+
+
+def bench(n_buildings, n_rooms, load, tmp, skip_python):
+    rooms = make_rooms(n_buildings, n_rooms)
+    # make_timetable classes average two hours in a twelve-hour, six-day week
+    n_rows = int(len(rooms) * 6 * 12 / 2 * load)
+    path = os.path.join(tmp, f"timetable-{n_buildings}x{n_rooms}.csv")
+    write_csv(path, make_timetable(n_rows, rooms, seed=n_buildings), ["room", "subject", "time", "day"])
+    random.Random(0).shuffle(rooms)
+
+    table, parse_time = timed(lambda: load_timetable(path))
+
+    def analyse():
+        usage = build_utilisation(table, rooms)
+        usage.save_csv(os.path.join(tmp, "usage.csv"))
+        usage.save_json(os.path.join(tmp, "usage.json"))
+        usage.save_heatmap(os.path.join(tmp, "usage.png"))
+        return usage
+
+    usage, analyse_time = timed(analyse)
+    tracemalloc.start()
+    analyse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    line = (f"{n_buildings:>3} buildings x {n_rooms} rooms, {n_rows:>8,} classes  parse {parse_time:5.2f} s  "
+            f"bitmap + reports + CSV/JSON/PNG {analyse_time:5.2f} s "
+            f"({'within' if analyse_time < BUDGET else 'OVER'} {BUDGET:.0f} s), peak {peak / 2 ** 20:6.1f} MiB  "
+            f"{100 * usage.room_occupancy.mean():4.1f}% in use")
+    if not skip_python:
+        booked, python_time = timed(lambda: python_booked(table, usage))
+        for (d, r), minutes in booked.items():
+            assert usage.booked[d, r] == minutes, (usage.days[d], usage.rooms[r])
+        assert sum(booked.values()) == int(usage.booked.sum())
+        line += f"  (Python booked minutes only {python_time:5.2f} s)"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--buildings", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--rooms", type=int, default=100, help="rooms per building")
+    parser.add_argument("--load", type=float, default=0.6, help="share of room time booked, before overlaps")
+    parser.add_argument("--skip-python", action="store_true", help="don't time and check against a Python loop")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_buildings in args.buildings:
+            bench(n_buildings, args.rooms, args.load, tmp, args.skip_python)
+
+
+if __name__ == "__main__":
+    main()
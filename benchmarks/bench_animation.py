@@ -0,0 +1,85 @@
+"""Per-frame cost of the map path animation vs. path length.
+
+Compares the original loop (full background blit, every revealed marker
+re-blitted, display flip) with PathAnimation on a DirtyRenderer, on the
+dummy SDL video driver.
+
+    python -m benchmarks.bench_animation
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from rendering import DirtyRenderer, PathAnimation
+
+CELL = 50
+SIZE = (1200, 700)
+FRAME_MS = 33
+
+
+def snake_path(length, columns=24, rows=14):
+    """A path of `length` cells sweeping the map back and forth."""
+    cells = []
+    for y in range(rows):
+        xs = range(columns) if y % 2 == 0 else range(columns - 1, -1, -1)
+        cells.extend((x, y) for x in xs)
+    return [cells[i % len(cells)] for i in range(length)]
+
+
+def legacy_frames(screen, background, marker, path, frames):
+    start = time.perf_counter()
+    for frame in range(frames):
+        current_index = min(frame, len(path) - 1)
+        screen.blit(background, (0, 0))
+        for i in range(current_index + 1):
+            x, y = path[i]
+            screen.blit(marker, (x * CELL + CELL // 4, y * CELL + CELL // 4))
+        pygame.display.flip()
+    return (time.perf_counter() - start) / frames
+
+
+def animated_frames(screen, background, marker, path, frames):
+    layer = background.copy()
+    renderer = DirtyRenderer(screen, layer)
+    animation = PathAnimation(path, marker, layer, CELL, speed=10)
+    animation.start(0)
+    renderer.render([animation.widget()])
+    start = time.perf_counter()
+    for frame in range(frames):
+        for rect in animation.update(frame * FRAME_MS):
+            renderer.invalidate(rect)
+        renderer.render([animation.widget()])
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1_000, 10_000])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode(SIZE)
+    background = pygame.Surface(SIZE)
+    background.fill((255, 255, 255))
+    marker = pygame.Surface((40, 40), pygame.SRCALPHA)
+    pygame.draw.circle(marker, (0, 102, 204), (20, 20), 20)
+
+    for length in args.lengths:
+        path = snake_path(length)
+        # The original loop reveals one marker per frame: average over revealing the path and --frames more
+        # (skipped on long paths, where that takes minutes)
+        legacy = legacy_frames(screen, background, marker, path, args.frames + length) if length <= 1_000 else None
+        animated = animated_frames(screen, background, marker, path, args.frames)
+        legacy_text = f"{legacy * 1000:8.3f} ms" if legacy is not None else "       -   "
+        print(f"{length:>7} cells  per frame: original {legacy_text}  time-based {animated * 1000:8.3f} ms")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
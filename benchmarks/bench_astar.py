@@ -0,0 +1,96 @@
+"""Compare heap-based A* and the precomputed RouteTable with the original list-based A*.
+
+    python -m benchmarks.bench_astar
+    python -m benchmarks.bench_astar --grids 40 200 1000 --legacy-max-grid 200
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import make_room_coordinates, make_route_pairs
+from pathfinding import RouteTable, astar_search, manhattan_distance
+
+
+# The astar_search used before the heap open set (min()/remove() and a rebuilt membership list)
+def legacy_astar_search(start, goal, grid_size):
+    open_list = []
+    closed_list = set()
+    came_from = {}
+    g_score = {start: 0}
+    f_score = {start: manhattan_distance(start, goal)}
+    open_list.append((f_score[start], start))
+
+    while open_list:
+        _, current = min(open_list, key=lambda x: x[0])
+        open_list.remove((f_score[current], current))
+
+        if current == goal:
+            path = []
+            while current in came_from:
+                path.append(current)
+                current = came_from[current]
+            path.append(start)
+            return path[::-1]
+
+        closed_list.add(current)
+        x, y = current
+        neighbors = [(x+1, y), (x-1, y), (x, y+1), (x, y-1)]
+        for neighbor in neighbors:
+            if neighbor in closed_list or not (0 <= neighbor[0] < grid_size and 0 <= neighbor[1] < grid_size):
+                continue
+
+            tentative_g_score = g_score[current] + 1
+            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                f_score[neighbor] = g_score[neighbor] + manhattan_distance(neighbor, goal)
+                if neighbor not in [item[1] for item in open_list]:
+                    open_list.append((f_score[neighbor], neighbor))
+
+    return []
+
+
+def time_routes(search, pairs, grid_size):
+    start = time.perf_counter()
+    lengths = [len(search(a, b, grid_size)) for a, b in pairs]
+    return (time.perf_counter() - start) / len(pairs), lengths
+
+
+def bench(grid_size, n_pairs, n_rooms, legacy_max_grid):
+    pairs = make_route_pairs(n_pairs, grid_size)
+    heap_time, heap_lengths = time_routes(astar_search, pairs, grid_size)
+
+    line = f"grid {grid_size:>5}x{grid_size:<5} heap A* {heap_time * 1000:9.2f} ms/route"
+    if grid_size <= legacy_max_grid:
+        legacy_time, legacy_lengths = time_routes(legacy_astar_search, pairs, grid_size)
+        assert heap_lengths == legacy_lengths
+        line += f"  list A* {legacy_time * 1000:10.2f} ms/route  speedup x{legacy_time / heap_time:,.1f}"
+    else:
+        line += "  list A* skipped (too slow)"
+
+    coordinates = make_room_coordinates(n_rooms, grid_size)
+    start = time.perf_counter()
+    table = RouteTable(coordinates, grid_size)
+    build = time.perf_counter() - start
+    points = list(coordinates.values())
+    start = time.perf_counter()
+    for a in points:
+        for b in points:
+            table.route(a, b)
+    lookup = (time.perf_counter() - start) / len(points) ** 2
+    line += f"  | table of {len(table)} routes built in {build:6.2f} s, {lookup * 1e6:8.2f} us/lookup"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grids", type=int, nargs="+", default=[40, 200, 1000])
+    parser.add_argument("--pairs", type=int, default=5)
+    parser.add_argument("--rooms", type=int, default=12)
+    parser.add_argument("--legacy-max-grid", type=int, default=200)
+    args = parser.parse_args()
+    for grid_size in args.grids:
+        bench(grid_size, args.pairs, args.rooms, args.legacy_max_grid)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Timetable audit on large synthetic timetables: parsing vs. the NumPy clash sweep.
+
+Each timetable has teacher and section columns, so room, teacher and
+section clashes are all looked for; some classes have a blank teacher or
+section, which must not count as clashes. The clash counts are checked
+against scheduler.count_overlaps, a plain Python sort and sweep, which is
+timed too.
+
+    python -m benchmarks.bench_audit
+    python -m benchmarks.bench_audit --sizes 1000000 --skip-python
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from audit import audit
+from benchmarks.synthetic import make_rooms, make_timetable, timed, write_csv
+from loader import load_timetable
+from scheduler import count_overlaps
+
+
+def make_file(path, n_rows, seed=0):
+    rooms = make_rooms(max(20, n_rows // 30))
+    rows = make_timetable(n_rows, rooms, seed=seed)
+    rng = random.Random(seed + 1)
+    n_teachers, n_sections = max(10, n_rows // 25), max(10, n_rows // 30)
+    for row in rows:
+        row["teacher"] = f"T{rng.randrange(n_teachers)}" if rng.random() > 0.05 else ""
+        row["section"] = f"S{rng.randrange(n_sections)}" if rng.random() > 0.05 else " "
+    # A few rows that do not parse
+    for row in rng.sample(rows, min(len(rows), 10)):
+        row["day"] = "Someday"
+    write_csv(path, rows, ["room", "subject", "time", "day", "teacher", "section"])
+
+
+def python_overlaps(table, kind):
+    codes, names = (table.room, table.rooms) if kind == "room" else (table.codes[kind], table.names[kind])
+    return count_overlaps(row for row in zip(codes, table.day, table.start, table.end) if names[row[0]].strip())
+
+
+def check_blank_keys(tmp):
+    """Classes at the same time with a blank teacher and section are not clashes."""
+    path = os.path.join(tmp, "blank-keys.csv")
+    rows = [{"room": f"ROOM {i}", "subject": "SUBJ", "time": "8:00 AM - 9:00 AM", "day": "Monday",
+             "teacher": blank, "section": blank} for i, blank in enumerate(["", "", " ", " "])]
+    write_csv(path, rows, ["room", "subject", "time", "day", "teacher", "section"])
+    clashes = audit(load_timetable(path))
+    assert not any(clashes.values()), clashes
+
+
+def bench(n_rows, tmp, skip_python):
+    path = os.path.join(tmp, f"timetable-{n_rows}.csv")
+    make_file(path, n_rows)
+    table, parse_time = timed(lambda: load_timetable(path))
+    clashes, sweep_time = timed(lambda: audit(table))
+
+    line = (f"{n_rows:>9,} rows  parse {parse_time:6.2f} s  clash sweep {sweep_time:6.2f} s  "
+            + "  ".join(f"{kind} {len(found):,}" for kind, found in clashes.items()))
+    if not skip_python:
+        counts, python_time = timed(lambda: {kind: python_overlaps(table, kind) for kind in clashes})
+        for kind, found in clashes.items():
+            assert counts[kind] == sum(len(clash.rows) - 1 for clash in found), kind
+        line += f"  (Python sort and sweep {python_time:6.2f} s)"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip-python", action="store_true", help="don't time and check against count_overlaps")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        check_blank_keys(tmp)
+        for n_rows in args.sizes:
+            bench(n_rows, tmp, args.skip_python)
+
+
+if __name__ == "__main__":
+    main()
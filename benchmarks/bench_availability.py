@@ -0,0 +1,79 @@
+"""Compare AvailabilityIndex with the original linear-scan bfs_csp_search.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_availability
+    python -m benchmarks.bench_availability --sizes 1000 100000
+"""
+import argparse
+import time
+
+from availability import AvailabilityIndex, parse_clock
+from benchmarks.synthetic import make_queries, make_rooms, make_timetable
+
+
+# The linear scan bfs_csp_search used before the index (string time comparison included)
+def legacy_bfs_csp_search(timetable, all_rooms, time, day):
+    occupied_rooms = set()
+    available_rooms = set(room["room"] for room in all_rooms)
+    for entry in timetable:
+        entry_time_range = entry["time"].split(" - ")
+        if len(entry_time_range) == 2:
+            start_time, end_time = entry_time_range
+            if time >= start_time and time <= end_time and entry["day"].lower() == day.lower():
+                occupied_rooms.add(entry["room"])
+    return list(available_rooms - occupied_rooms)
+
+
+# Same scan with parsed times, used to check the index returns the right rooms
+def reference_free_rooms(timetable, all_rooms, time, day):
+    minute = parse_clock(time)
+    occupied = set()
+    for entry in timetable:
+        start, end = (parse_clock(part) for part in entry["time"].split(" - "))
+        if start <= minute <= end and entry["day"].lower() == day.lower():
+            occupied.add(entry["room"])
+    return set(room["room"] for room in all_rooms) - occupied
+
+
+def bench(n_rows, n_queries, n_legacy_queries):
+    rooms = make_rooms(max(20, n_rows // 500))
+    timetable = make_timetable(n_rows, rooms)
+    queries = make_queries(n_queries)
+
+    start = time.perf_counter()
+    index = AvailabilityIndex(timetable, rooms)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for t, day in queries:
+        index.free_rooms(t, day)
+    indexed = (time.perf_counter() - start) / len(queries)
+
+    legacy_queries = queries[:n_legacy_queries]
+    start = time.perf_counter()
+    for t, day in legacy_queries:
+        legacy_bfs_csp_search(timetable, rooms, t, day)
+    legacy = (time.perf_counter() - start) / len(legacy_queries)
+
+    for t, day in legacy_queries:
+        assert set(index.free_rooms(t, day)) == reference_free_rooms(timetable, rooms, t, day)
+
+    print(f"{n_rows:>9} rows  {len(rooms):>5} rooms  build {build * 1000:9.1f} ms  "
+          f"index {indexed * 1e6:8.1f} us/query  linear scan {legacy * 1e6:12.1f} us/query  "
+          f"speedup x{legacy / indexed:,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--legacy-queries", type=int, default=5)
+    args = parser.parse_args()
+
+    for n_rows in args.sizes:
+        bench(n_rows, args.queries, args.legacy_queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Routes from one start to every room: one flood vs. an A* search per room.
+
+Open grids use pathfinding.grid_flood against pathfinding.astar_search;
+grids with obstacles use NavigationGraph.flood against NavigationGraph.astar
+on a one-floor graph. Both must find routes of the same length.
+
+    python -m benchmarks.bench_flood
+"""
+import argparse
+
+from benchmarks.synthetic import make_room_coordinates, make_walkable_grid, make_walkable_pairs, timed
+from navgraph import FloorMask, NavigationGraph
+from pathfinding import astar_search, grid_flood
+
+
+def report(label, n_rooms, per_room, flood):
+    print(f"{label:<28} {n_rooms:>5} rooms  A* per room {per_room * 1000:9.1f} ms  "
+          f"one flood {flood * 1000:9.1f} ms  ({per_room / flood:6.1f}x)")
+
+
+def bench_open(grid_size, n_rooms):
+    coordinates = make_room_coordinates(n_rooms, grid_size)
+    start = coordinates.pop("START")
+    goals = list(coordinates.values())
+    paths, per_room = timed(lambda: [astar_search(start, goal, grid_size) for goal in goals])
+    tree, flood = timed(lambda: grid_flood(start, grid_size, targets=goals))
+    for goal, path in zip(goals, paths):
+        assert len(path) - 1 == tree.distance_to(goal), goal
+    report(f"open {grid_size}x{grid_size}", n_rooms, per_room, flood)
+
+
+def bench_obstacles(grid_size, density, n_rooms):
+    graph = NavigationGraph()
+    graph.add_floor(1, FloorMask(make_walkable_grid(grid_size, density)))
+    pairs = make_walkable_pairs(graph.floors[1].to_array(), n_rooms + 1)
+    start = (1, *pairs[0][0])
+    goals = [(1, *goal) for _, goal in pairs[1:]]
+    paths, per_room = timed(lambda: [graph.astar(start, goal) for goal in goals])
+    tree, flood = timed(lambda: graph.flood(start, targets=goals))
+    for goal, path in zip(goals, paths):
+        assert (len(path) - 1 if path else None) == tree.distance_to(goal), goal
+    report(f"obstacles {grid_size}x{grid_size} {density:.0%}", n_rooms, per_room, flood)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[40, 200])
+    parser.add_argument("--rooms", type=int, nargs="+", default=[12, 100, 1000])
+    parser.add_argument("--density", type=float, default=0.2, help="blocked share of cells on the obstacle grids")
+    args = parser.parse_args()
+    for grid_size in args.sizes:
+        for n_rooms in args.rooms:
+            bench_open(grid_size, n_rooms)
+            bench_obstacles(grid_size, args.density, n_rooms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Free-window and earliest-slot queries with free_time vs. probing times one by one.
+
+The baseline answers "next free for N minutes" the way the room finder
+would with point queries only: try every half hour as a start and probe
+each minute of the slot with AvailabilityIndex.is_free().
+
+    python -m benchmarks.bench_free_time
+"""
+import argparse
+import random
+import statistics
+import time
+
+from availability import AvailabilityIndex
+from benchmarks.synthetic import DAYS, make_rooms, make_timetable
+from free_time import DAY_END, DAY_START, all_free_windows, free_windows, next_free
+
+
+def probe_next_free(index, rooms, minutes, day, after):
+    first = DAYS.index(day)
+    for offset in range(len(DAYS) + 1):
+        name = DAYS[(first + offset) % len(DAYS)]
+        opens = max(after, DAY_START) if offset == 0 else DAY_START
+        # Start on the half hour, like every time in the synthetic timetable
+        for start in range(opens + (-opens) % 30, DAY_END - minutes + 1, 30):
+            # +0.5: is_free counts a class's end minute as busy, windows do not
+            if all(index.is_free(room, name, t + 0.5) for room in rooms for t in range(start, start + minutes)):
+                return name, start
+    return None
+
+
+def median_per_call(function, calls):
+    times = []
+    for args in calls:
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def us(seconds):
+    return f"{seconds * 1e6:9.1f} us"
+
+
+def bench(n_rows, n_queries, probe_queries):
+    # About five classes per room per day, so rooms have free time left to find
+    rooms = make_rooms(max(20, n_rows // 30))
+    index = AvailabilityIndex(make_timetable(n_rows, rooms), rooms)
+    names = [room["room"] for room in rooms]
+    rng = random.Random(3)
+
+    def query():
+        return (rng.choice(names), rng.choice((60, 90, 120, 180)), rng.choice(DAYS), rng.randrange(7, 18) * 60)
+
+    singles = [query() for _ in range(n_queries)]
+    pairs = [([a, rng.choice(names)], minutes, day, after) for a, minutes, day, after in singles]
+
+    # Both methods must agree on where the slot starts
+    for room, minutes, day, after in singles[:probe_queries]:
+        found = next_free(index, room, minutes, day, after)
+        assert (found and found[:2]) == probe_next_free(index, [room], minutes, day, after), (room, minutes, day, after)
+
+    windows = median_per_call(lambda room, day: free_windows(index, room, day, 90),
+                              [(room, day) for room, _, day, _ in singles])
+    all_rooms = median_per_call(lambda day: all_free_windows(index, day, 90), [(day,) for day in DAYS])
+    single = median_per_call(lambda room, minutes, day, after: next_free(index, room, minutes, day, after), singles)
+    both = median_per_call(lambda rooms_, minutes, day, after: next_free(index, rooms_, minutes, day, after), pairs)
+    probe = median_per_call(lambda room, minutes, day, after: probe_next_free(index, [room], minutes, day, after),
+                            singles[:probe_queries])
+    print(f"{n_rows:>8} rows {len(rooms):>5} rooms  room windows {us(windows)}  all rooms on a day {us(all_rooms)}  "
+          f"next free {us(single)}  two rooms {us(both)}  probing next free {us(probe)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--probe-queries", type=int, default=50, help="queries also answered by probing (slow)")
+    args = parser.parse_args()
+    for n_rows in args.sizes:
+        bench(n_rows, args.queries, args.probe_queries)
+
+
+if __name__ == "__main__":
+    main()
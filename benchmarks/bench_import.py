@@ -0,0 +1,50 @@
+"""Import time of the core modules compared with the pygame UI.
+
+Every import runs in a fresh interpreter, so nothing is already cached in
+sys.modules. Also reports whether the import pulled in pygame, PIL or numpy.
+
+    python -m benchmarks.bench_import
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & {{"pygame", "PIL", "numpy"}})
+print(json.dumps([elapsed, heavy]))
+"""
+
+
+def time_import(module, repeat):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(module=module)], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        elapsed, heavy = json.loads(output.splitlines()[-1])
+        times.append(elapsed)
+    return statistics.median(times), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=["core", "main", "server", "scheduler", "ui"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        elapsed, heavy = time_import(module, args.repeat)
+        print(f"import {module:<10} {elapsed * 1000:8.2f} ms  loads {', '.join(heavy) or 'no pygame/PIL/numpy'}")
+
+
+if __name__ == "__main__":
+    main()
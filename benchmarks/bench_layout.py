@@ -0,0 +1,78 @@
+"""Per-frame hover and click cost of the room button grid vs. the number of free rooms.
+
+The baseline is the loop available_rooms_screen used to run: build a
+pygame.Rect for every room and test each with collidepoint, every frame and
+again for every click. GridLayout only lays out the rows in view and finds
+the button under the mouse by grid arithmetic. No window is opened.
+
+    python -m benchmarks.bench_layout
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+from layout import GridLayout
+
+SCREEN = (1200, 700)
+BUTTON = (200, 50)
+SPACING = 10
+COLUMNS = 3
+
+
+def legacy_frame(rooms, mouse):
+    start_x = (SCREEN[0] - ((BUTTON[0] + SPACING) * COLUMNS - SPACING)) // 2
+    start_y = (SCREEN[1] - ((BUTTON[1] + SPACING) * ((len(rooms) + COLUMNS - 1) // COLUMNS) - SPACING)) // 2
+    hovered = None
+    for index, room in enumerate(rooms):
+        rect = pygame.Rect(start_x + index % COLUMNS * (BUTTON[0] + SPACING),
+                           start_y + index // COLUMNS * (BUTTON[1] + SPACING), *BUTTON)
+        if rect.collidepoint(mouse):
+            hovered = room
+    return hovered
+
+
+def layout_frame(layout, rooms, mouse):
+    index = layout.hit(mouse)
+    # What the screen builds per frame: one Rect per button in view
+    for i, rect in layout.items():
+        pygame.Rect(rect)
+    return None if index is None else rooms[index]
+
+
+def per_call(function, calls):
+    start = time.perf_counter()
+    for args in calls:
+        function(*args)
+    return (time.perf_counter() - start) / len(calls)
+
+
+def bench(n_rooms, n_frames):
+    rooms = [f"ROOM {i:05d}" for i in range(n_rooms)]
+    rng = random.Random(0)
+    mice = [(rng.randrange(SCREEN[0]), rng.randrange(SCREEN[1])) for _ in range(n_frames)]
+    layout = GridLayout(n_rooms, COLUMNS, *BUTTON, (0, 0, SCREEN[0], SCREEN[1] - 80), spacing=SPACING)
+
+    legacy = per_call(legacy_frame, [(rooms, mouse) for mouse in mice])
+    cached = per_call(layout_frame, [(layout, rooms, mouse) for mouse in mice])
+    hit = per_call(layout.hit, [(mouse,) for mouse in mice])
+    relayout = per_call(layout.set_count, [(n_rooms,)] * 100)
+    print(f"{n_rooms:>7,} rooms  rebuild + collidepoint {legacy * 1e6:10.1f} us/frame  "
+          f"GridLayout {cached * 1e6:7.1f} us/frame (hit test {hit * 1e6:5.2f} us, relayout {relayout * 1e6:6.1f} us)  "
+          f"{layout.pages} pages")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, nargs="+", default=[12, 100, 1_000, 10_000, 100_000])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+    for n_rooms in args.rooms:
+        bench(n_rooms, args.frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Memory and throughput of the typed loader against the dict-of-strings load_csv.
+
+    python -m benchmarks.bench_loader
+    python -m benchmarks.bench_loader --sizes 100000 1000000
+"""
+import argparse
+import csv
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from availability import AvailabilityIndex
+from benchmarks.synthetic import make_rooms, make_timetable
+from loader import load_timetable
+
+
+# load_csv from core.py
+def load_csv(file_path):
+    with open(file_path, mode="r") as file:
+        reader = csv.DictReader(file)
+        return [row for row in reader]
+
+
+def write_timetable(path, rows, n_bad):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["room", "subject", "time", "day"])
+        writer.writeheader()
+        writer.writerows(rows)
+        for i in range(n_bad):
+            file.write(f"ROOM 0000,BAD,{i}:75 AM - 9:00 AM,Monday\r\n")
+
+
+def measure(load, path):
+    gc.collect()
+    start = time.perf_counter()
+    result = load(path)
+    seconds = time.perf_counter() - start
+    del result
+    gc.collect()
+
+    tracemalloc.start()
+    result = load(path)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, retained, peak
+
+
+def bench(n_rows):
+    rooms = make_rooms(max(20, n_rows // 500))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "timetable.csv")
+        write_timetable(path, make_timetable(n_rows, rooms), n_bad=3)
+
+        _, dict_time, dict_retained, dict_peak = measure(load_csv, path)
+        table, typed_time, typed_retained, typed_peak = measure(load_timetable, path)
+
+    mib = 1024 * 1024
+    print(f"{n_rows:>8} rows  load_csv {dict_time:6.2f} s ({n_rows / dict_time:>9,.0f} rows/s) "
+          f"{dict_retained / mib:7.1f} MiB held, {dict_peak / mib:7.1f} MiB peak  |  "
+          f"load_timetable {typed_time:6.2f} s ({n_rows / typed_time:>9,.0f} rows/s) "
+          f"{typed_retained / mib:7.1f} MiB held, {typed_peak / mib:7.1f} MiB peak  |  "
+          f"{len(table.errors)} bad rows reported")
+
+    start = time.perf_counter()
+    AvailabilityIndex(table, rooms)
+    print(f"{'':>14}AvailabilityIndex from the typed table: {time.perf_counter() - start:6.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    for n_rows in args.sizes:
+        bench(n_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Route latency on the multi-floor navigation graph.
+
+    python -m benchmarks.bench_navgraph
+    python -m benchmarks.bench_navgraph --plan mapict.jpg --grids 200 1000 --density 0.2
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import make_walkable_grid, make_walkable_pairs
+from navgraph import FloorMask, NavigationGraph, build_navigation_graph
+
+
+def time_queries(graph, queries):
+    start = time.perf_counter()
+    found = sum(1 for a, b in queries if graph.astar(a, b))
+    elapsed = time.perf_counter() - start
+    return elapsed / len(queries), found
+
+
+def bench_plan(plan, n_floors, n_queries):
+    floors = list(range(1, n_floors + 1))
+    graph = build_navigation_graph(plan, floors, (24, 14), stairs=[(5, 9), (18, 9)])
+    walkable = graph.floors[1].to_array()
+    pairs = make_walkable_pairs(walkable, n_queries)
+    queries = [((1, *a), (floors[-1], *b)) for a, b in pairs]
+    latency, found = time_queries(graph, queries)
+    print(f"{plan} 24x14 x {n_floors} floors  {latency * 1e6:9.1f} us/route  ({found}/{len(queries)} reachable)")
+
+
+def bench_synthetic(grid_size, n_floors, density, n_queries):
+    floors = list(range(1, n_floors + 1))
+    stairs = [(1, 1), (grid_size - 2, grid_size - 2)]
+    elevator = (grid_size // 2, grid_size // 2)
+
+    graph = NavigationGraph()
+    for floor in floors:
+        walkable = make_walkable_grid(grid_size, density, seed=floor)
+        for x, y in stairs + [elevator]:
+            walkable[y, x] = True
+        graph.add_floor(floor, FloorMask(walkable))
+    for cell in stairs:
+        graph.add_stairs(cell, floors)
+    graph.add_elevator(elevator, floors)
+
+    pairs = make_walkable_pairs(graph.floors[1].to_array(), n_queries)
+    queries = [((1, *a), (floors[-1], *b)) for a, b in pairs]
+    latency, found = time_queries(graph, queries)
+    packed = sum(mask.nbytes for mask in graph.floors.values())
+    print(f"synthetic {grid_size}x{grid_size} x {n_floors} floors, {density:.0%} obstacles  "
+          f"{latency * 1000:9.2f} ms/route  ({found}/{len(queries)} reachable)  "
+          f"masks {packed / 1024:,.0f} KiB packed vs {packed * 8 / 1024:,.0f} KiB as bool arrays")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plan", default="mapict.jpg")
+    parser.add_argument("--floors", type=int, default=3)
+    parser.add_argument("--grids", type=int, nargs="+", default=[200, 1000])
+    parser.add_argument("--density", type=float, default=0.2)
+    parser.add_argument("--queries", type=int, default=10)
+    args = parser.parse_args()
+
+    bench_plan(args.plan, args.floors, args.queries * 10)
+    for grid_size in args.grids:
+        bench_synthetic(grid_size, args.floors, args.density, args.queries)
+
+
+if __name__ == "__main__":
+    main()
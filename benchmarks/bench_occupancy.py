@@ -0,0 +1,47 @@
+"""Time building the full occupancy matrix against one scan per (day, slot).
+
+    python -m benchmarks.bench_occupancy
+"""
+import argparse
+import time
+
+from availability import DAYS, TIME_SLOTS, AvailabilityIndex
+from benchmarks.bench_availability import legacy_bfs_csp_search
+from benchmarks.synthetic import make_rooms, make_timetable
+from occupancy import build_occupancy
+
+
+def bench(n_rows):
+    rooms = make_rooms(max(20, n_rows // 500))
+    timetable = make_timetable(n_rows, rooms)
+
+    start = time.perf_counter()
+    matrix = build_occupancy(timetable, rooms)
+    batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for day in DAYS:
+        for slot in TIME_SLOTS:
+            legacy_bfs_csp_search(timetable, rooms, slot, day)
+    scans = time.perf_counter() - start
+
+    index = AvailabilityIndex(timetable, rooms)
+    for day in DAYS:
+        for slot in TIME_SLOTS:
+            assert matrix.free_rooms(slot, day) == index.free_rooms(slot, day)
+
+    n_slots = len(DAYS) * len(TIME_SLOTS)
+    print(f"{n_rows:>9} rows  matrix build {batch * 1000:8.1f} ms  "
+          f"{n_slots} linear scans {scans * 1000:9.1f} ms  speedup x{scans / batch:,.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    for n_rows in args.sizes:
+        bench(n_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Wall-clock speedup of the parallel strategy portfolio per worker count.
+
+Each run stops as soon as any worker finds a schedule with no clashes and
+no repeated same-day meetings, so the speedup comes from trying more
+seeds and strategies at once on a tightly packed instance.
+
+    python -m benchmarks.bench_portfolio
+    python -m benchmarks.bench_portfolio --meetings 3000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import make_scheduling_instance
+from scheduler import solve_portfolio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meetings", type=int, default=1000)
+    parser.add_argument("--room-load", type=float, default=0.97)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[n for n in (1, 2, 4, 8, 16) if n <= (os.cpu_count() or 1)])
+    parser.add_argument("--time-limit", type=float, default=60.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    courses, rooms = make_scheduling_instance(args.meetings, room_load=args.room_load)
+    print(f"{args.meetings} meetings, {len(rooms)} rooms, {os.cpu_count()} cores available")
+    baseline = None
+    for workers in args.workers:
+        times = []
+        for repeat in range(args.repeats):
+            start = time.perf_counter()
+            schedule = solve_portfolio(courses, rooms, workers=workers, time_limit=args.time_limit, seed=repeat * 1000)
+            times.append(time.perf_counter() - start)
+        wall = sorted(times)[len(times) // 2]
+        baseline = baseline or wall
+        print(f"{workers:>3} workers  median {wall:7.2f} s  speedup x{baseline / wall:5.2f}  "
+              f"last: cost {schedule.cost()} via {schedule.strategy} seed {schedule.seed}")
+
+
+if __name__ == "__main__":
+    main()
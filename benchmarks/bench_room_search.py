@@ -0,0 +1,98 @@
+"""Ranked, constraint-aware free-room search with RoomCatalog vs. filtering and sorting per query.
+
+The baseline takes AvailabilityIndex.free_rooms(), checks each room's
+rooms.csv attributes and sorts by a distance dict, which is already better
+than re-running A* per query.
+
+    python -m benchmarks.bench_room_search
+"""
+import argparse
+import random
+import statistics
+import time
+
+from availability import AvailabilityIndex
+from benchmarks.synthetic import (
+    make_queries, make_room_attributes, make_room_coordinates, make_rooms, make_timetable, percentile,
+)
+from pathfinding import RouteTable
+from room_search import RoomCatalog, room_capacity, room_equipment, room_type
+
+GRID_SIZE = 100
+
+
+def make_constraints(n, seed=2):
+    rng = random.Random(seed)
+    constraints = []
+    for _ in range(n):
+        constraints.append({
+            "min_capacity": rng.choice((0, 30, 40, 60)),
+            "room_type": rng.choice((None, "lab", "lecture")),
+            "equipment": rng.sample(["projector", "computers", "aircon"], rng.randrange(3)),
+        })
+    return constraints
+
+
+def baseline_search(index, rows, distances, time_text, day, min_capacity=0, room_type_=None, equipment=(), limit=None):
+    found = []
+    for room in index.free_rooms(time_text, day):
+        row = rows[room]
+        if room_capacity(row) < min_capacity:
+            continue
+        if room_type_ and room_type(row) != room_type_:
+            continue
+        if not set(equipment) <= room_equipment(row):
+            continue
+        found.append(room)
+    found.sort(key=distances.__getitem__)
+    return [(room, distances[room]) for room in found[:limit]]
+
+
+def bench(n_rooms, n_queries, limit):
+    rooms = make_room_attributes(make_rooms(n_rooms))
+    coordinates = make_room_coordinates(n_rooms, GRID_SIZE)
+    timetable = make_timetable(n_rooms * 20, rooms)
+    index = AvailabilityIndex(timetable, rooms)
+    routes = RouteTable({"START": coordinates["START"]}, GRID_SIZE)
+
+    start = time.perf_counter()
+    catalog = RoomCatalog(rooms, coordinates, routes.route)
+    catalog.distance_table("START")
+    build = time.perf_counter() - start
+
+    order, distance_list = catalog.distance_table("START")
+    distances = dict(zip(catalog.rooms, distance_list))
+    rows = {row["room"]: row for row in rooms}
+    queries = list(zip(make_queries(n_queries), make_constraints(n_queries)))
+
+    indexed, baseline = [], []
+    for (time_text, day), constraint in queries:
+        t0 = time.perf_counter()
+        result = catalog.search(index.free_mask(time_text, day), "START", limit=limit, **constraint)
+        t1 = time.perf_counter()
+        expected = baseline_search(index, rows, distances, time_text, day, constraint["min_capacity"],
+                                   constraint["room_type"], constraint["equipment"], limit)
+        t2 = time.perf_counter()
+        assert [d for _, d in result] == [d for _, d in expected], (time_text, day, constraint)
+        indexed.append(t1 - t0)
+        baseline.append(t2 - t1)
+
+    indexed.sort()
+    baseline.sort()
+    print(f"{n_rooms:>6} rooms  build {build * 1000:8.1f} ms  catalog median {statistics.median(indexed) * 1e6:7.1f} us "
+          f"p99 {percentile(indexed, 99) * 1e6:7.1f} us  filter+sort median {statistics.median(baseline) * 1e6:8.1f} us "
+          f"p99 {percentile(baseline, 99) * 1e6:8.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, nargs="+", default=[100, 1_000, 5_000])
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=10, help="rooms returned per query (0 for all)")
+    args = parser.parse_args()
+    for n_rooms in args.rooms:
+        bench(n_rooms, args.queries, args.limit or None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Solve time and constraint violations of the timetable generator on synthetic instances.
+
+    python -m benchmarks.bench_scheduler
+    python -m benchmarks.bench_scheduler --sizes 500 5000 --time-limit 30
+"""
+import argparse
+
+from benchmarks.synthetic import make_scheduling_instance
+from scheduler import TimetableSolver
+
+
+def bench(n_meetings, seed, time_limit, room_load):
+    courses, rooms = make_scheduling_instance(n_meetings, seed=seed, room_load=room_load)
+    solver = TimetableSolver(courses, rooms)
+    schedule = solver.solve(seed=seed, time_limit=time_limit)
+    counts = schedule.violations()
+    print(f"{len(schedule.assignment):>6} meetings  {len(courses):>5} courses  {len(rooms):>4} rooms  "
+          f"solved in {schedule.seconds:7.2f} s  clashes room/teacher/section/capacity "
+          f"{counts['room']}/{counts['teacher']}/{counts['section']}/{counts['capacity']}  "
+          f"same-day repeats {counts['same_day']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000, 3000, 6000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=30.0)
+    parser.add_argument("--room-load", type=float, default=0.6, help="share of all room time the courses need")
+    args = parser.parse_args()
+    for n_meetings in args.sizes:
+        bench(n_meetings, args.seed, args.time_limit, args.room_load)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Load test for server.py: latency percentiles and requests per second on localhost.
+
+Starts the server on a synthetic timetable (or targets a running one with
+--port) and keeps N keep-alive connections busy with a mix of free-room and
+route queries.
+
+    python -m benchmarks.bench_server
+    python -m benchmarks.bench_server --connections 1 10 100 --requests 20000
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+from benchmarks.synthetic import DAYS, make_queries, make_rooms, make_timetable, percentile, write_csv
+from core import ROOM_COORDINATES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_targets(n, seed=0):
+    """Request paths: three free-room queries for every route query."""
+    rng = random.Random(seed)
+    route_rooms = [room for room in ROOM_COORDINATES if room != "START"]
+    targets = []
+    for time_text, day in make_queries(n, seed=seed):
+        if rng.random() < 0.25:
+            targets.append("/route?" + urlencode({"room": rng.choice(route_rooms)}))
+        else:
+            targets.append("/free-rooms?" + urlencode({"time": time_text, "day": day}))
+    return targets
+
+
+async def request(reader, writer, target):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port, targets, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for target in targets:
+            start = time.perf_counter()
+            if await request(reader, writer, target) != 200:
+                errors.append(target)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_load(port, targets, connections):
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, targets[i::connections], latencies, errors) for i in range(connections)))
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+def wait_for_server(port, process, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+def bench(port, n_requests, connections):
+    targets = make_targets(n_requests)
+    # Warm the route cache so every level measures the steady state
+    asyncio.run(run_load(port, targets[:200], 1))
+    for n in connections:
+        elapsed, latencies, errors = asyncio.run(run_load(port, targets, n))
+        print(f"{n:>5} connections  {len(targets) / elapsed:9.0f} req/s  "
+              f"p50 {percentile(latencies, 50) * 1000:7.2f} ms  p99 {percentile(latencies, 99) * 1000:7.2f} ms  "
+              f"errors {len(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--rows", type=int, default=10_000, help="synthetic timetable size")
+    parser.add_argument("--port", type=int, help="load an already running server instead of starting one")
+    args = parser.parse_args()
+
+    if args.port:
+        wait_for_server(args.port, None)
+        bench(args.port, args.requests, args.connections)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rooms = make_rooms(max(20, args.rows // 500))
+        rooms_path = os.path.join(tmp, "rooms.csv")
+        timetable_path = os.path.join(tmp, "timetable.csv")
+        write_csv(rooms_path, rooms, list(rooms[0]))
+        write_csv(timetable_path, make_timetable(args.rows, rooms), ["room", "subject", "time", "day"])
+
+        port = free_port()
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "server.py"), "--port", str(port),
+             "--timetable", timetable_path, "--rooms", rooms_path],
+            cwd=ROOT,
+        )
+        try:
+            wait_for_server(port, process)
+            print(f"{args.rows} timetable rows, {len(rooms)} rooms, {len(DAYS)} days")
+            bench(port, args.requests, args.connections)
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
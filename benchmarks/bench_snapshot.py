@@ -0,0 +1,50 @@
+"""Startup from the compiled snapshot vs. parsing timetable.csv and rooms.csv.
+
+Times mapping the snapshot on its own (what a server worker pays for the
+data) and core.open_timetable() both ways; the rest of a snapshot start is
+building the AvailabilityIndex, which the CSV start does too.
+
+    python -m benchmarks.bench_snapshot
+"""
+import argparse
+import os
+import tempfile
+
+import core
+from benchmarks.synthetic import make_room_attributes, make_rooms, make_timetable, timed, write_csv
+from snapshot import compile_snapshot, load_snapshot
+
+
+def bench(n_rows, tmp):
+    rooms = make_room_attributes(make_rooms(max(20, n_rows // 100)))
+    timetable_file = os.path.join(tmp, f"timetable-{n_rows}.csv")
+    rooms_file = os.path.join(tmp, f"rooms-{n_rows}.csv")
+    snapshot_dir = os.path.join(tmp, f"snapshot-{n_rows}")
+    write_csv(timetable_file, make_timetable(n_rows, rooms), ["room", "subject", "time", "day"])
+    write_csv(rooms_file, rooms, ["room", "capacity", "type", "equipment"])
+
+    sources = core.snapshot_sources(timetable_file, rooms_file)
+    _, compile_time = timed(lambda: compile_snapshot(snapshot_dir, sources, core.snapshot_config()))
+    snapshot, map_time = timed(lambda: load_snapshot(snapshot_dir))
+    _, columns_time = timed(lambda: (snapshot.timetable(), snapshot.all_rooms()))
+    (_, from_snapshot), snapshot_time = timed(lambda: core.open_timetable(timetable_file, rooms_file, snapshot_dir))
+    (_, from_csv), csv_time = timed(lambda: core.open_timetable(timetable_file, rooms_file, os.path.join(tmp, "none")))
+    assert from_snapshot.free_rooms("10:00 AM", "Monday") == from_csv.free_rooms("10:00 AM", "Monday")
+
+    print(f"{n_rows:>9,} rows  compile {compile_time:6.2f} s  map {map_time * 1000:7.2f} ms  "
+          f"columns {columns_time * 1000:7.2f} ms  open from snapshot {snapshot_time:6.2f} s  "
+          f"from CSV {csv_time:6.2f} s  ({csv_time / snapshot_time:4.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    args = parser.parse_args()
+    core.MAP_IMAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mapict.jpg")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.sizes:
+            bench(n_rows, tmp)
+
+
+if __name__ == "__main__":
+    main()
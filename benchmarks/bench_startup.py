@@ -0,0 +1,88 @@
+"""Asset load time on startup and screen transitions, with and without the asset cache.
+
+Compares the original per-screen pygame.image.load + scale (and PIL GIF
+decoding) with assets.py on a cold start (empty disk cache), a warm start
+(disk cache from a previous run) and a screen re-entry (in-process cache).
+Runs headless.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --gif "AI .gif"
+"""
+import argparse
+import os
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from PIL import Image
+
+import assets
+from benchmarks.synthetic import timed
+
+SCREEN = (1200, 700)
+
+
+# Asset loading as each screen did it before assets.py
+def legacy_load_gif_frames(gif_path):
+    frames = []
+    try:
+        gif = Image.open(gif_path)
+        while True:
+            frame = gif.convert("RGBA")
+            frame = frame.resize(SCREEN, Image.LANCZOS)
+            frames.append(pygame.image.fromstring(frame.tobytes(), frame.size, frame.mode))
+            gif.seek(gif.tell() + 1)
+    except EOFError:
+        pass
+    return frames
+
+
+def legacy_screens(gif):
+    legacy_load_gif_frames(gif)
+    for path, size in (("AI2.jpg", SCREEN), ("AI2.jpg", SCREEN), ("mapict.jpg", SCREEN), ("images.png", (40, 40))):
+        pygame.transform.scale(pygame.image.load(path), size)
+
+
+def cached_screens(gif):
+    assets.load_gif_frames(gif, SCREEN)
+    for path, size, alpha in (("AI2.jpg", SCREEN, False), ("AI2.jpg", SCREEN, False),
+                              ("mapict.jpg", SCREEN, False), ("images.png", (40, 40), True)):
+        assets.load_image(path, size, alpha=alpha)
+
+
+def make_gif(path, n_frames):
+    frames = [Image.new("RGB", (480, 270), (i * 8 % 256, 80, 160)) for i in range(n_frames)]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gif", help="home screen GIF (default: a synthetic one)")
+    parser.add_argument("--frames", type=int, default=30, help="frames in the synthetic GIF")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode(SCREEN)
+    with tempfile.TemporaryDirectory() as tmp:
+        gif = args.gif
+        if gif is None:
+            gif = os.path.join(tmp, "home.gif")
+            make_gif(gif, args.frames)
+        assets.ASSET_CACHE_DIR = os.path.join(tmp, "cache")
+
+        legacy = timed(lambda: legacy_screens(gif))[1]
+        cold = timed(lambda: cached_screens(gif))[1]
+        assets.clear_memory_cache()
+        warm = timed(lambda: cached_screens(gif))[1]
+        hot = timed(lambda: cached_screens(gif))[1]
+
+    print(f"home GIF + three screens, loading every asset as before:  {legacy * 1000:8.1f} ms")
+    print(f"assets.py, cold start (empty disk cache):                {cold * 1000:8.1f} ms")
+    print(f"assets.py, warm start (disk cache from the last run):    {warm * 1000:8.1f} ms  x{legacy / warm:.1f} faster")
+    print(f"assets.py, screen re-entry (in-process cache):           {hot * 1000:8.1f} ms")
+    print(f"cache stats: {assets.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Latency of incremental timetable edits compared with rebuilding the index.
+
+    python -m benchmarks.bench_timetable_store
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from availability import AvailabilityIndex
+from benchmarks.synthetic import make_rooms, make_timetable
+from timetable_store import TimetableStore
+
+
+def ms(seconds):
+    return f"{seconds * 1000:8.2f} ms"
+
+
+def bench(n_rows):
+    rooms = make_rooms(max(20, n_rows // 500))
+    rows = make_timetable(n_rows, rooms)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "timetable.csv")
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=["room", "subject", "time", "day"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+        start = time.perf_counter()
+        AvailabilityIndex(rows, rooms)
+        rebuild = time.perf_counter() - start
+
+        store = TimetableStore(path, rooms, poll_interval=0)
+        room = rooms[0]["room"]
+        start = time.perf_counter()
+        class_id = store.add_class(room, "NEW", "7:00 PM - 8:00 PM", "Monday")
+        add = time.perf_counter() - start
+        start = time.perf_counter()
+        store.move_class(class_id, day="Tuesday")
+        move = time.perf_counter() - start
+        start = time.perf_counter()
+        store.cancel_class(class_id)
+        cancel = time.perf_counter() - start
+
+        with open(path, "a", newline="") as file:
+            file.write(f"{room},APPENDED,7:00 PM - 8:00 PM,Friday\r\n")
+        start = time.perf_counter()
+        store.poll()
+        poll = time.perf_counter() - start
+        assert room not in store.free_rooms("7:30 PM", "Friday")
+
+    print(f"{n_rows:>8} rows  full rebuild {ms(rebuild)}  add {ms(add)}  move {ms(move)}  "
+          f"cancel {ms(cancel)}  poll appended row {ms(poll)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    for n_rows in args.sizes:
+        bench(n_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Reproducible benchmark suite for load_csv, bfs_csp_search, astar_search and NavigationGraph.astar.
+
+Runs every case on seeded synthetic data at several scales and records
+throughput, latency percentiles (over the calls in a case, each call's
+best of several rounds) and peak traced memory in a JSON results
+file. Given a baseline results file, each case is compared with it and the
+run fails if one got slower than --threshold.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --quick --output after.json --baseline results.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import core
+from availability import AvailabilityIndex
+from benchmarks.synthetic import (
+    make_queries, make_route_pairs, make_rooms, make_timetable, make_walkable_grid, make_walkable_pairs, percentile,
+    write_csv,
+)
+from navgraph import FloorMask, NavigationGraph
+from pathfinding import astar_search
+
+SEED = 0
+
+# (rooms, entries per room) timetables; (grid size, obstacle density) grids
+SCALES = {
+    "timetables": [(20, 50), (200, 500), (2000, 500)],
+    "grids": [(50, 0.0), (200, 0.0), (1000, 0.0), (200, 0.2), (1000, 0.2)],
+}
+QUICK_SCALES = {
+    "timetables": [(20, 50), (200, 500)],
+    "grids": [(50, 0.0), (200, 0.0), (200, 0.2)],
+}
+
+
+def measure(name, params, function, calls, min_seconds=0.2, min_rounds=3, max_rounds=50):
+    """Time function(*args) for each args in `calls`, then trace one call's memory.
+
+    The whole set of calls is repeated for at least `min_rounds` rounds and
+    `min_seconds`, and each call keeps its fastest time, so background load
+    on the machine does not show up as a regression.
+    """
+    best = [float("inf")] * len(calls)
+    rounds = 0
+    start = time.perf_counter()
+    while rounds < min_rounds or (time.perf_counter() - start < min_seconds and rounds < max_rounds):
+        for i, args in enumerate(calls):
+            t0 = time.perf_counter()
+            function(*args)
+            elapsed = time.perf_counter() - t0
+            if elapsed < best[i]:
+                best[i] = elapsed
+        rounds += 1
+
+    tracemalloc.start()
+    function(*calls[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = sorted(best)
+    result = {
+        "name": name,
+        "params": params,
+        "calls": len(latencies),
+        "rounds": rounds,
+        "throughput_per_s": len(latencies) / sum(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_memory_bytes": peak,
+    }
+    print(f"{name:<22} {json.dumps(params):<48} {result['throughput_per_s']:>12,.1f}/s  "
+          f"p50 {result['p50_ms']:9.3f} ms  p99 {result['p99_ms']:9.3f} ms  peak {peak / 1e6:8.2f} MB")
+    return result
+
+
+def timetable_cases(n_rooms, entries, tmp):
+    rooms = make_rooms(n_rooms)
+    rows = make_timetable(n_rooms * entries, rooms, seed=SEED)
+    path = os.path.join(tmp, f"timetable-{n_rooms}x{entries}.csv")
+    write_csv(path, rows, ["room", "subject", "time", "day"])
+    params = {"rooms": n_rooms, "entries_per_room": entries, "seed": SEED}
+    queries = make_queries(200, seed=SEED + 1)
+
+    results = [measure("load_csv", params, core.load_csv, [(path,)], min_seconds=0.5)]
+    # The one-off path: one scan of the parsed bookings per query, no index
+    results.append(measure("bfs_csp_search", params, core.bfs_csp_search,
+                           [(rows, rooms, time_text, day) for time_text, day in queries[:20]], min_seconds=0.5))
+    index = AvailabilityIndex(rows, rooms)
+    results.append(measure("free_rooms_indexed", params, index.free_rooms, queries))
+    return results
+
+
+def grid_cases(grid_size, density, n_pairs=50):
+    params = {"grid": grid_size, "obstacle_density": density, "seed": SEED}
+    if not density:
+        pairs = make_route_pairs(n_pairs, grid_size, seed=SEED)
+        return [measure("astar_search", params, astar_search, [(a, b, grid_size) for a, b in pairs])]
+
+    # Obstacles: A* on a one-floor navigation graph built from a random mask
+    graph = NavigationGraph()
+    graph.add_floor(1, FloorMask(make_walkable_grid(grid_size, density, seed=SEED)))
+    pairs = make_walkable_pairs(graph.floors[1].to_array(), n_pairs, seed=SEED)
+    return [measure("navgraph_astar", params, graph.astar, [((1, *a), (1, *b)) for a, b in pairs])]
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run(scales):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rooms, entries in scales["timetables"]:
+            results += timetable_cases(n_rooms, entries, tmp)
+    for grid_size, density in scales["grids"]:
+        results += grid_cases(grid_size, density)
+    return {"meta": metadata(), "results": results}
+
+
+def _key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(current, baseline, threshold):
+    """Print each case's change against the baseline; return the cases slower than `threshold`."""
+    previous = {_key(result): result for result in baseline["results"]}
+    regressions = []
+    print(f"\nCompared with baseline from {baseline['meta'].get('commit') or '?'} ({baseline['meta'].get('time', '?')}):")
+    for result in current["results"]:
+        old = previous.get(_key(result))
+        if old is None:
+            continue
+        p50 = result["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] else 0.0
+        throughput = result["throughput_per_s"] / old["throughput_per_s"] - 1
+        memory = result["peak_memory_bytes"] / old["peak_memory_bytes"] - 1 if old["peak_memory_bytes"] else 0.0
+        slower = p50 > threshold
+        if slower:
+            regressions.append(result)
+        print(f"{'SLOWER' if slower else 'ok':<7} {result['name']:<22} {json.dumps(result['params']):<48} "
+              f"p50 {p50:+7.1%}  throughput {throughput:+7.1%}  memory {memory:+7.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="results file from an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="p50 slowdown counted as a regression")
+    parser.add_argument("--quick", action="store_true", help="smaller scales, for a fast check")
+    args = parser.parse_args()
+
+    results = run(QUICK_SCALES if args.quick else SCALES)
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Synthetic data generators and timing helpers shared by the benchmark scripts."""
+import csv
+import random
+import time
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+
+def timed(function):
+    """(result, seconds) of one call of `function`."""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+def make_time(minutes):
+    hours, mins = divmod(minutes, 60)
+    meridiem = "AM" if hours < 12 else "PM"
+    return f"{hours % 12 or 12}:{mins:02d} {meridiem}"
+
+
+def make_rooms(n_rooms):
+    return [{"room": f"ROOM {i:04d}"} for i in range(n_rooms)]
+
+
+def make_room_attributes(rooms, seed=0):
+    """Give rooms.csv rows a capacity, a type and some equipment, in place."""
+    rng = random.Random(seed)
+    equipment = ["projector", "computers", "aircon", "whiteboard", "speakers"]
+    for room in rooms:
+        room["capacity"] = str(rng.choice((20, 30, 35, 40, 45, 50, 60, 80)))
+        room["type"] = rng.choice(("lab", "lecture"))
+        room["equipment"] = ";".join(item for item in equipment if rng.random() < 0.5)
+    return rooms
+
+
+def make_timetable(n_rows, rooms, seed=0):
+    """Random classes of 1-3 hours between 7:00 AM and 7:00 PM."""
+    rng = random.Random(seed)
+    names = [room["room"] for room in rooms]
+    rows = []
+    for i in range(n_rows):
+        start = rng.randrange(7, 18) * 60 + rng.choice((0, 30))
+        end = min(start + rng.randrange(1, 4) * 60, 19 * 60)
+        rows.append({
+            "room": rng.choice(names),
+            "subject": f"SUBJ {i % 500}",
+            "time": f"{make_time(start)} - {make_time(end)}",
+            "day": rng.choice(DAYS),
+        })
+    return rows
+
+
+def write_csv(path, rows, fieldnames):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def make_queries(n_queries, seed=1):
+    rng = random.Random(seed)
+    return [(make_time(rng.randrange(7, 19) * 60), rng.choice(DAYS)) for _ in range(n_queries)]
+
+
+def make_room_coordinates(n_rooms, grid_size, seed=0):
+    rng = random.Random(seed)
+    coordinates = {"START": (grid_size // 2, grid_size - 1)}
+    for i in range(n_rooms):
+        coordinates[f"ROOM {i:04d}"] = (rng.randrange(grid_size), rng.randrange(grid_size))
+    return coordinates
+
+
+def make_route_pairs(n_pairs, grid_size, seed=0):
+    rng = random.Random(seed)
+    cell = lambda: (rng.randrange(grid_size), rng.randrange(grid_size))
+    return [(cell(), cell()) for _ in range(n_pairs)]
+
+
+def make_walkable_grid(grid_size, obstacle_density, seed=0):
+    """grid_size x grid_size bool array (rows, columns) with random blocked cells."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    return rng.random((grid_size, grid_size)) >= obstacle_density
+
+
+def make_walkable_pairs(walkable, n_pairs, seed=0):
+    """Random start/goal cells that are both walkable."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    ys, xs = np.nonzero(walkable)
+    picks = rng.integers(len(xs), size=(n_pairs, 2))
+    return [((int(xs[a]), int(ys[a])), (int(xs[b]), int(ys[b]))) for a, b in picks]
+
+
+def make_scheduling_instance(n_meetings, seed=0, room_load=0.5):
+    """Courses and rooms (with capacities) for roughly n_meetings class meetings a week.
+
+    Rooms are sized so about `room_load` of all room time is needed; teachers
+    teach at most 8 courses and sections take at most 8.
+    """
+    from scheduler import Course
+
+    rng = random.Random(seed)
+    courses = []
+    meetings = 0
+    n_sections = max(1, n_meetings // 14)
+    while meetings < n_meetings:
+        section = len(courses) // 7 % n_sections
+        n = rng.choice((1, 2, 2, 3))
+        hours = {1: 3, 2: 1.5, 3: 1}[n]
+        courses.append(Course(f"SUBJ {len(courses):05d}", f"TEACHER {len(courses) // 6:04d}",
+                              f"SECTION {section:04d}", rng.randrange(20, 56), n, round(hours * 60)))
+        meetings += n
+
+    hours_needed = sum(c.meetings * c.minutes / 60 for c in courses)
+    n_rooms = max(2, round(hours_needed / (6 * 12 * room_load)))
+    rooms = [{"room": f"ROOM {i:04d}", "capacity": str(rng.choice((40, 50, 60, 60)))} for i in range(n_rooms)]
+    return courses, rooms
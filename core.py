@@ -0,0 +1,271 @@
+"""Room finder data and search functions.
+
+Everything here works without pygame or a display, so batch jobs, the
+server and the kiosk UI in main.py share one copy of the room data and the
+availability and route searches.
+"""
+import csv
+import os
+
+import metrics
+from availability import parse_clock, parse_time_range, room_name
+from navgraph import build_navigation_graph, room_floor
+from pathfinding import RouteTable, astar_search as grid_astar_search, grid_flood
+from room_search import RoomCatalog
+from route_cache import RouteCache, map_fingerprint
+from timetable_store import TimetableStore
+
+# CSV files
+TIMETABLE_FILE = "C:/Users/Asus/OneDrive/Desktop/myenv/AIwithHome/AI_final.proj/timetable.csv"
+ROOMS_FILE = "C:/Users/Asus/OneDrive/Desktop/myenv/AIwithHome/AI_final.proj/rooms.csv"
+
+# Room Coordinates (grid system)
+ROOM_COORDINATES = {
+    "START": (5, 13),  # Starting point
+    "APP DEV 301": (4, 13),
+    "BIZ LAB 201": (4, 13),
+    "ICT 202": (4, 6),
+    "ICT 203": (6, 13),
+    "ICT 205": (14, 13),
+    "ICT 206": (19, 6),
+    "ICT 207": (19, 13),
+    "ICT 302": (4, 6),
+    "ICT 303": (6, 13),
+    "ICT 305": (14, 13),
+    "ICT 306": (19, 13),
+    "ICT 307": (19, 6)
+}
+
+GRID_SIZE = 40  # A 10x10 grid for visualization
+
+# Floor plan used for obstacle-aware routing; 50px cells on the 1200x700 map
+MAP_IMAGE = "C:/Users/Asus/OneDrive/Desktop/myenv/AIwithHome/AI_final.proj/mapict.jpg"
+MAP_GRID = (24, 14)
+FLOORS = [1, 2, 3]
+STAIR_CELLS = [(5, 9), (18, 9)]
+START_FLOOR = 1
+
+# Where the map screens route from; main.py --kiosk picks another ROOM_COORDINATES entry
+KIOSK = "START"
+
+# Routes found by route_to_room() are kept here across restarts
+ROUTE_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "route_cache.sqlite")
+
+# Compiled by `python snapshot.py`; open_timetable() uses it while it matches the source files
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "isee.snapshot")
+SNAPSHOT = None
+
+# Load CSV data
+@metrics.timed("load_csv")
+def load_csv(file_path):
+    with open(file_path, mode="r") as file:
+        reader = csv.DictReader(file)
+        return [row for row in reader]
+
+def snapshot_sources(timetable_file=None, rooms_file=None):
+    sources = {"timetable": timetable_file or TIMETABLE_FILE, "rooms": rooms_file or ROOMS_FILE}
+    if os.path.exists(MAP_IMAGE):
+        sources["map"] = MAP_IMAGE
+    return sources
+
+
+def snapshot_config():
+    """Settings a snapshot is compiled with; a snapshot made with others is not used."""
+    return {"room_coordinates": ROOM_COORDINATES, "grid_size": GRID_SIZE, "floors": FLOORS,
+            "map_grid": MAP_GRID, "stairs": STAIR_CELLS, "elevators": []}
+
+
+@metrics.timed("open_timetable")
+def open_timetable(timetable_file=None, rooms_file=None, snapshot_dir=None):
+    """(rooms.csv rows, TimetableStore), from the compiled snapshot when it matches the files."""
+    global SNAPSHOT
+    timetable_file = timetable_file or TIMETABLE_FILE
+    rooms_file = rooms_file or ROOMS_FILE
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    if os.path.isdir(snapshot_dir):
+        from snapshot import load_snapshot  # NumPy only when there is a snapshot
+
+        try:
+            snapshot = load_snapshot(snapshot_dir)
+        except (OSError, ValueError) as e:
+            print(f"Error loading snapshot, reading the CSV files: {e}")
+        else:
+            if snapshot.is_current(snapshot_sources(timetable_file, rooms_file), snapshot_config()):
+                SNAPSHOT = snapshot
+                all_rooms = snapshot.all_rooms()
+                return all_rooms, TimetableStore(timetable_file, all_rooms, table=snapshot.timetable())
+            print(f"Snapshot {snapshot_dir} is out of date, reading the CSV files (rebuild it with snapshot.py)")
+    all_rooms = load_csv(rooms_file)
+    return all_rooms, TimetableStore(timetable_file, all_rooms)
+
+
+@metrics.timed("bfs_csp_search")
+def bfs_csp_search(timetable, all_rooms, time, day):
+    # One-off query: one scan of the parsed bookings, cheaper than building an
+    # index for it. main() and the server keep a prebuilt AvailabilityIndex.
+    minute = parse_clock(time) if isinstance(time, str) else time
+    day = day.strip().lower()
+    occupied = set()
+    if hasattr(timetable, "bookings"):
+        # A loader.TimetableTable has its times parsed already
+        for booking_day, room, start, end in timetable.bookings():
+            if booking_day == day and start <= minute <= end:
+                occupied.add(room)
+    else:
+        for entry in timetable:
+            # Only the rows for `day` have their times parsed
+            if entry["day"].strip().lower() == day:
+                time_range = parse_time_range(entry["time"])
+                if time_range is not None and time_range[0] <= minute <= time_range[1]:
+                    occupied.add(room_name(entry["room"]))
+    free = []
+    for row in all_rooms:
+        room = row["room"]
+        if room not in occupied:
+            occupied.add(room)  # list each room once, like AvailabilityIndex
+            free.append(room)
+    return free
+
+
+# Routes between every pair of ROOM_COORDINATES, filled in by precompute_routes()
+ROUTE_TABLE = None
+
+def precompute_routes():
+    """Solve all room-to-room routes once so map screens skip the search."""
+    global ROUTE_TABLE
+    ROUTE_TABLE = RouteTable(ROOM_COORDINATES, GRID_SIZE)
+    return ROUTE_TABLE
+
+
+# A* Search Algorithm
+@metrics.timed("astar_search")
+def astar_search(start, goal):
+    if ROUTE_TABLE is not None:
+        return ROUTE_TABLE.route(start, goal)
+    return grid_astar_search(start, goal, GRID_SIZE)
+
+def room_catalog(all_rooms):
+    """Room attributes and walking distances from ROOM_COORDINATES for ranked searches."""
+    return RoomCatalog(all_rooms, ROOM_COORDINATES, astar_search, distances=distances_from, node=room_node)
+
+# Multi-floor navigation graph, loaded on first use by navigation_graph()
+NAV_GRAPH = None
+NAV_GRAPH_FAILED = False  # don't retry a missing floor plan on every route
+
+def navigation_graph():
+    global NAV_GRAPH, NAV_GRAPH_FAILED
+    if NAV_GRAPH is None and SNAPSHOT is not None:
+        NAV_GRAPH = SNAPSHOT.navigation_graph()
+    if NAV_GRAPH is None and not NAV_GRAPH_FAILED:
+        try:
+            NAV_GRAPH = build_navigation_graph(MAP_IMAGE, FLOORS, MAP_GRID, stairs=STAIR_CELLS)
+        except Exception as e:
+            print(f"Error loading floor plan: {e}")
+            NAV_GRAPH_FAILED = True
+    return NAV_GRAPH
+
+
+# Route cache shared by every map screen, see route_cache()
+ROUTE_CACHE = None
+
+def route_cache():
+    """Return the route cache, invalidated if the rooms, grid or floor plan changed."""
+    global ROUTE_CACHE
+    fingerprint = map_fingerprint(ROOM_COORDINATES, GRID_SIZE, navigation_graph())
+    if ROUTE_CACHE is None:
+        try:
+            ROUTE_CACHE = RouteCache(fingerprint, path=ROUTE_CACHE_FILE)
+        except Exception as e:
+            print(f"Error opening route cache, keeping routes in memory only: {e}")
+            ROUTE_CACHE = RouteCache(fingerprint)
+    else:
+        ROUTE_CACHE.set_fingerprint(fingerprint)
+    return ROUTE_CACHE
+
+
+def room_node(origin):
+    """(floor, x, y) of a ROOM_COORDINATES name, an (x, y) cell on START_FLOOR, or a node."""
+    if isinstance(origin, str):
+        return (room_floor(origin, START_FLOOR), *ROOM_COORDINATES[origin])
+    if len(origin) == 2:
+        return (START_FLOOR, *origin)
+    return tuple(origin)
+
+
+# One flood per start node answers routes to every room, see routes_from()
+ROUTE_TREES = {}
+ROUTE_TREES_FINGERPRINT = None
+
+def routes_from(start):
+    """Shortest-path tree from a (floor, x, y) node reaching every room, flooded once per start.
+
+    Returns (tree, key): key(node) is the tree's name for a (floor, x, y)
+    node, which is the bare (x, y) cell when there is no floor plan.
+    """
+    global ROUTE_TREES_FINGERPRINT
+    graph = navigation_graph()
+    fingerprint = map_fingerprint(ROOM_COORDINATES, GRID_SIZE, graph)
+    if fingerprint != ROUTE_TREES_FINGERPRINT:
+        ROUTE_TREES.clear()
+        ROUTE_TREES_FINGERPRINT = fingerprint
+
+    entry = ROUTE_TREES.get(start)
+    if entry is None:
+        goals = [room_node(name) for name in ROOM_COORDINATES]
+        if graph is not None:
+            # Rooms drawn inside a wall can't be reached; don't flood the building looking for them.
+            # A start inside a wall gets an empty tree: nothing is reachable from it.
+            tree = graph.flood(start, targets=[goal for goal in goals if graph.walkable(goal)])
+            entry = (tree, tuple)
+        else:
+            tree = grid_flood(start[1:], GRID_SIZE, targets=[goal[1:] for goal in goals])
+            entry = (tree, lambda node: tuple(node[1:]))
+        ROUTE_TREES[start] = entry
+    return entry
+
+
+def find_route(start, goal):
+    """Route from one (floor, x, y) node to another, returning map cells; [] if it can't be walked."""
+    tree, key = routes_from(start)
+    path = tree.path_to(key(goal))
+    if not path:
+        # An open-grid route would go through walls; only use one when there is no floor plan
+        return [] if navigation_graph() is not None else astar_search(start[1:], goal[1:])
+    # Stairs are a change of floor on the same cell; draw them once
+    cells = []
+    for node in path:
+        cell = tuple(node[-2:])
+        if not cells or cells[-1] != cell:
+            cells.append(cell)
+    return cells
+
+
+def distances_from(origin=None):
+    """Walking cost from `origin` (default KIOSK) to every room, from one flood; None if unreachable.
+
+    Routes cost the same both ways, so this is also the cost from every room
+    to `origin`.
+    """
+    tree, key = routes_from(room_node(KIOSK if origin is None else origin))
+    return {name: tree.distance_to(key(room_node(name))) for name in ROOM_COORDINATES}
+
+
+def nearest(origins, room_name):
+    """Of `origins` (e.g. kiosks at several entrances), the one closest to the room, with its cost."""
+    costs = distances_from(room_name)
+    reachable = [(costs[origin], origin) for origin in origins if costs.get(origin) is not None]
+    if not reachable:
+        return None, None
+    cost, origin = min(reachable)
+    return origin, cost
+
+
+@metrics.timed("route_to_room")
+def route_to_room(room_name, origin=None):
+    """Route from `origin` (default KIOSK) to the room around walls and via stairs, as map cells.
+
+    Returns [] when the floor plan has no walkable route between them.
+    """
+    start = room_node(KIOSK if origin is None else origin)
+    goal = room_node(room_name)
+    return route_cache().get_or_compute(start, goal, find_route)
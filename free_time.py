@@ -0,0 +1,111 @@
+"""Free windows and earliest-available slots from an AvailabilityIndex.
+
+Answers questions such as "when is ICT 207 next free for 2 hours", "every
+free window of at least 90 minutes on Thursday" and "the earliest slot when
+ICT 202 and ICT 207 are both free". Each room's bookings are already sorted
+in the index; the bookings of several rooms are combined with one sweep over
+a heap merge of those lists, and the free windows are the gaps between the
+merged busy intervals.
+
+Windows are half-open [start, end) in minutes since midnight: a class from
+9:00 to 11:00 leaves its room free from 11:00, so back-to-back classes
+don't overlap. AvailabilityIndex point queries (free_rooms, is_free) keep
+the original room finder's check and still count 11:00 itself as booked.
+Rooms not in rooms.csv raise KeyError rather than showing as always free.
+"""
+import heapq
+
+from availability import DAYS, TIME_SLOTS, parse_clock
+
+# Opening hours of the room finder, the first and last of the dropdown times
+DAY_START = parse_clock(TIME_SLOTS[0])
+DAY_END = parse_clock(TIME_SLOTS[-1])
+
+
+def _minutes(value):
+    return parse_clock(value) if isinstance(value, str) else value
+
+
+def busy_intervals(index, rooms, day):
+    """Merged (start, end) intervals when any of `rooms` is booked on `day`, as a list."""
+    return [tuple(interval) for interval in _merged(index, rooms, day)]
+
+
+def _known(index, rooms):
+    if isinstance(rooms, str):
+        rooms = [rooms]
+    for room in rooms:
+        if not index.has_room(room):
+            raise KeyError(f"Unknown room: {room!r}")
+    return rooms
+
+
+def _merged(index, rooms, day):
+    if isinstance(rooms, str):
+        rooms = [rooms]
+    lists = [index.room_intervals(room, day) for room in rooms]
+    current = None
+    for start, end in lists[0] if len(lists) == 1 else heapq.merge(*lists):
+        if current is not None and start <= current[1]:
+            if end > current[1]:
+                current[1] = end
+        else:
+            if current is not None:
+                yield current
+            current = [start, end]
+    if current is not None:
+        yield current
+
+
+# Free windows between merged busy intervals, lazily so next_free can stop at the first
+def _gaps(busy, day_start, day_end, min_minutes):
+    cursor = day_start
+    for start, end in busy:
+        if start >= day_end:
+            break
+        if start > cursor and start - cursor >= min_minutes:
+            yield cursor, start
+        cursor = max(cursor, end)
+    if day_end > cursor and day_end - cursor >= min_minutes:
+        yield cursor, day_end
+
+
+def free_windows(index, rooms, day, min_minutes=0, day_start=DAY_START, day_end=DAY_END):
+    """Windows on `day` when every one of `rooms` (or the single room) is free."""
+    day_start, day_end = _minutes(day_start), _minutes(day_end)
+    return list(_gaps(_merged(index, _known(index, rooms), day), day_start, day_end, min_minutes))
+
+
+def all_free_windows(index, day, min_minutes=0, day_start=DAY_START, day_end=DAY_END):
+    """Free windows of every room on `day`, in rooms.csv order; rooms with none are left out."""
+    day_start, day_end = _minutes(day_start), _minutes(day_end)
+    windows = {}
+    for room in index.rooms:
+        gaps = list(_gaps(_merged(index, room, day), day_start, day_end, min_minutes))
+        if gaps:
+            windows[room] = gaps
+    return windows
+
+
+def next_free(index, rooms, minutes, day, after=None, days=DAYS, day_start=DAY_START, day_end=DAY_END):
+    """Earliest (day, start, end) from `after` on `day` when all `rooms` are free for `minutes`.
+
+    `end` is the end of the whole free window, which may be longer than
+    asked for. Days are searched in `days` order and wrap round to the same
+    day next week, so a window on `day` that starts before `after` is next
+    week's. Returns None if the rooms are never free that long.
+    """
+    rooms = _known(index, rooms)
+    day_start, day_end = _minutes(day_start), _minutes(day_end)
+    after = day_start if after is None else max(day_start, _minutes(after))
+    names = [name.lower() for name in days]
+    if day.strip().lower() not in names:
+        raise ValueError(f"Unknown day: {day!r}")
+    first = names.index(day.strip().lower())
+    for offset in range(len(days) + 1):
+        name = days[(first + offset) % len(days)]
+        opens = after if offset == 0 else day_start
+        window = next(_gaps(_merged(index, rooms, name), opens, day_end, minutes), None)
+        if window is not None:
+            return (name, *window)
+    return None
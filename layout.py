@@ -0,0 +1,124 @@
+"""Cached grid layout for lists of buttons: rects, hit-testing and scrolling.
+
+The room buttons and the time/day dropdowns are grids of equal cells, so a
+cell's rect and the cell under a point follow from arithmetic on the grid
+origin and pitch. GridLayout works those out once per layout change (item
+count, scroll position) for the rows in view only, and hit() finds the
+button under the mouse without testing any rects. Lists longer than the
+viewport scroll by rows or pages, so a frame costs the same however many
+items there are. Nothing here needs pygame; rects are (x, y, width, height)
+tuples that pygame.Rect accepts.
+"""
+
+
+class GridLayout:
+    """`count` cells of cell_width x cell_height in `columns` columns inside `viewport`.
+
+    viewport is the (x, y, width, height) area the grid may use. The grid is
+    centred horizontally; it is centred vertically when every row fits and
+    otherwise starts at the top of the viewport and scrolls. Item i sits at
+    row i // columns, column i % columns.
+    """
+
+    def __init__(self, count, columns, cell_width, cell_height, viewport, spacing=0, center=True):
+        self.columns = max(1, columns)
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.spacing = spacing
+        self.viewport = tuple(viewport)
+        self.center = center
+        self.col_pitch = cell_width + spacing
+        self.row_pitch = cell_height + spacing
+        x, _, width, height = self.viewport
+        self.visible_rows = max(1, (height + spacing) // self.row_pitch)
+        grid_width = self.col_pitch * self.columns - spacing
+        self.origin_x = x + (width - grid_width) // 2 if center else x
+        self.first_row = 0
+        self.version = 0  # bumped on every layout change, e.g. to key widget caches
+        self.set_count(count)
+
+    def set_count(self, count):
+        """Change the number of items, keeping the scroll position where possible."""
+        self.count = count
+        self.rows = -(-count // self.columns)
+        _, y, _, height = self.viewport
+        if self.center and self.rows <= self.visible_rows:
+            self.origin_y = y + (height - (self.row_pitch * self.rows - self.spacing)) // 2
+        else:
+            self.origin_y = y
+        self.first_row = min(self.first_row, self.max_first_row)
+        self._layout()
+
+    @property
+    def max_first_row(self):
+        return max(0, self.rows - self.visible_rows)
+
+    def _layout(self):
+        self.version += 1
+        first = self.first_row * self.columns
+        self.visible = range(first, min(self.count, first + self.visible_rows * self.columns))
+        self.rects = [self._rect(i) for i in self.visible]
+
+    def _rect(self, index):
+        row, col = divmod(index, self.columns)
+        return (self.origin_x + col * self.col_pitch, self.origin_y + (row - self.first_row) * self.row_pitch,
+                self.cell_width, self.cell_height)
+
+    def rect(self, index):
+        """Rect of item `index`, or None if it is scrolled out of view."""
+        if index not in self.visible:
+            return None
+        return self.rects[index - self.visible.start]
+
+    def items(self):
+        """(index, rect) for every item in view."""
+        return zip(self.visible, self.rects)
+
+    def hit(self, pos):
+        """Index of the item under `pos`, or None (gaps between cells hit nothing)."""
+        dx, dy = pos[0] - self.origin_x, pos[1] - self.origin_y
+        if dx < 0 or dy < 0:
+            return None
+        col, x_in = divmod(dx, self.col_pitch)
+        row, y_in = divmod(dy, self.row_pitch)
+        if col >= self.columns or row >= self.visible_rows or x_in >= self.cell_width or y_in >= self.cell_height:
+            return None
+        index = (self.first_row + row) * self.columns + col
+        return index if index < self.count else None
+
+    def bounds(self):
+        """Rect covering the rows in view."""
+        rows = -(-len(self.visible) // self.columns)
+        return (self.origin_x, self.origin_y, self.col_pitch * self.columns - self.spacing,
+                max(0, self.row_pitch * rows - self.spacing))
+
+    def scroll(self, rows):
+        """Scroll by `rows` (negative is up); returns True if the view moved."""
+        first_row = min(max(0, self.first_row + rows), self.max_first_row)
+        if first_row == self.first_row:
+            return False
+        self.first_row = first_row
+        self._layout()
+        return True
+
+    def scroll_to(self, index):
+        """Scroll just far enough to bring item `index` into view."""
+        row = index // self.columns
+        if row < self.first_row:
+            return self.scroll(row - self.first_row)
+        if row >= self.first_row + self.visible_rows:
+            return self.scroll(row - self.first_row - self.visible_rows + 1)
+        return False
+
+    def page(self, pages):
+        """Scroll by whole pages of visible rows."""
+        return self.scroll(pages * self.visible_rows)
+
+    @property
+    def page_number(self):
+        """1-based page of the first row in view."""
+        return -(-self.first_row // self.visible_rows) + 1
+
+    @property
+    def pages(self):
+        return max(1, -(-self.rows // self.visible_rows))
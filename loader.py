@@ -0,0 +1,166 @@
+"""Streaming, typed timetable loader with compact column storage.
+
+load_csv() keeps every row as a dict of strings that is parsed again on every
+query. load_timetable() reads the file one row at a time and parses each row
+once: rooms, days and every other text column are interned as small integer
+codes, and times become minute offsets, all stored in array columns. Rows
+that cannot be parsed are collected in `errors` instead of being dropped.
+"""
+import csv
+from array import array
+
+from availability import format_clock, parse_time_range, room_name
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Rows converted to Python ints at a time by bookings()
+BLOCK_ROWS = 65536
+
+
+class BadRow:
+    __slots__ = ("line", "reason", "values")
+
+    def __init__(self, line, reason, values):
+        self.line = line
+        self.reason = reason
+        self.values = values
+
+    def __repr__(self):
+        return f"BadRow(line={self.line}, reason={self.reason!r})"
+
+
+class TimetableTable:
+    """Timetable rows as parallel array columns.
+
+    `room`, `day` and each text column hold integer codes into the matching
+    name list (`rooms`, `days`, `names[column]`); `start` and `end` hold
+    minutes since midnight and `line` the row's line in the file. Row i can
+    be read back with `row(i)`.
+    """
+
+    def __init__(self, text_columns=()):
+        self.rooms = []
+        self.days = list(WEEKDAYS)
+        self.room = array("I")
+        self.day = array("B")
+        self.start = array("H")
+        self.end = array("H")
+        self.line = array("I")
+        self.names = {column: [] for column in text_columns}
+        self.codes = {column: array("I") for column in text_columns}
+        self.errors = []
+        self._room_codes = {}
+        self._day_codes = {day.lower(): i for i, day in enumerate(WEEKDAYS)}
+        self._name_codes = {column: {} for column in text_columns}
+        self._time_cache = {}
+
+    def __len__(self):
+        return len(self.room)
+
+    def _intern_room(self, room):
+        code = self._room_codes.get(room)
+        if code is None:
+            code = self._room_codes[room] = len(self.rooms)
+            self.rooms.append(room)
+        return code
+
+    def _intern(self, column, value):
+        codes = self._name_codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.names[column])
+            self.names[column].append(value)
+        return code
+
+    def append(self, line, room, day, time, extra=()):
+        """Parse and add one row; a bad row goes to `errors` and False is returned.
+
+        `extra` holds the values of the other text columns, in the order of
+        `codes`.
+        """
+        room = room_name(room)
+        day_code = self._day_codes.get(day.strip().lower())
+        time_range = self._time_cache.get(time)
+        if time_range is None:
+            time_range = self._time_cache[time] = parse_time_range(time) or ()
+        if not room:
+            reason = "missing room"
+        elif day_code is None:
+            reason = f"unknown day {day!r}"
+        elif not time_range:
+            reason = f"bad time range {time!r}"
+        else:
+            reason = None
+        if reason is not None:
+            self.errors.append(BadRow(line, reason, [room, day, time, *extra]))
+            return False
+
+        code = self._room_codes.get(room)
+        if code is None:
+            code = self._intern_room(room)
+        self.room.append(code)
+        self.day.append(day_code)
+        self.start.append(time_range[0])
+        self.end.append(time_range[1])
+        self.line.append(line)
+        for (column, codes), value in zip(self.codes.items(), extra):
+            codes.append(self._intern(column, value))
+        return True
+
+    def row(self, i):
+        """Row i in the original CSV form."""
+        row = {
+            "room": self.rooms[self.room[i]],
+            "time": f"{format_clock(self.start[i])} - {format_clock(self.end[i])}",
+            "day": self.days[self.day[i]],
+        }
+        for column, codes in self.codes.items():
+            row[column] = self.names[column][codes[i]]
+        return row
+
+    def bookings(self):
+        """(day, room, start, end) per row, as AvailabilityIndex expects."""
+        days = [day.lower() for day in self.days]
+        rooms = self.rooms
+        # Columns may be NumPy arrays (a memory-mapped snapshot); tolist() gives plain ints either way
+        for i in range(0, len(self), BLOCK_ROWS):
+            j = i + BLOCK_ROWS
+            columns = (self.room[i:j].tolist(), self.day[i:j].tolist(), self.start[i:j].tolist(), self.end[i:j].tolist())
+            for room, day, start, end in zip(*columns):
+                yield days[day], rooms[room], start, end
+
+    def nbytes(self):
+        """Bytes used by the array columns (not counting the interned names)."""
+        columns = [self.room, self.day, self.start, self.end, self.line, *self.codes.values()]
+        return sum(column.itemsize * len(column) for column in columns)
+
+
+def load_timetable(file_path, strict=False):
+    """Load timetable.csv into a TimetableTable, one row at a time.
+
+    Every column other than room, time and day (subject, teacher, section,
+    ...) is interned. Rows that do not parse are listed in `table.errors`;
+    with strict=True the first one raises ValueError instead.
+    """
+    with open(file_path, mode="r", newline="") as file:
+        reader = csv.reader(file)
+        header = [name.strip() for name in next(reader, [])]
+        missing = [column for column in ("room", "time", "day") if column not in header]
+        if missing:
+            raise ValueError(f"{file_path}: missing column(s) {', '.join(missing)}")
+        room_i, time_i, day_i = header.index("room"), header.index("time"), header.index("day")
+        extra_i = [i for i, column in enumerate(header) if column not in ("room", "time", "day")]
+        table = TimetableTable([header[i] for i in extra_i])
+
+        for values in reader:
+            if not values:
+                continue
+            if len(values) != len(header):
+                table.errors.append(BadRow(reader.line_num, f"expected {len(header)} columns, got {len(values)}", values))
+            else:
+                table.append(reader.line_num, values[room_i], values[day_i], values[time_i],
+                             [values[i] for i in extra_i])
+            if strict and table.errors:
+                error = table.errors[0]
+                raise ValueError(f"{file_path}:{error.line}: {error.reason}")
+    return table
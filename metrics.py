@@ -0,0 +1,170 @@
+"""Timers, counters and optional profiling for the hot paths.
+
+Timed functions record how many times they ran, their total and their
+slowest run; counters add up work such as A* nodes expanded. Both cost two
+perf_counter() calls or one dict update, so they stay on in production and
+can be dumped as JSON or Prometheus text:
+
+    python main.py --metrics-out metrics.prom
+    ISEE_METRICS=metrics.json python server.py      # also served at GET /metrics
+
+profile_session() wraps a run in cProfile or tracemalloc for a deeper look:
+
+    python main.py --profile cprofile --profile-out kiosk.prof
+"""
+import atexit
+import functools
+import json
+import os
+import time
+
+PREFIX = "isee"
+
+# name -> [calls, total seconds, max seconds]
+timers = {}
+# name -> value
+counters = {}
+
+
+def observe(name, seconds):
+    """Record one timed run of `name`."""
+    timer = timers.get(name)
+    if timer is None:
+        timers[name] = [1, seconds, seconds]
+    else:
+        timer[0] += 1
+        timer[1] += seconds
+        if seconds > timer[2]:
+            timer[2] = seconds
+
+
+def count(name, value=1):
+    counters[name] = counters.get(name, 0) + value
+
+
+def timed(name):
+    """Decorator recording every call of the function under `name`."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+class timer:
+    """Context manager recording the time spent in a block under `name`."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+
+
+def reset():
+    timers.clear()
+    counters.clear()
+
+
+def snapshot():
+    """All timers and counters as plain data."""
+    return {
+        "timers": {
+            name: {"count": calls, "total_seconds": total, "max_seconds": slowest, "mean_seconds": total / calls}
+            for name, (calls, total, slowest) in sorted(timers.items())
+        },
+        "counters": dict(sorted(counters.items())),
+    }
+
+
+def to_json():
+    return json.dumps(snapshot(), indent=2)
+
+
+def to_prometheus():
+    """Metrics in the Prometheus text exposition format."""
+    lines = []
+    for name, (calls, total, slowest) in sorted(timers.items()):
+        metric = f"{PREFIX}_{name}_seconds"
+        lines += [
+            f"# TYPE {metric} summary",
+            f"{metric}_count {calls}",
+            f"{metric}_sum {total:.9f}",
+            f"# TYPE {metric}_max gauge",
+            f"{metric}_max {slowest:.9f}",
+        ]
+    for name, value in sorted(counters.items()):
+        metric = f"{PREFIX}_{name}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def dump(path):
+    """Write the metrics to `path`: JSON for .json, Prometheus text otherwise."""
+    text = to_json() if path.endswith(".json") else to_prometheus()
+    with open(path, "w") as file:
+        file.write(text)
+
+
+class profile_session:
+    """Run a block under cProfile or tracemalloc and report where time or memory went.
+
+    mode is "cprofile", "tracemalloc" or None (do nothing). cProfile stats go
+    to `output` (default isee.prof) for pstats or snakeviz; the tracemalloc
+    report goes to `output` (default isee-memory.txt). The top entries are
+    also printed.
+    """
+
+    def __init__(self, mode=None, output=None, top=20):
+        if mode not in (None, "cprofile", "tracemalloc"):
+            raise ValueError(f"Unknown profile mode: {mode!r}")
+        self.mode = mode
+        self.output = output or {"cprofile": "isee.prof", "tracemalloc": "isee-memory.txt"}.get(mode)
+        self.top = top
+
+    def __enter__(self):
+        if self.mode == "cprofile":
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif self.mode == "tracemalloc":
+            import tracemalloc
+
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.mode == "cprofile":
+            import pstats
+
+            self.profiler.disable()
+            self.profiler.dump_stats(self.output)
+            pstats.Stats(self.profiler).sort_stats("cumulative").print_stats(self.top)
+            print(f"Profile written to {self.output}")
+        elif self.mode == "tracemalloc":
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            stats = tracemalloc.take_snapshot().statistics("lineno")
+            tracemalloc.stop()
+            report = [f"current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB"]
+            report += [str(stat) for stat in stats[:self.top]]
+            with open(self.output, "w") as file:
+                file.write("\n".join(report) + "\n")
+            print("\n".join(report))
+            print(f"Memory report written to {self.output}")
+
+
+# Kiosks can have their metrics written on exit without any code changes
+if os.environ.get("ISEE_METRICS"):
+    atexit.register(dump, os.environ["ISEE_METRICS"])
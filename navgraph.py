@@ -0,0 +1,254 @@
+"""Obstacle-aware, multi-floor navigation graph built from floor-plan bitmaps.
+
+Each floor is a grid of cells whose walkability comes from a floor-plan image
+(walls drawn in WALL_COLOR) or a derived black-and-white mask. Floors are
+joined by stairs and elevators, modelled as weighted edges between the same
+cell on different floors. Nodes are (floor, x, y) tuples.
+"""
+import hashlib
+import heapq
+import re
+
+import metrics
+from pathfinding import ShortestPathTree
+
+# Orange wall colour used in mapict.jpg
+WALL_COLOR = (255, 102, 0)
+# Sum of per-channel differences still counted as the wall colour (JPEG noise)
+WALL_TOLERANCE = 120
+# A cell is blocked when more than this share of its pixels is wall
+MAX_WALL_FRACTION = 0.08
+
+STAIR_COST = 10  # per floor climbed
+ELEVATOR_COST = 4  # per floor travelled
+ELEVATOR_WAIT = 15  # fixed cost of calling the elevator
+
+
+class FloorMask:
+    """Walkable cells of one floor, stored one bit per cell."""
+
+    def __init__(self, walkable):
+        import numpy as np
+
+        walkable = np.asarray(walkable, dtype=bool)
+        self.height, self.width = walkable.shape
+        self.bits = np.packbits(walkable, axis=None).tobytes()
+
+    @classmethod
+    def from_bits(cls, bits, width, height):
+        """Mask over already packed bits, e.g. a memory-mapped snapshot column (not copied)."""
+        mask = cls.__new__(cls)
+        mask.bits, mask.width, mask.height = bits, width, height
+        return mask
+
+    def __contains__(self, cell):
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        i = y * self.width + x
+        return bool(self.bits[i >> 3] >> (7 - (i & 7)) & 1)
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+    def to_array(self):
+        import numpy as np
+
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        return np.unpackbits(bits, count=self.width * self.height).astype(bool).reshape(self.height, self.width)
+
+    @classmethod
+    def from_image(cls, path, grid_shape, wall_color=WALL_COLOR, tolerance=WALL_TOLERANCE,
+                   max_wall_fraction=MAX_WALL_FRACTION):
+        """Build a mask from a floor-plan image split into grid_shape=(columns, rows) cells.
+
+        For a derived black-and-white mask pass wall_color=(0, 0, 0).
+        """
+        import numpy as np
+        from PIL import Image
+
+        columns, rows = grid_shape
+        with Image.open(path) as image:
+            # Resize so every cell covers the same whole number of pixels
+            cell = max(1, min(image.width // columns, image.height // rows))
+            pixels = np.asarray(image.convert("RGB").resize((columns * cell, rows * cell)), dtype=np.int16)
+
+        wall = np.abs(pixels - np.array(wall_color, dtype=np.int16)).sum(axis=2) <= tolerance
+        wall_fraction = wall.reshape(rows, cell, columns, cell).mean(axis=(1, 3))
+        return cls(wall_fraction <= max_wall_fraction)
+
+
+# Floor number from a room name: "ICT 302" -> 3, "BIZ LAB 201" -> 2
+def room_floor(room_name, default=1):
+    match = re.search(r"\b(\d)\d\d\b", room_name)
+    return int(match.group(1)) if match else default
+
+
+class NavigationGraph:
+    """Floors of walkable cells joined by stairs and elevators."""
+
+    def __init__(self):
+        self.floors = {}
+        self.links = {}
+        self._min_floor_cost = None
+        self._fingerprint = None
+
+    def add_floor(self, floor, mask):
+        self.floors[floor] = mask
+        self._fingerprint = None
+
+    def fingerprint(self):
+        """Hash of every floor mask and stair/elevator edge; changes whenever the graph does."""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for floor in sorted(self.floors):
+                mask = self.floors[floor]
+                digest.update(f"{floor}:{mask.width}x{mask.height}:".encode())
+                digest.update(mask.bits)
+            for node in sorted(self.links):
+                digest.update(repr((node, sorted(self.links[node]))).encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def _link(self, a, b, cost):
+        self._fingerprint = None
+        self.links.setdefault(a, []).append((b, cost))
+        self.links.setdefault(b, []).append((a, cost))
+
+    def add_stairs(self, cell, floors, cost_per_floor=STAIR_COST):
+        """Stairs at `cell` connecting each pair of consecutive floors."""
+        floors = sorted(floors)
+        for lower, upper in zip(floors, floors[1:]):
+            self._link((lower, *cell), (upper, *cell), cost_per_floor * (upper - lower))
+        self._update_floor_cost(cost_per_floor)
+
+    def add_elevator(self, cell, floors, cost_per_floor=ELEVATOR_COST, wait=ELEVATOR_WAIT):
+        """Elevator at `cell` connecting every pair of served floors directly."""
+        floors = sorted(floors)
+        for i, a in enumerate(floors):
+            for b in floors[i + 1:]:
+                self._link((a, *cell), (b, *cell), wait + cost_per_floor * (b - a))
+        self._update_floor_cost(cost_per_floor)
+
+    def _update_floor_cost(self, cost_per_floor):
+        if self._min_floor_cost is None or cost_per_floor < self._min_floor_cost:
+            self._min_floor_cost = cost_per_floor
+
+    def walkable(self, node):
+        floor, x, y = node
+        mask = self.floors.get(floor)
+        return mask is not None and (x, y) in mask
+
+    @metrics.timed("navgraph_astar")
+    def astar(self, start, goal):
+        """Return the cheapest list of (floor, x, y) nodes from start to goal, or []."""
+        if not (self.walkable(start) and self.walkable(goal)):
+            return []
+
+        gf, gx, gy = goal
+        floor_cost = self._min_floor_cost or 0
+        masks = self._masks()
+
+        def heuristic(node):
+            return abs(node[1] - gx) + abs(node[2] - gy) + abs(node[0] - gf) * floor_cost
+
+        g_score = {start: 0}
+        came_from = {}
+        closed = set()
+        h = heuristic(start)
+        open_heap = [(h, h, start)]
+
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+            if current in closed:
+                continue
+            if current == goal:
+                metrics.count("navgraph_nodes_expanded", len(closed))
+                path = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    path.append(current)
+                return path[::-1]
+
+            closed.add(current)
+            g = g_score[current]
+            for neighbor, cost in self._steps(current, masks):
+                if neighbor in closed:
+                    continue
+                tentative = g + cost
+                if tentative < g_score.get(neighbor, tentative + 1):
+                    g_score[neighbor] = tentative
+                    came_from[neighbor] = current
+                    h = heuristic(neighbor)
+                    heapq.heappush(open_heap, (tentative + h, h, neighbor))
+
+        metrics.count("navgraph_nodes_expanded", len(closed))
+        return []
+
+    def _masks(self):
+        return {floor: (mask.bits, mask.width, mask.height) for floor, mask in self.floors.items()}
+
+    def _steps(self, node, masks):
+        """(neighbor, cost) pairs: walkable cells next to `node`, then its stairs and elevators."""
+        floor, x, y = node
+        bits, width, height = masks[floor]
+        steps = []
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < width and 0 <= ny < height:
+                i = ny * width + nx
+                if bits[i >> 3] >> (7 - (i & 7)) & 1:
+                    steps.append(((floor, nx, ny), 1))
+        for neighbor, cost in self.links.get(node, ()):
+            if neighbor[0] in masks:
+                steps.append((neighbor, cost))
+        return steps
+
+    @metrics.timed("navgraph_flood")
+    def flood(self, source, targets=None):
+        """Dijkstra from `source` over every floor, as a ShortestPathTree of (floor, x, y) nodes.
+
+        With `targets`, the flood stops once all of them are settled. Stairs
+        and elevators cost the same both ways, so the tree also gives the
+        distance from every node to `source`.
+        """
+        if not self.walkable(source):
+            return ShortestPathTree(source, {}, {})
+        masks = self._masks()
+        distance = {source: 0}
+        parent = {}
+        settled = set()
+        remaining = None if targets is None else set(targets)
+        heap = [(0, source)]
+        while heap:
+            d, current = heapq.heappop(heap)
+            if current in settled:
+                continue
+            settled.add(current)
+            if remaining is not None:
+                remaining.discard(current)
+                if not remaining:
+                    break
+            for neighbor, cost in self._steps(current, masks):
+                tentative = d + cost
+                if tentative < distance.get(neighbor, tentative + 1):
+                    distance[neighbor] = tentative
+                    parent[neighbor] = current
+                    heapq.heappush(heap, (tentative, neighbor))
+        metrics.count("flood_nodes_reached", len(settled))
+        # Nodes still queued have tentative distances only
+        distance = {node: distance[node] for node in settled}
+        return ShortestPathTree(source, distance, parent)
+
+
+def build_navigation_graph(plan_image, floors, grid_shape, stairs=(), elevators=()):
+    """One graph for a building whose floors all share `plan_image`."""
+    mask = FloorMask.from_image(plan_image, grid_shape)
+    graph = NavigationGraph()
+    for floor in floors:
+        graph.add_floor(floor, mask)
+    for cell in stairs:
+        graph.add_stairs(cell, floors)
+    for cell in elevators:
+        graph.add_elevator(cell, floors)
+    return graph
@@ -0,0 +1,91 @@
+"""Batch availability: one day x time-slot x room occupancy matrix for every slot at once."""
+import json
+
+import numpy as np
+
+from availability import DAYS, TIME_SLOTS, parse_clock, parse_time_range, room_name
+
+
+class OccupancyMatrix:
+    """Boolean occupancy array of shape (days, time slots, rooms).
+
+    `occupied[d, s, r]` is True when room `rooms[r]` has a class at
+    `slots[s]` on `days[d]`. Any (day, slot) lookup is a slice of the array.
+    """
+
+    def __init__(self, occupied, days, slots, rooms):
+        self.occupied = occupied
+        self.days = list(days)
+        self.slots = list(slots)
+        self.rooms = list(rooms)
+        self._day_index = {day.lower(): i for i, day in enumerate(self.days)}
+        self._slot_index = {parse_clock(slot): i for i, slot in enumerate(self.slots)}
+
+    def slot(self, time, day):
+        """Return the occupancy row (one bool per room) for `time` on `day`."""
+        minute = parse_clock(time) if isinstance(time, str) else time
+        try:
+            return self.occupied[self._day_index[day.strip().lower()], self._slot_index[minute]]
+        except KeyError:
+            raise KeyError(f"No slot {time!r} on {day!r} in the occupancy matrix") from None
+
+    def free_rooms(self, time, day):
+        """Return the free rooms for `time` on `day`, in rooms.csv order."""
+        return [self.rooms[i] for i in np.flatnonzero(~self.slot(time, day))]
+
+    def to_dict(self):
+        """Free rooms for every day and slot, ready for json.dumps."""
+        free = ~self.occupied
+        return {
+            day: {slot: [self.rooms[r] for r in np.flatnonzero(free[d, s])] for s, slot in enumerate(self.slots)}
+            for d, day in enumerate(self.days)
+        }
+
+    def save(self, path):
+        """Export the whole matrix with its labels as .npz (or .json for front-ends)."""
+        if str(path).endswith(".json"):
+            with open(path, "w") as file:
+                json.dump({"days": self.days, "slots": self.slots, "rooms": self.rooms,
+                           "occupied": self.occupied.astype(int).tolist()}, file)
+        else:
+            np.savez_compressed(path, occupied=self.occupied, days=self.days, slots=self.slots, rooms=self.rooms)
+
+    @classmethod
+    def load(cls, path):
+        if str(path).endswith(".json"):
+            with open(path) as file:
+                data = json.load(file)
+            return cls(np.array(data["occupied"], dtype=bool), data["days"], data["slots"], data["rooms"])
+        with np.load(path) as data:
+            return cls(data["occupied"], data["days"].tolist(), data["slots"].tolist(), data["rooms"].tolist())
+
+
+def build_occupancy(timetable, all_rooms, days=DAYS, slots=TIME_SLOTS):
+    """Build the occupancy matrix for every (day, slot) from timetable and rooms rows."""
+    rooms = list(dict.fromkeys(row["room"] for row in all_rooms))
+    room_index = {room: i for i, room in enumerate(rooms)}
+    day_index = {day.lower(): i for i, day in enumerate(days)}
+
+    # Parse each row once into parallel columns
+    row_day, row_room, row_start, row_end = [], [], [], []
+    for entry in timetable:
+        d = day_index.get(entry["day"].strip().lower())
+        r = room_index.get(room_name(entry["room"]))
+        time_range = parse_time_range(entry["time"])
+        if d is None or r is None or time_range is None:
+            continue
+        row_day.append(d)
+        row_room.append(r)
+        row_start.append(time_range[0])
+        row_end.append(time_range[1])
+
+    slot_minutes = np.array([parse_clock(slot) for slot in slots], dtype=np.int16)
+    occupied = np.zeros((len(days), len(slots), len(rooms)), dtype=bool)
+    if row_day:
+        start = np.array(row_start, dtype=np.int16)[:, None]
+        end = np.array(row_end, dtype=np.int16)[:, None]
+        # rows x slots: does the class cover the slot (inclusive, like bfs_csp_search)?
+        hits, slot_hit = np.nonzero((start <= slot_minutes) & (slot_minutes <= end))
+        occupied[np.array(row_day)[hits], slot_hit, np.array(row_room)[hits]] = True
+
+    return OccupancyMatrix(occupied, days, slots, rooms)
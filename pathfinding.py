@@ -0,0 +1,143 @@
+"""Grid pathfinding: heap-based A*, one-to-many floods and a precomputed route table for named rooms."""
+import heapq
+from collections import deque
+
+import metrics
+
+
+# Manhattan Distance Heuristic
+def manhattan_distance(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+# A* Search Algorithm on an open grid_size x grid_size grid
+@metrics.timed("astar_grid_search")
+def astar_search(start, goal, grid_size):
+    """Return the list of cells from start to goal (inclusive), or [] if unreachable.
+
+    The open set is a binary heap with lazy deletion: stale entries are skipped
+    when popped, so membership checks are dict/set lookups instead of list scans.
+    """
+    if start == goal:
+        return [start]
+
+    gx, gy = goal
+    g_score = {start: 0}
+    came_from = {}
+    closed = set()
+    h = abs(start[0] - gx) + abs(start[1] - gy)
+    # (f, h, cell): ties on f go to the cell closest to the goal
+    open_heap = [(h, h, start)]
+
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+        if current in closed:
+            continue
+        if current == goal:
+            metrics.count("astar_nodes_expanded", len(closed))
+            path = [current]
+            while current in came_from:
+                current = came_from[current]
+                path.append(current)
+            return path[::-1]
+
+        closed.add(current)
+        x, y = current
+        next_g = g_score[current] + 1
+        for neighbor in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            nx, ny = neighbor
+            if not (0 <= nx < grid_size and 0 <= ny < grid_size) or neighbor in closed:
+                continue
+            if next_g < g_score.get(neighbor, next_g + 1):
+                g_score[neighbor] = next_g
+                came_from[neighbor] = current
+                h = abs(nx - gx) + abs(ny - gy)
+                heapq.heappush(open_heap, (next_g + h, h, neighbor))
+
+    metrics.count("astar_nodes_expanded", len(closed))
+    return []
+
+
+class ShortestPathTree:
+    """Distances and parent links from one source, found by a single flood.
+
+    Answers the distance and path to every node the flood reached, so one
+    flood replaces an A* search per destination.
+    """
+
+    def __init__(self, source, distance, parent):
+        self.source = source
+        self.distance = distance
+        self.parent = parent
+
+    def __contains__(self, node):
+        return node in self.distance
+
+    def distance_to(self, node):
+        """Cost from the source to `node`, or None if the flood did not reach it."""
+        return self.distance.get(node)
+
+    def path_to(self, node):
+        """Nodes from the source to `node` (inclusive), or [] if it was not reached."""
+        if node not in self.distance:
+            return []
+        path = [node]
+        while node in self.parent:
+            node = self.parent[node]
+            path.append(node)
+        return path[::-1]
+
+
+@metrics.timed("grid_flood")
+def grid_flood(source, grid_size, targets=None):
+    """Breadth-first flood of the open grid from `source`, as a ShortestPathTree.
+
+    With `targets`, the flood stops as soon as all of them are reached.
+    """
+    distance = {source: 0}
+    parent = {}
+    remaining = None if targets is None else set(targets) - {source}
+    queue = deque([source])
+    while queue and (remaining is None or remaining):
+        current = queue.popleft()
+        x, y = current
+        d = distance[current] + 1
+        for neighbor in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            nx, ny = neighbor
+            if 0 <= nx < grid_size and 0 <= ny < grid_size and neighbor not in distance:
+                distance[neighbor] = d
+                parent[neighbor] = current
+                queue.append(neighbor)
+                if remaining:
+                    remaining.discard(neighbor)
+    metrics.count("flood_nodes_reached", len(distance))
+    return ShortestPathTree(source, distance, parent)
+
+
+class RouteTable:
+    """Routes between every pair of room coordinates, solved once up front.
+
+    Rooms sharing a coordinate share one route, and each unordered pair is
+    searched once with the reverse direction served by reversing the path.
+    """
+
+    def __init__(self, room_coordinates, grid_size):
+        self.grid_size = grid_size
+        self.routes = {}
+        points = sorted(set(room_coordinates.values()))
+        for i, a in enumerate(points):
+            self.routes[a, a] = [a]
+            for b in points[i + 1:]:
+                path = astar_search(a, b, grid_size)
+                self.routes[a, b] = path
+                self.routes[b, a] = path[::-1]
+
+    def __len__(self):
+        return len(self.routes)
+
+    def route(self, start, goal):
+        """Return a copy of the precomputed path, searching on a table miss."""
+        path = self.routes.get((start, goal))
+        if path is None:
+            return astar_search(start, goal, self.grid_size)
+        return list(path)
@@ -0,0 +1,160 @@
+"""Dirty-rectangle rendering for the kiosk screens.
+
+A screen lists what it shows as widgets every frame. DirtyRenderer compares
+them with the previous frame, repaints only the regions whose widgets
+appeared, disappeared or changed, and sends just those rectangles to the
+display with pygame.display.update(). Between frames wait_events() sleeps
+until there is input, so an idle screen uses no CPU.
+
+PathAnimation moves a marker along a route by elapsed time rather than by
+frame count, stamping the cells it has passed onto a cached layer once.
+"""
+import pygame
+
+import metrics
+
+FPS = 30  # upper bound on redraws, e.g. while the mouse is moving
+
+
+class DirtyRenderer:
+    """Draws widgets over a static background, updating only what changed.
+
+    A widget is a (bounds, state, draw) tuple: `bounds` is the Rect it paints
+    into, `state` any hashable value that changes whenever it looks different
+    (hover, label, ...) and `draw(surface)` paints it.
+    """
+
+    def __init__(self, screen, background, fps=FPS):
+        self.screen = screen
+        self.background = background
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.stats = {"frames": 0, "full_redraws": 0, "rects": 0, "pixels": 0}
+        self._shown = None  # (bounds, state) of every widget on screen; None forces a full redraw
+        self._changed = []  # background regions drawn into since the last frame
+
+    def invalidate(self, rect=None):
+        """Redraw `rect` next frame, e.g. after drawing into the background.
+
+        Without a rect everything is redrawn, e.g. after another screen used
+        the display.
+        """
+        if rect is None:
+            self._shown = None
+        else:
+            self._changed.append(pygame.Rect(rect))
+
+    @metrics.timed("frame_render")
+    def render(self, widgets):
+        """Draw the frame and return the rectangles that were updated."""
+        shown = {(tuple(bounds), state) for bounds, state, _ in widgets}
+        self.stats["frames"] += 1
+
+        if self._shown is None:
+            self.screen.blit(self.background, (0, 0))
+            for _, _, draw in widgets:
+                draw(self.screen)
+            pygame.display.flip()
+            self._shown = shown
+            self._changed = []
+            self.stats["full_redraws"] += 1
+            pixels = self.screen.get_width() * self.screen.get_height()
+            self.stats["pixels"] += pixels
+            metrics.count("frame_pixels", pixels)
+            return [self.screen.get_rect()]
+
+        dirty = [pygame.Rect(bounds) for bounds in {bounds for bounds, _ in shown ^ self._shown}]
+        dirty.extend(self._changed)
+        self._shown = shown
+        self._changed = []
+        if not dirty:
+            return []
+
+        for rect in dirty:
+            # Repaint the background under the rect, then every widget touching it, in order
+            self.screen.set_clip(rect)
+            self.screen.blit(self.background, rect, rect)
+            for bounds, _, draw in widgets:
+                if rect.colliderect(bounds):
+                    draw(self.screen)
+        self.screen.set_clip(None)
+        pygame.display.update(dirty)
+        self.stats["rects"] += len(dirty)
+        pixels = sum(rect.width * rect.height for rect in dirty)
+        self.stats["pixels"] += pixels
+        metrics.count("frame_pixels", pixels)
+        return dirty
+
+    def wait_events(self, timeout=None):
+        """Sleep until there is input, or `timeout` ms pass, and return the pending events.
+
+        timeout=0 only caps the frame rate, for screens that are animating.
+        """
+        self.clock.tick(self.fps)
+        if timeout == 0:
+            return pygame.event.get()
+        event = pygame.event.wait() if timeout is None else pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+
+class PathAnimation:
+    """A marker walking a path of grid cells at `speed` cells per second.
+
+    The marker position is interpolated from the time since start(), so the
+    route takes the same time at any frame rate and the loop can keep
+    handling input. Cells the marker has passed are drawn once onto `layer`,
+    normally the DirtyRenderer background, so a frame only draws the moving
+    marker whatever the length of the path.
+    """
+
+    def __init__(self, path, marker, layer, cell_size=50, offset=None, speed=10):
+        self.path = list(path or [])
+        self.marker = marker
+        self.layer = layer
+        self.cell_size = cell_size
+        self.offset = cell_size // 4 if offset is None else offset
+        self.speed = speed
+        self.start_time = 0
+        self.stamped = 0  # cells already drawn onto the layer
+        self.position = self._pixel(*self.path[0]) if self.path else (0, 0)
+
+    def _pixel(self, x, y):
+        return (round(x * self.cell_size + self.offset), round(y * self.cell_size + self.offset))
+
+    @property
+    def duration(self):
+        """Milliseconds from the first cell to the last."""
+        return max(0, len(self.path) - 1) * 1000 / self.speed
+
+    def start(self, now):
+        """Start (or restart) at `now`, in pygame.time.get_ticks() milliseconds."""
+        self.start_time = now
+        self.stamped = 0
+
+    def finished(self, now):
+        return now - self.start_time >= self.duration and self.stamped == len(self.path)
+
+    def update(self, now):
+        """Move the marker to where it is at `now`; return the layer rects drawn into."""
+        if not self.path:
+            return []
+        progress = min(max(0, now - self.start_time) * self.speed / 1000, len(self.path) - 1)
+        i = int(progress)
+        (x0, y0), (x1, y1) = self.path[i], self.path[min(i + 1, len(self.path) - 1)]
+        t = progress - i
+        self.position = self._pixel(x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
+
+        rects = []
+        while self.stamped <= i:
+            x, y = self.path[self.stamped]
+            rects.append(self.layer.blit(self.marker, self._pixel(x, y)))
+            self.stamped += 1
+        return rects
+
+    def widget(self):
+        """The moving marker as a DirtyRenderer widget."""
+        position = self.position
+        return (self.marker.get_rect(topleft=position), position,
+                lambda surface: surface.blit(self.marker, position))
@@ -0,0 +1,172 @@
+"""Free rooms that meet a request, nearest first.
+
+rooms.csv may carry a capacity, a type (lab or lecture) and a list of
+equipment separated by semicolons:
+
+    room,capacity,type,equipment
+    ICT 207,40,lab,projector;computers;aircon
+
+RoomCatalog keeps one bitset per attribute value, with bit i standing for the
+i-th room in rooms.csv (the same order AvailabilityIndex.free_mask uses), so
+a query is a few integer ANDs. Walking distances from each origin are
+measured once from the route lengths and kept as rooms sorted by distance;
+a ranked query walks that order and stops after `limit` matches.
+"""
+import bisect
+
+EQUIPMENT_SEPARATOR = ";"
+
+
+def room_capacity(row):
+    """Seats in a rooms.csv row; rooms without a capacity column fit any section."""
+    capacity = (row.get("capacity") or "").strip()
+    return int(capacity) if capacity else float("inf")
+
+
+def room_type(row):
+    return (row.get("type") or "").strip().lower()
+
+
+def room_building(row):
+    """Building of a rooms.csv row: its building column, else the name before the room number."""
+    building = (row.get("building") or "").strip()
+    if building:
+        return building
+    name = row["room"].strip()
+    return name.rsplit(" ", 1)[0] if " " in name else name
+
+
+def room_equipment(row):
+    return {item.strip().lower() for item in (row.get("equipment") or "").split(EQUIPMENT_SEPARATOR) if item.strip()}
+
+
+class RoomCatalog:
+    """Room attributes as bitsets plus per-origin walking distance tables.
+
+    `route(start, goal)` returns the cell path between two coordinates, e.g.
+    core.astar_search; a room's distance is the number of steps on it.
+    `distances(start)`, if given, instead returns {room: cost or None} for
+    every room from one search (core.distances_from floods the map once).
+    `node(origin)`, if given, turns an origin into what `distances` takes,
+    e.g. core.room_node's (floor, x, y); tables are kept per node, so rooms
+    on different floors above the same cell get their own.
+    Rooms without coordinates, or that cannot be reached, rank last.
+    """
+
+    def __init__(self, all_rooms, room_coordinates, route, distances=None, node=None):
+        self.rooms = []
+        self.capacity = []
+        seen = set()
+        for row in all_rooms:
+            if row["room"] not in seen:
+                seen.add(row["room"])
+                self.rooms.append(row["room"])
+                self.capacity.append(room_capacity(row))
+        self.room_coordinates = room_coordinates
+        self.route = route
+        self.distances = distances
+        self.node = node
+        self.all_mask = (1 << len(self.rooms)) - 1
+
+        rows = {row["room"]: row for row in all_rooms}
+        self.type_masks = {}
+        self.equipment_masks = {}
+        for i, room in enumerate(self.rooms):
+            bit = 1 << i
+            kind = room_type(rows[room])
+            if kind:
+                self.type_masks[kind] = self.type_masks.get(kind, 0) | bit
+            for item in room_equipment(rows[room]):
+                self.equipment_masks[item] = self.equipment_masks.get(item, 0) | bit
+
+        # Rooms with at least capacity_levels[k] seats are capacity_masks[k]
+        at_least = {}
+        mask = 0
+        for i in sorted(range(len(self.rooms)), key=self.capacity.__getitem__, reverse=True):
+            mask |= 1 << i
+            at_least[self.capacity[i]] = mask
+        self.capacity_levels = sorted(at_least)
+        self.capacity_masks = [at_least[level] for level in self.capacity_levels]
+
+        # origin node -> (room indexes nearest first, distance per room index)
+        self._by_distance = {}
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def matching_mask(self, min_capacity=0, room_type=None, equipment=()):
+        """Rooms with at least `min_capacity` seats, of `room_type` and with all of `equipment`."""
+        mask = self.all_mask
+        if min_capacity:
+            k = bisect.bisect_left(self.capacity_levels, min_capacity)
+            mask &= self.capacity_masks[k] if k < len(self.capacity_masks) else 0
+        if room_type:
+            mask &= self.type_masks.get(room_type.strip().lower(), 0)
+        for item in equipment:
+            mask &= self.equipment_masks.get(item.strip().lower(), 0)
+        return mask
+
+    def _origin(self, origin):
+        if self.node is not None:
+            return self.node(origin)
+        if isinstance(origin, str):
+            return self.room_coordinates[origin]
+        return tuple(origin)
+
+    def distance_table(self, origin):
+        """(room indexes nearest first, distances) from `origin`, measured on first use."""
+        start = self._origin(origin)
+        table = self._by_distance.get(start)
+        if table is None and self.distances is not None:
+            costs = self.distances(start)
+            distances = [float("inf") if costs.get(room) is None else costs[room] for room in self.rooms]
+            order = sorted(range(len(self.rooms)), key=distances.__getitem__)
+            table = self._by_distance[start] = (order, distances)
+        elif table is None:
+            steps = {}
+            distances = []
+            for room in self.rooms:
+                goal = self.room_coordinates.get(room)
+                if goal is None:
+                    distances.append(float("inf"))
+                    continue
+                if goal not in steps:
+                    path = self.route(start[-2:], goal)
+                    steps[goal] = len(path) - 1 if path else float("inf")
+                distances.append(steps[goal])
+            order = sorted(range(len(self.rooms)), key=distances.__getitem__)
+            table = self._by_distance[start] = (order, distances)
+        return table
+
+    def search(self, free_mask, origin="START", min_capacity=0, room_type=None, equipment=(), limit=None):
+        """Rooms in `free_mask` that meet the constraints as (room, distance), nearest first.
+
+        `free_mask` comes from AvailabilityIndex.free_mask(time, day), built
+        from the same rooms.csv rows.
+        """
+        mask = free_mask & self.matching_mask(min_capacity, room_type, equipment)
+        if not mask:
+            return []
+        order, distances = self.distance_table(origin)
+        # One character per room, so testing a room is a string index, not a big-int shift
+        bits = bin(mask)[:1:-1].ljust(len(order), "0")
+        count = bits.count("1")
+        if count * 8 < len(order):
+            # Few matches: sort just those instead of walking the whole order
+            matches = []
+            i = bits.find("1")
+            while i != -1:
+                matches.append(i)
+                i = bits.find("1", i + 1)
+            matches.sort(key=distances.__getitem__)  # ties keep rooms.csv order, as in `order`
+            return [(self.rooms[i], distances[i]) for i in matches[:limit]]
+
+        limit = limit or count
+        rooms = self.rooms
+        found = []
+        for i in order:
+            if bits[i] == "1":
+                found.append((rooms[i], distances[i]))
+                if len(found) == limit:
+                    break
+        return found
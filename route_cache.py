@@ -0,0 +1,106 @@
+"""LRU route cache with an optional SQLite store that survives restarts.
+
+Entries are keyed by (start, goal, fingerprint), where the fingerprint hashes
+everything a route depends on (room coordinates, grid size, walkable masks),
+so editing any of them makes old entries unreachable instead of stale.
+"""
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+
+
+def map_fingerprint(room_coordinates, grid_size, graph=None):
+    """Hash of the room coordinates, grid size and (optionally) the navigation graph."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(sorted(room_coordinates.items()), sort_keys=True).encode())
+    digest.update(json.dumps(grid_size).encode())
+    if graph is not None:
+        digest.update(graph.fingerprint().encode())
+    return digest.hexdigest()
+
+
+class RouteCache:
+    """In-process LRU cache of paths, backed by an SQLite file when `path` is given."""
+
+    def __init__(self, fingerprint, capacity=256, path=None):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries = OrderedDict()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS routes ("
+                "fingerprint TEXT, start TEXT, goal TEXT, path TEXT, "
+                "PRIMARY KEY (fingerprint, start, goal))"
+            )
+        self.fingerprint = None
+        self.set_fingerprint(fingerprint)
+
+    def set_fingerprint(self, fingerprint):
+        """Switch to a new map fingerprint, dropping routes cached for any other map."""
+        if fingerprint == self.fingerprint:
+            return
+        self.fingerprint = fingerprint
+        self._entries.clear()
+        if self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM routes WHERE fingerprint != ?", (fingerprint,))
+
+    def get(self, start, goal):
+        key = (start, goal)
+        path = self._entries.get(key)
+        if path is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(path)
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT path FROM routes WHERE fingerprint = ? AND start = ? AND goal = ?",
+                (self.fingerprint, json.dumps(start), json.dumps(goal)),
+            ).fetchone()
+            if row is not None:
+                path = [tuple(cell) for cell in json.loads(row[0])]
+                self._remember(key, path)
+                self.hits += 1
+                self.disk_hits += 1
+                return list(path)
+
+        self.misses += 1
+        return None
+
+    def put(self, start, goal, path):
+        self._remember((start, goal), list(path))
+        if self._db is not None:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?)",
+                    (self.fingerprint, json.dumps(start), json.dumps(goal), json.dumps(path)),
+                )
+
+    def _remember(self, key, path):
+        self._entries[key] = path
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def get_or_compute(self, start, goal, search):
+        """Return the cached path, or run search(start, goal) and cache its result."""
+        path = self.get(start, goal)
+        if path is None:
+            path = search(start, goal)
+            self.put(start, goal, path)
+        return path
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "disk_hits": self.disk_hits,
+                "size": len(self._entries), "capacity": self.capacity}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,587 @@
+"""Conflict-free timetable generator.
+
+Courses are read from a CSV with the columns subject, teacher, section, size,
+meetings (per week) and hours (per meeting). Rooms come from rooms.csv; an
+optional capacity column limits which sections fit in a room.
+
+Every class meeting is one variable whose value is a (day, start slot, room).
+The schedule is built by constraint propagation: the meeting with the fewest
+remaining start times goes next (MRV, ties broken by how many other meetings
+share its teacher or section), and placing it forward-checks the start times
+of every meeting that shares its teacher or section. Meetings left without a
+conflict-free value are placed with the fewest clashes and then repaired by
+min-conflicts local search, which also spreads a course's meetings across days.
+
+    python scheduler.py courses.csv rooms.csv -o timetable.csv
+    python scheduler.py courses.csv rooms.csv --workers 8
+
+With --workers, solve_portfolio() runs several seeded strategies in
+separate processes. They share the best cost found so far, so a restart
+that can't beat it gives up early, and all stop once one reaches the
+target cost.
+"""
+import argparse
+import csv
+import heapq
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from availability import DAYS, format_clock, parse_clock
+from room_search import room_capacity
+
+DAY_START = "7:00 AM"
+DAY_END = "7:00 PM"
+SLOT_MINUTES = 30
+
+# One clash outweighs any amount of soft penalty
+HARD_WEIGHT = 1000
+
+
+class Course:
+    __slots__ = ("subject", "teacher", "section", "size", "meetings", "minutes")
+
+    def __init__(self, subject, teacher, section, size, meetings=1, minutes=60):
+        self.subject = subject
+        self.teacher = teacher
+        self.section = section
+        self.size = size
+        self.meetings = meetings
+        self.minutes = minutes
+
+
+def load_courses(file_path):
+    courses = []
+    with open(file_path, mode="r", newline="") as file:
+        for line, row in enumerate(csv.DictReader(file), start=2):
+            try:
+                courses.append(Course(
+                    row["subject"], row["teacher"], row["section"], int(row["size"]),
+                    int(row.get("meetings") or 1), round(float(row.get("hours") or 1) * 60),
+                ))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{file_path}:{line}: bad course row ({e})") from None
+    return courses
+
+
+# Bitset of start slots where `length` consecutive slots of `free` are all set
+def fit_starts(free, length):
+    starts = free
+    for k in range(1, length):
+        starts &= free >> k
+    return starts
+
+
+def count_overlaps(bookings):
+    """Count bookings that overlap an earlier one for the same key.
+
+    `bookings` is an iterable of (key, day, start, end); each booking is
+    counted once however many others it overlaps (sort and sweep).
+    """
+    overlaps = 0
+    last_group = None
+    group_end = None
+    for key, day, start, end in sorted(bookings):
+        if (key, day) != last_group:
+            last_group, group_end = (key, day), end
+            continue
+        if start < group_end:
+            overlaps += 1
+        group_end = max(group_end, end)
+    return overlaps
+
+
+class Schedule:
+    """A solved timetable: one (day, start slot, room) per class meeting."""
+
+    def __init__(self, solver, assignment, seconds=0.0, seed=None, strategy=None):
+        self.solver = solver
+        self.assignment = assignment
+        self.seconds = seconds
+        self.seed = seed
+        self.strategy = strategy
+
+    def bookings(self):
+        solver = self.solver
+        for m, (day, start, room) in enumerate(self.assignment):
+            course = solver.courses[solver.meeting_course[m]]
+            yield course, day, start, start + solver.meeting_length[m], room
+
+    def violations(self):
+        """Hard clashes per kind, plus the soft count of repeated same-day meetings."""
+        solver = self.solver
+        by_room, by_teacher, by_section = [], [], []
+        capacity = 0
+        course_days = set()
+        same_day = 0
+        for course, day, start, end, room in self.bookings():
+            by_room.append((room, day, start, end))
+            by_teacher.append((course.teacher, day, start, end))
+            by_section.append((course.section, day, start, end))
+            if course.size > solver.capacity[room]:
+                capacity += 1
+            if (id(course), day) in course_days:
+                same_day += 1
+            course_days.add((id(course), day))
+        return {
+            "room": count_overlaps(by_room),
+            "teacher": count_overlaps(by_teacher),
+            "section": count_overlaps(by_section),
+            "capacity": capacity,
+            "same_day": same_day,
+        }
+
+    def hard_violations(self):
+        counts = self.violations()
+        return counts["room"] + counts["teacher"] + counts["section"] + counts["capacity"]
+
+    def cost(self):
+        counts = self.violations()
+        return HARD_WEIGHT * (counts["room"] + counts["teacher"] + counts["section"] + counts["capacity"]) + counts["same_day"]
+
+    def rows(self):
+        """Timetable rows in the timetable.csv format, plus teacher and section."""
+        solver = self.solver
+        rows = []
+        for course, day, start, end, room in sorted(self.bookings(), key=lambda b: (b[1], b[2], b[4])):
+            rows.append({
+                "room": solver.rooms[room],
+                "subject": course.subject,
+                "time": f"{solver.clock(start)} - {solver.clock(end)}",
+                "day": solver.days[day],
+                "teacher": course.teacher,
+                "section": course.section,
+            })
+        return rows
+
+    def write(self, file_path):
+        with open(file_path, mode="w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=["room", "subject", "time", "day", "teacher", "section"])
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+
+class TimetableSolver:
+    """Builds conflict-free weekly timetables for a fixed set of courses and rooms."""
+
+    def __init__(self, courses, all_rooms, days=DAYS, day_start=DAY_START, day_end=DAY_END,
+                 slot_minutes=SLOT_MINUTES):
+        self.courses = list(courses)
+        self.rooms = [row["room"] for row in all_rooms]
+        self.capacity = [room_capacity(row) for row in all_rooms]
+        self.days = list(days)
+        self.slot_minutes = slot_minutes
+        self.first_minute = parse_clock(day_start)
+        self.n_slots = (parse_clock(day_end) - self.first_minute) // slot_minutes
+
+        teachers = {name: i for i, name in enumerate(dict.fromkeys(c.teacher for c in self.courses))}
+        sections = {name: i for i, name in enumerate(dict.fromkeys(c.section for c in self.courses))}
+        n_rooms = len(self.rooms)
+        self.n_resources = n_rooms + len(teachers) + len(sections)
+
+        # Rooms each course fits in, smallest first (best fit)
+        by_size = sorted(range(n_rooms), key=lambda r: self.capacity[r])
+        self.eligible = []
+        for course in self.courses:
+            rooms = [r for r in by_size if self.capacity[r] >= course.size]
+            if not rooms:
+                raise ValueError(f"No room can seat {course.size} students for {course.subject} ({course.section})")
+            self.eligible.append(rooms)
+
+        # One variable per class meeting
+        self.meeting_course = []
+        self.meeting_length = []
+        self.meeting_teacher = []
+        self.meeting_section = []
+        for c, course in enumerate(self.courses):
+            length = -(-course.minutes // slot_minutes)
+            if not 0 < length <= self.n_slots:
+                raise ValueError(f"{course.subject} meetings of {course.minutes} minutes do not fit in a day")
+            for _ in range(course.meetings):
+                self.meeting_course.append(c)
+                self.meeting_length.append(length)
+                self.meeting_teacher.append(n_rooms + teachers[course.teacher])
+                self.meeting_section.append(n_rooms + len(teachers) + sections[course.section])
+
+        self.sharing = {}
+        for m in range(len(self.meeting_course)):
+            self.sharing.setdefault(self.meeting_teacher[m], []).append(m)
+            self.sharing.setdefault(self.meeting_section[m], []).append(m)
+        self.degree = [len(self.sharing[self.meeting_teacher[m]]) + len(self.sharing[self.meeting_section[m]]) - 2
+                       for m in range(len(self.meeting_course))]
+
+    def clock(self, slot):
+        return format_clock(self.first_minute + slot * self.slot_minutes)
+
+    def solve(self, seed=0, time_limit=10.0, strategy="mrv", stop=None, bound=None):
+        """Return the best Schedule found within `time_limit` seconds.
+
+        `strategy` picks the construction order: "mrv" (fewest remaining start
+        times, then degree), "degree" (most shared teacher/section meetings
+        first) or "random". `stop` is an optional callable polled during repair
+        that ends the search early when it returns True. `bound` is an optional
+        callable returning the best cost found elsewhere; a run whose clashes
+        alone already cost that much skips spreading meetings over the week.
+        """
+        return _Search(self, seed, strategy).run(time.perf_counter() + time_limit, stop, bound)
+
+
+class _Search:
+    """State of one solver run: occupancy bitsets and clash counts per resource."""
+
+    def __init__(self, solver, seed, strategy):
+        self.solver = solver
+        self.seed = seed
+        self.strategy = strategy
+        self.rng = random.Random(seed)
+        n_days, n_slots = len(solver.days), solver.n_slots
+        self.full = (1 << n_slots) - 1
+        # busy[res][day]: bitset of occupied slots; count[res][day * n_slots + slot]: bookings
+        self.busy = [[0] * n_days for _ in range(solver.n_resources)]
+        self.count = [bytearray(n_days * n_slots) for _ in range(solver.n_resources)]
+        self.course_days = [[0] * n_days for _ in solver.courses]
+        self.assignment = [None] * len(solver.meeting_course)
+
+    def run(self, deadline, stop, bound=None):
+        started = time.perf_counter()
+        unplaced = self.construct()
+        for m in unplaced:
+            self.place(m, *self.best_move(m))
+        self.repair(deadline, stop)
+        # spread() never adds clashes and only removes same-day repeats, so
+        # the clashes left now bound the final cost from below
+        if bound is None or HARD_WEIGHT * self.schedule_so_far().hard_violations() < bound():
+            self.spread(deadline, stop)
+        return Schedule(self.solver, list(self.assignment), time.perf_counter() - started, self.seed, self.strategy)
+
+    def schedule_so_far(self):
+        return Schedule(self.solver, list(self.assignment), 0.0, self.seed, self.strategy)
+
+    def place(self, m, day, start, room):
+        solver = self.solver
+        length = solver.meeting_length[m]
+        mask = ((1 << length) - 1) << start
+        base = day * solver.n_slots + start
+        for res in (room, solver.meeting_teacher[m], solver.meeting_section[m]):
+            counts = self.count[res]
+            for i in range(base, base + length):
+                counts[i] += 1
+            self.busy[res][day] |= mask
+        self.course_days[solver.meeting_course[m]][day] += 1
+        self.assignment[m] = (day, start, room)
+
+    def unplace(self, m):
+        solver = self.solver
+        day, start, room = self.assignment[m]
+        length = solver.meeting_length[m]
+        base = day * solver.n_slots
+        for res in (room, solver.meeting_teacher[m], solver.meeting_section[m]):
+            counts = self.count[res]
+            bits = self.busy[res][day]
+            for k in range(start, start + length):
+                counts[base + k] -= 1
+                if not counts[base + k]:
+                    bits &= ~(1 << k)
+            self.busy[res][day] = bits
+        self.course_days[solver.meeting_course[m]][day] -= 1
+        self.assignment[m] = None
+
+    def start_domain(self, m, day):
+        """Start slots on `day` where the meeting's teacher and section are both free."""
+        solver = self.solver
+        free = self.full & ~(self.busy[solver.meeting_teacher[m]][day] | self.busy[solver.meeting_section[m]][day])
+        return fit_starts(free, solver.meeting_length[m])
+
+    def construct(self):
+        """Place meetings by MRV with forward checking; return those with no clash-free value."""
+        solver = self.solver
+        n_days = len(solver.days)
+        rng = self.rng
+        domain = [[self.start_domain(m, d) for d in range(n_days)] for m in range(len(self.assignment))]
+        version = [0] * len(domain)
+
+        def key(m):
+            if self.strategy == "degree":
+                return (-solver.degree[m], rng.random())
+            if self.strategy == "random":
+                return (rng.random(),)
+            return (sum(bits.bit_count() for bits in domain[m]), -solver.degree[m], rng.random())
+
+        heap = [(key(m), 0, m) for m in range(len(domain))]
+        heapq.heapify(heap)
+        unplaced = []
+
+        while heap:
+            _, v, m = heapq.heappop(heap)
+            if v != version[m] or self.assignment[m] is not None:
+                continue
+
+            value = self.first_value(m, domain[m])
+            if value is None:
+                unplaced.append(m)
+                self.assignment[m] = ()  # skipped by forward checking until repaired
+                continue
+            self.place(m, *value)
+
+            # Forward checking: only meetings sharing this teacher or section lose start times
+            day = value[0]
+            for res in (solver.meeting_teacher[m], solver.meeting_section[m]):
+                for other in solver.sharing[res]:
+                    if self.assignment[other] is not None:
+                        continue
+                    starts = self.start_domain(other, day)
+                    if starts != domain[other][day]:
+                        domain[other][day] = starts
+                        if self.strategy == "mrv":
+                            version[other] += 1
+                            heapq.heappush(heap, (key(other), version[other], other))
+
+        for m in unplaced:
+            self.assignment[m] = None
+        return unplaced
+
+    def first_value(self, m, days_domain):
+        """Earliest clash-free start on the least used day, in the smallest room that fits."""
+        solver = self.solver
+        course = solver.meeting_course[m]
+        length = solver.meeting_length[m]
+        section_busy = self.busy[solver.meeting_section[m]]
+        order = sorted(range(len(days_domain)),
+                       key=lambda d: (self.course_days[course][d], section_busy[d].bit_count(), d))
+        for day in order:
+            starts = days_domain[day]
+            if not starts:
+                continue
+            for room in solver.eligible[course]:
+                fits = starts & fit_starts(self.full & ~self.busy[room][day], length)
+                if fits:
+                    return day, (fits & -fits).bit_length() - 1, room
+        return None
+
+    def best_move(self, m, avoid=None, days=None):
+        """Lowest-cost (day, start, room) for an unplaced meeting, allowing clashes if unavoidable."""
+        solver = self.solver
+        course = solver.meeting_course[m]
+        length = solver.meeting_length[m]
+        n_slots = solver.n_slots
+        days = list(range(len(solver.days)) if days is None else days)
+        self.rng.shuffle(days)
+
+        best, best_cost = None, None
+        for day in days:
+            soft = self.course_days[course][day]
+            if best_cost is not None and soft >= best_cost:
+                continue
+            starts = self.start_domain(m, day)
+            if not starts:
+                continue
+            for room in solver.eligible[course]:
+                fits = starts & fit_starts(self.full & ~self.busy[room][day], length)
+                if avoid is not None and avoid[0] == day and avoid[2] == room:
+                    fits &= ~(1 << avoid[1])
+                if fits:
+                    best, best_cost = (day, (fits & -fits).bit_length() - 1, room), soft
+                    break
+        if best is not None:
+            return best
+
+        # No clash-free position: fewest overlapping bookings, ties at random
+        teacher_count = self.count[solver.meeting_teacher[m]]
+        section_count = self.count[solver.meeting_section[m]]
+        for day in days:
+            soft = self.course_days[course][day]
+            for start in range(n_slots - length + 1):
+                lo = day * n_slots + start
+                hi = lo + length
+                clashes = sum(teacher_count[lo:hi]) + sum(section_count[lo:hi])
+                if best_cost is not None and HARD_WEIGHT * clashes + soft > best_cost:
+                    continue
+                for room in solver.eligible[course]:
+                    if avoid == (day, start, room):
+                        continue
+                    cost = HARD_WEIGHT * (clashes + sum(self.count[room][lo:hi])) + soft
+                    if best_cost is None or cost < best_cost or (cost == best_cost and self.rng.random() < 0.5):
+                        best, best_cost = (day, start, room), cost
+        return best if best is not None else avoid
+
+    def clashing(self, m):
+        solver = self.solver
+        day, start, room = self.assignment[m]
+        lo = day * solver.n_slots + start
+        hi = lo + solver.meeting_length[m]
+        return any(max(self.count[res][lo:hi]) > 1
+                   for res in (room, solver.meeting_teacher[m], solver.meeting_section[m]))
+
+    def repair(self, deadline, stop):
+        """Min-conflicts local search: move clashing meetings until none are left."""
+        while time.perf_counter() < deadline and not (stop and stop()):
+            conflicted = [m for m in range(len(self.assignment)) if self.clashing(m)]
+            if not conflicted:
+                return
+            self.rng.shuffle(conflicted)
+            for m in conflicted:
+                if time.perf_counter() >= deadline or (stop and stop()):
+                    return
+                if not self.clashing(m):
+                    continue
+                old = self.assignment[m]
+                self.unplace(m)
+                self.place(m, *self.best_move(m, avoid=old))
+
+    def spread(self, deadline, stop):
+        """Move repeated same-day meetings of a course onto days the course does not use yet.
+
+        A clash-free spot is taken directly. Otherwise the meeting is kicked
+        onto its least clashing spot on a free day and repair() moves the
+        meetings it displaced; the kick is undone if clashes remain.
+        """
+        solver = self.solver
+        improved = True
+        while improved:
+            improved = False
+            for m in range(len(self.assignment)):
+                if time.perf_counter() >= deadline or (stop and stop()):
+                    return
+                course = solver.meeting_course[m]
+                if self.course_days[course][self.assignment[m][0]] < 2:
+                    continue
+                old = self.assignment[m]
+                self.unplace(m)
+                new = self.best_move(m)
+                if self.course_days[course][new[0]] == 0 and not self.clashes_at(m, new):
+                    self.place(m, *new)
+                    improved = True
+                    continue
+
+                free_days = [d for d in range(len(solver.days)) if not self.course_days[course][d]]
+                if not free_days:
+                    self.place(m, *old)
+                    continue
+                snapshot = list(self.assignment)
+                snapshot[m] = old
+                self.place(m, *self.best_move(m, days=free_days))
+                self.repair(min(deadline, time.perf_counter() + 0.05), stop)
+                if any(self.clashing(k) for k in range(len(self.assignment))):
+                    self.restore(snapshot)
+                else:
+                    improved = True
+
+    def clashes_at(self, m, value):
+        """Whether placing unplaced meeting m at `value` would overlap another booking."""
+        solver = self.solver
+        day, start, room = value
+        lo = day * solver.n_slots + start
+        hi = lo + solver.meeting_length[m]
+        return any(max(self.count[res][lo:hi]) for res in (room, solver.meeting_teacher[m], solver.meeting_section[m]))
+
+    def restore(self, assignment):
+        for m, value in enumerate(self.assignment):
+            if value != assignment[m]:
+                if value is not None:
+                    self.unplace(m)
+                self.place(m, *assignment[m])
+
+
+STRATEGIES = ("mrv", "degree", "random")
+
+# Per-process state of portfolio workers, set by _init_worker
+_worker = {}
+
+
+def _init_worker(courses, all_rooms, solver_options, found, best_cost):
+    _worker["solver"] = TimetableSolver(courses, all_rooms, **solver_options)
+    _worker["found"] = found
+    _worker["best_cost"] = best_cost
+
+
+def _portfolio_run(strategy, first_seed, seed_step, deadline, target_cost):
+    """Restart one strategy with new seeds until the deadline or until any worker hits the target.
+
+    Restarts read the best cost any worker has reached (`best_cost`) and
+    skip the spreading phase when their clashes alone can't beat it.
+    """
+    solver = _worker["solver"]
+    found = _worker["found"]
+    best_cost = _worker["best_cost"]
+    best = None
+    seed = first_seed
+    while not found.is_set() and time.time() < deadline:
+        schedule = solver.solve(seed=seed, time_limit=deadline - time.time(), strategy=strategy, stop=found.is_set,
+                                bound=lambda: best_cost.value)
+        cost = schedule.cost()
+        if best is None or cost < best[0]:
+            best = (cost, schedule.assignment, seed, strategy, schedule.seconds)
+        with best_cost.get_lock():
+            if cost < best_cost.value:
+                best_cost.value = cost
+        if cost <= target_cost:
+            found.set()
+        seed += seed_step
+    return best
+
+
+def solve_portfolio(courses, all_rooms, workers=None, time_limit=10.0, target_cost=0, strategies=STRATEGIES,
+                    seed=0, **solver_options):
+    """Run a portfolio of seeded strategies in parallel processes and return the best Schedule.
+
+    Worker i runs strategies[i % len(strategies)] with seeds seed + i,
+    seed + i + workers, ... The best cost found so far is shared between
+    workers: a restart whose clashes already cost as much gives up
+    before spreading meetings over the week, and all of them stop as soon as
+    one reaches `target_cost` (by default: no clashes and no repeated
+    same-day meetings).
+    """
+    workers = workers or os.cpu_count() or 1
+    solver = TimetableSolver(courses, all_rooms, **solver_options)
+    found = multiprocessing.Event()
+    best_cost = multiprocessing.Value("q", 2 ** 62)
+    deadline = time.time() + time_limit
+    started = time.perf_counter()
+
+    best = None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(courses, all_rooms, solver_options, found, best_cost)) as pool:
+        pending = {pool.submit(_portfolio_run, strategies[i % len(strategies)], seed + i, workers, deadline, target_cost)
+                   for i in range(workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result is not None and (best is None or result[0] < best[0]):
+                    best = result
+            if best is not None and best[0] <= target_cost:
+                found.set()
+
+    if best is None:
+        return solver.solve(seed=seed, time_limit=0)
+    _, assignment, best_seed, strategy, _ = best
+    return Schedule(solver, assignment, time.perf_counter() - started, best_seed, strategy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a conflict-free timetable.csv")
+    parser.add_argument("courses", help="CSV with subject, teacher, section, size, meetings, hours")
+    parser.add_argument("rooms", help="rooms.csv (optional capacity column)")
+    parser.add_argument("-o", "--output", default="timetable.csv")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=1, help="processes for the strategy portfolio (0 = all cores)")
+    args = parser.parse_args()
+
+    with open(args.rooms, mode="r", newline="") as file:
+        all_rooms = list(csv.DictReader(file))
+    courses = load_courses(args.courses)
+    if args.workers == 1:
+        schedule = TimetableSolver(courses, all_rooms).solve(seed=args.seed, time_limit=args.time_limit)
+    else:
+        schedule = solve_portfolio(courses, all_rooms, workers=args.workers or None,
+                                   time_limit=args.time_limit, seed=args.seed)
+    schedule.write(args.output)
+    print(f"Wrote {len(schedule.assignment)} class meetings to {args.output} in {schedule.seconds:.2f} s; "
+          f"violations: {schedule.violations()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Headless room finder service: free-room and route queries over HTTP/JSON.
+
+Loads the timetable and rooms once and serves many clients concurrently from
+one asyncio event loop. Nothing here imports pygame.
+
+    python server.py --port 8080 --timetable timetable.csv --rooms rooms.csv --map mapict.jpg
+    python snapshot.py && python server.py --workers 4     # workers map one compiled snapshot
+
+Endpoints (GET, JSON responses):
+    /health
+    /rooms                               every room with its map coordinate
+    /free-rooms?time=10:00 AM&day=Monday
+    /search?time=10:00 AM&day=Monday&capacity=40&type=lab&equipment=projector,aircon&from=START&limit=5
+                                         free rooms meeting the constraints, nearest first
+    /free-windows?day=Thursday&minutes=90[&room=ICT 202,ICT 207]
+                                         free windows per room, or when all listed rooms are free
+    /next-free?room=ICT 207&minutes=120&day=Monday[&after=1:00 PM]
+                                         earliest slot when the room(s) are free that long
+                                         Windows are [start, end): a room is free from the minute its
+                                         class ends, while /free-rooms at exactly that minute still
+                                         counts it as booked (the end minute is inclusive there).
+    /metrics[?format=json]               timers and counters, Prometheus text by default
+    /route?room=ICT 207[&from=ICT 302]   path from START (or the given room) as [[x, y], ...], [] if unreachable
+    /distances[?from=ICT 302]            walking cost from START (or the room) to every room
+"""
+import argparse
+import asyncio
+import json
+import os
+from urllib.parse import parse_qs, urlsplit
+
+import core
+import metrics
+from availability import format_clock
+from free_time import all_free_windows, free_windows, next_free
+
+
+def _windows(windows):
+    return [[format_clock(start), format_clock(end)] for start, end in windows]
+
+
+class RoomFinderService:
+    """Query handlers over one TimetableStore and the shared route cache."""
+
+    def __init__(self, timetable_file, rooms_file, snapshot_dir=None):
+        self.all_rooms, self.timetable = core.open_timetable(timetable_file, rooms_file, snapshot_dir)
+        self.catalog = core.room_catalog(self.all_rooms)
+
+    def handle(self, path, params):
+        """Return (status, payload) for one request."""
+        if path == "/metrics":
+            if params.get("format") == "json":
+                return 200, metrics.snapshot()
+            return 200, metrics.to_prometheus()
+
+        if path == "/health":
+            return 200, {"status": "ok", "classes": len(self.timetable.classes)}
+
+        if path == "/rooms":
+            return 200, {"rooms": [
+                {"room": row["room"], "coordinate": core.ROOM_COORDINATES.get(row["room"])} for row in self.all_rooms
+            ]}
+
+        if path == "/free-rooms":
+            time, day = params.get("time"), params.get("day")
+            if not time or not day:
+                return 400, {"error": "time and day are required"}
+            self.timetable.poll()
+            try:
+                rooms = self.timetable.free_rooms(time, day)
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            return 200, {"time": time, "day": day, "rooms": rooms}
+
+        if path == "/search":
+            time, day = params.get("time"), params.get("day")
+            if not time or not day:
+                return 400, {"error": "time and day are required"}
+            origin = params.get("from", core.KIOSK)
+            if origin not in core.ROOM_COORDINATES:
+                return 404, {"error": f"unknown room {origin!r}"}
+            self.timetable.poll()
+            try:
+                free = self.timetable.free_mask(time, day)
+                rooms = self.catalog.search(
+                    free,
+                    origin=origin,
+                    min_capacity=int(params.get("capacity") or 0),
+                    room_type=params.get("type"),
+                    equipment=[item for item in params.get("equipment", "").split(",") if item],
+                    limit=int(params.get("limit") or 0) or None,
+                )
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            return 200, {"time": time, "day": day, "from": origin, "rooms": [
+                {"room": room, "distance": distance if distance != float("inf") else None} for room, distance in rooms
+            ]}
+
+        if path == "/free-windows":
+            day = params.get("day")
+            if not day:
+                return 400, {"error": "day is required"}
+            self.timetable.poll()
+            try:
+                minutes = int(params.get("minutes") or 0)
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            rooms = [room for room in params.get("room", "").split(",") if room]
+            unknown = [room for room in rooms if not self.timetable.index.has_room(room)]
+            if unknown:
+                return 404, {"error": f"unknown room {unknown[0]!r}"}
+            if rooms:
+                return 200, {"day": day, "rooms": rooms,
+                             "windows": _windows(free_windows(self.timetable.index, rooms, day, minutes))}
+            windows = all_free_windows(self.timetable.index, day, minutes)
+            return 200, {"day": day, "windows": {room: _windows(gaps) for room, gaps in windows.items()}}
+
+        if path == "/next-free":
+            rooms = [room for room in params.get("room", "").split(",") if room]
+            day = params.get("day")
+            if not rooms or not day or not params.get("minutes"):
+                return 400, {"error": "room, minutes and day are required"}
+            unknown = [room for room in rooms if not self.timetable.index.has_room(room)]
+            if unknown:
+                return 404, {"error": f"unknown room {unknown[0]!r}"}
+            self.timetable.poll()
+            try:
+                found = next_free(self.timetable.index, rooms, int(params["minutes"]), day, params.get("after"))
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            if found is None:
+                return 200, {"rooms": rooms, "slot": None}
+            found_day, start, end = found
+            return 200, {"rooms": rooms, "slot": {"day": found_day, "start": format_clock(start), "end": format_clock(end)}}
+
+        if path == "/route":
+            room = params.get("room")
+            origin = params.get("from", core.KIOSK)
+            if room not in core.ROOM_COORDINATES or room == "START":
+                return 404, {"error": f"unknown room {room!r}"}
+            if origin not in core.ROOM_COORDINATES:
+                return 404, {"error": f"unknown room {origin!r}"}
+            route = core.route_to_room(room, origin)
+            return 200, {"room": room, "from": origin, "reachable": bool(route),
+                         "path": [list(cell) for cell in route]}
+
+        if path == "/distances":
+            origin = params.get("from", core.KIOSK)
+            if origin not in core.ROOM_COORDINATES:
+                return 404, {"error": f"unknown room {origin!r}"}
+            return 200, {"from": origin, "distances": core.distances_from(origin)}
+
+        return 404, {"error": f"no endpoint {path}"}
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+async def serve_client(service, reader, writer):
+    """Answer requests on one keep-alive connection until the client closes it."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            keep_alive = True
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = header.decode("latin-1").partition(":")
+                if name.strip().lower() == "connection" and value.strip().lower() == "close":
+                    keep_alive = False
+
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                status, payload, keep_alive = 400, {"error": "malformed request line"}, False
+            else:
+                keep_alive = keep_alive and version == "HTTP/1.1"
+                if method != "GET":
+                    status, payload = 405, {"error": "only GET is supported"}
+                else:
+                    url = urlsplit(target)
+                    params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                    try:
+                        with metrics.timer("http_request"):
+                            status, payload = service.handle(url.path, params)
+                    except Exception as e:
+                        status, payload = 500, {"error": str(e)}
+                    metrics.count(f"http_responses_{status}")
+
+            # Text payloads (the Prometheus metrics) go out as they are
+            if isinstance(payload, str):
+                body, content_type = payload.encode(), "text/plain; version=0.0.4"
+            else:
+                body, content_type = json.dumps(payload).encode(), "application/json"
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_server(service, host, port, reuse_port=False):
+    server = await asyncio.start_server(lambda r, w: serve_client(service, r, w), host, port,
+                                        reuse_port=reuse_port or None)
+    print(f"Room finder service on http://{host}:{port} (pid {os.getpid()})")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless room finder HTTP/JSON service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--timetable", default=core.TIMETABLE_FILE)
+    parser.add_argument("--rooms", default=core.ROOMS_FILE)
+    parser.add_argument("--map", default=core.MAP_IMAGE, help="floor plan image used for routing")
+    parser.add_argument("--snapshot", default=core.SNAPSHOT_DIR,
+                        help="compiled snapshot (snapshot.py) used instead of the CSV files while they match")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes sharing the port; they share the memory-mapped snapshot (needs os.fork)")
+    args = parser.parse_args()
+    if args.workers > 1 and not hasattr(os, "fork"):
+        parser.error("--workers needs os.fork, which this platform does not have")
+
+    core.MAP_IMAGE = args.map
+    # Built before forking, so every worker starts from the same mapped columns
+    service = RoomFinderService(args.timetable, args.rooms, args.snapshot)
+    core.navigation_graph()  # load the floor plan before the first request
+    for _ in range(args.workers - 1):
+        if os.fork() == 0:
+            break
+    try:
+        asyncio.run(run_server(service, args.host, args.port, reuse_port=args.workers > 1))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
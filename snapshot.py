@@ -0,0 +1,215 @@
+"""Compiled binary snapshot of the timetable, rooms and floor plan, memory-mapped at startup.
+
+compile_snapshot() parses timetable.csv, rooms.csv and the floor-plan image
+once and writes a directory of NumPy .npy columns plus manifest.json:
+
+    timetable.room/.day/.start/.end    one entry per class: codes and minutes
+    timetable.line                     the class's line in timetable.csv
+    timetable.<column>                 codes of subject, teacher, ...
+    names.rooms, names.<column>        the strings those codes stand for
+    rooms.<column>                     rooms.csv, column by column
+    mask                               walkable map cells, one bit per cell
+
+The manifest holds the format version, the size and modification time of
+every source file, the room coordinates and map settings, and the file of
+each column. load_snapshot() maps the columns read-only with
+np.load(mmap_mode="r"), so opening a snapshot costs a few small reads
+whatever the size of the timetable, and server workers mapping the same
+snapshot share one copy of it in the page cache. Columns are written under
+new file names and the manifest is replaced last, so recompiling never
+changes a file that a running process has mapped.
+
+    python snapshot.py
+    python snapshot.py --output campus.snapshot --timetable timetable.csv --rooms rooms.csv
+"""
+import argparse
+import csv
+import json
+import os
+import time
+
+import numpy as np
+
+import metrics
+from loader import BadRow, TimetableTable, load_timetable
+from navgraph import FloorMask, NavigationGraph
+
+SNAPSHOT_VERSION = 2  # 2: timetable.line
+MANIFEST = "manifest.json"
+
+
+def source_signature(path):
+    """[absolute path, size, mtime_ns] of a source file; size and mtime are None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [os.path.abspath(path), None, None]
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def _normalised(config):
+    # Tuples and lists compare equal once they have been through JSON
+    return json.loads(json.dumps(config, sort_keys=True))
+
+
+def _strings(values):
+    # Fixed-width unicode can be mapped; an object array would need pickle
+    return np.array(list(values), dtype=str)
+
+
+@metrics.timed("snapshot_compile")
+def compile_snapshot(output, sources, config):
+    """Write a snapshot of `sources` to the directory `output` and return its manifest.
+
+    sources maps "timetable" and "rooms" (and optionally "map", the floor-plan
+    image) to file paths. config holds room_coordinates and grid_size, plus
+    floors, map_grid, stairs and elevators when there is a map.
+    """
+    os.makedirs(output, exist_ok=True)
+    generation = f"{time.time_ns():x}"
+    arrays = {}
+
+    def save(name, array):
+        file_name = f"{name}.{generation}.npy"
+        np.save(os.path.join(output, file_name), np.ascontiguousarray(array))
+        arrays[name] = file_name
+
+    table = load_timetable(sources["timetable"])
+    for column in ("room", "day", "start", "end", "line"):
+        values = getattr(table, column)
+        save(f"timetable.{column}", np.frombuffer(values, dtype=values.typecode))
+    save("names.rooms", _strings(table.rooms))
+    for column, codes in table.codes.items():
+        save(f"timetable.{column}", np.frombuffer(codes, dtype=codes.typecode))
+        save(f"names.{column}", _strings(table.names[column]))
+
+    with open(sources["rooms"], mode="r", newline="") as file:
+        reader = csv.DictReader(file)
+        room_rows = list(reader)
+        room_columns = list(reader.fieldnames or [])
+    for column in room_columns:
+        save(f"rooms.{column}", _strings(row.get(column) or "" for row in room_rows))
+
+    mask_shape = None
+    if sources.get("map"):
+        mask = FloorMask.from_image(sources["map"], tuple(config["map_grid"]))
+        save("mask", np.frombuffer(mask.bits, dtype=np.uint8))
+        mask_shape = [mask.width, mask.height]
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "sources": {name: source_signature(path) for name, path in sources.items() if path},
+        "config": _normalised(config),
+        "timetable_columns": list(table.codes),
+        "days": table.days,
+        "rooms_columns": room_columns,
+        "mask_shape": mask_shape,
+        "errors": [[error.line, error.reason, error.values] for error in table.errors],
+        "arrays": arrays,
+    }
+    path = os.path.join(output, MANIFEST)
+    with open(path + ".tmp", "w") as file:
+        json.dump(manifest, file)
+    os.replace(path + ".tmp", path)
+
+    # Columns of earlier compiles; processes that still map them keep their copy
+    for name in os.listdir(output):
+        if name.endswith(".npy") and name not in arrays.values():
+            try:
+                os.remove(os.path.join(output, name))
+            except OSError:
+                pass  # mapped by a running process on Windows
+    return manifest
+
+
+class Snapshot:
+    """Read-only view of a compiled snapshot; every column is memory-mapped."""
+
+    def __init__(self, path, manifest):
+        self.path = path
+        self.manifest = manifest
+        self.arrays = {
+            name: np.load(os.path.join(path, file_name), mmap_mode="r")
+            for name, file_name in manifest["arrays"].items()
+        }
+
+    def is_current(self, sources, config):
+        """True if the snapshot was compiled from these files, unchanged since, with this config."""
+        signatures = {name: source_signature(path) for name, path in sources.items() if path}
+        return self.manifest["sources"] == signatures and self.manifest["config"] == _normalised(config)
+
+    def timetable(self):
+        """The timetable as a loader.TimetableTable whose columns are the mapped arrays."""
+        columns = self.manifest["timetable_columns"]
+        table = TimetableTable(columns)
+        table.rooms = self.arrays["names.rooms"].tolist()
+        table.days = list(self.manifest["days"])
+        table.room = self.arrays["timetable.room"]
+        table.day = self.arrays["timetable.day"]
+        table.start = self.arrays["timetable.start"]
+        table.end = self.arrays["timetable.end"]
+        table.line = self.arrays["timetable.line"]
+        table.names = {column: self.arrays[f"names.{column}"].tolist() for column in columns}
+        table.codes = {column: self.arrays[f"timetable.{column}"] for column in columns}
+        table.errors = [BadRow(line, reason, values) for line, reason, values in self.manifest["errors"]]
+        return table
+
+    def all_rooms(self):
+        """rooms.csv rows, as core.load_csv returns them."""
+        columns = self.manifest["rooms_columns"]
+        values = [self.arrays[f"rooms.{column}"].tolist() for column in columns]
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+    def room_coordinates(self):
+        return {name: tuple(cell) for name, cell in self.manifest["config"]["room_coordinates"].items()}
+
+    def navigation_graph(self):
+        """The multi-floor graph over the mapped floor mask, or None if there was no map."""
+        if self.manifest["mask_shape"] is None:
+            return None
+        config = self.manifest["config"]
+        width, height = self.manifest["mask_shape"]
+        mask = FloorMask.from_bits(memoryview(self.arrays["mask"]), width, height)
+        graph = NavigationGraph()
+        for floor in config["floors"]:
+            graph.add_floor(floor, mask)
+        for cell in config.get("stairs", ()):
+            graph.add_stairs(tuple(cell), config["floors"])
+        for cell in config.get("elevators", ()):
+            graph.add_elevator(tuple(cell), config["floors"])
+        return graph
+
+
+@metrics.timed("snapshot_load")
+def load_snapshot(path):
+    """Open the snapshot in directory `path`; raises OSError if missing, ValueError if another version."""
+    with open(os.path.join(path, MANIFEST)) as file:
+        manifest = json.load(file)
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"{path}: snapshot version {manifest.get('version')}, expected {SNAPSHOT_VERSION}")
+    return Snapshot(path, manifest)
+
+
+def main():
+    import core
+
+    parser = argparse.ArgumentParser(description="Compile the timetable, rooms and floor plan into a binary snapshot")
+    parser.add_argument("--output", default=core.SNAPSHOT_DIR)
+    parser.add_argument("--timetable", default=core.TIMETABLE_FILE)
+    parser.add_argument("--rooms", default=core.ROOMS_FILE)
+    parser.add_argument("--map", default=core.MAP_IMAGE, help="floor plan image; skipped if missing")
+    args = parser.parse_args()
+
+    core.MAP_IMAGE = args.map
+    sources = core.snapshot_sources(args.timetable, args.rooms)
+    if "map" not in sources:
+        print(f"No floor plan at {args.map}; routes will use the open grid")
+    start = time.perf_counter()
+    manifest = compile_snapshot(args.output, sources, core.snapshot_config())
+    rows = len(np.load(os.path.join(args.output, manifest["arrays"]["timetable.room"]), mmap_mode="r"))
+    print(f"Snapshot of {rows:,} classes ({len(manifest['errors'])} bad rows) written to {args.output} "
+          f"in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Live timetable data: classes can be added, moved or cancelled without a reload.
+
+TimetableStore keeps the timetable rows and their AvailabilityIndex in step.
+Every change, whether made through the API or picked up from timetable.csv by
+poll(), is applied as a small set of added/removed rows so only the affected
+room/day indexes are rebuilt.
+"""
+import csv
+import io
+import os
+import time
+from collections import defaultdict
+
+from availability import AvailabilityIndex
+
+FIELDNAMES = ["room", "subject", "time", "day"]
+
+
+def _row_key(row):
+    return tuple(sorted(row.items()))
+
+
+class TimetableStore:
+    """Timetable rows by class id, plus the availability index built from them."""
+
+    def __init__(self, file_path, all_rooms, poll_interval=0.5, table=None):
+        self.file_path = file_path
+        self.poll_interval = poll_interval
+        self._classes = {}
+        self.fieldnames = list(FIELDNAMES)
+        self._next_id = 0
+        # What was last read from the file: raw bytes and row key -> class ids
+        self._raw = b""
+        self._file_ids = defaultdict(list)
+        self._signature = None
+        self._last_poll = 0.0
+
+        raw = self._read_file()
+        if table is None:
+            self._pending_raw = None
+            rows = self._add_file_rows(raw)
+            self.index = AvailabilityIndex(rows, all_rooms)
+        else:
+            # A loader.TimetableTable of the same file (e.g. from a snapshot) has the
+            # times parsed; the rows themselves are only read when first needed
+            self._pending_raw = raw
+            self.index = AvailabilityIndex(table, all_rooms)
+
+    @property
+    def classes(self):
+        """Class id -> timetable row."""
+        if self._pending_raw is not None:
+            raw, self._pending_raw = self._pending_raw, None
+            self._add_file_rows(raw)
+        return self._classes
+
+    def _add_file_rows(self, raw):
+        rows = self._read_rows(raw)
+        for row in rows:
+            self._file_ids[_row_key(row)].append(self._store(row))
+        return rows
+
+    def _read_file(self):
+        with open(self.file_path, mode="rb") as file:
+            raw = file.read()
+        stat = os.stat(self.file_path)
+        self._signature = (stat.st_mtime_ns, stat.st_size)
+        self._raw = raw
+        return raw
+
+    def _read_rows(self, raw, fieldnames=None):
+        reader = csv.DictReader(io.StringIO(raw.decode("utf-8-sig")), fieldnames=fieldnames)
+        # Drop the None key DictReader uses for cells beyond the header
+        rows = [{k: v for k, v in row.items() if k is not None} for row in reader if any(row.values())]
+        if fieldnames is None and reader.fieldnames:
+            self.fieldnames = list(reader.fieldnames)
+        return rows
+
+    def _store(self, row):
+        class_id = self._next_id
+        self._next_id += 1
+        self._classes[class_id] = row
+        return class_id
+
+    def free_rooms(self, time, day):
+        return self.index.free_rooms(time, day)
+
+    def free_mask(self, time, day):
+        return self.index.free_mask(time, day)
+
+    # Edits through the API
+
+    def add_class(self, room, subject, time, day, **extra):
+        """Add a class and return its id."""
+        row = {"room": room, "subject": subject, "time": time, "day": day, **extra}
+        self.index.update(added=[row])
+        return self._store(row)
+
+    def cancel_class(self, class_id):
+        row = self.classes.pop(class_id)
+        self.index.update(removed=[row])
+        return row
+
+    def move_class(self, class_id, room=None, time=None, day=None):
+        """Move a class to another room, time and/or day."""
+        old = self.classes[class_id]
+        new = dict(old)
+        for field, value in (("room", room), ("time", time), ("day", day)):
+            if value is not None:
+                new[field] = value
+        self.index.update(added=[new], removed=[old])
+        self.classes[class_id] = new
+        return new
+
+    def save(self, file_path=None):
+        """Write the current classes back to the CSV file."""
+        file_path = file_path or self.file_path
+        classes = self.classes  # before fieldnames, which deferred rows may set
+        with open(file_path, mode="w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(classes.values())
+        if file_path == self.file_path:
+            self._file_ids = defaultdict(list)
+            for class_id, row in self.classes.items():
+                self._file_ids[_row_key(row)].append(class_id)
+            self._read_file()
+
+    # Picking up changes to the file
+
+    def poll(self, force=False):
+        """Apply changes made to the CSV file since the last read; return True if any.
+
+        Checks at most once per poll_interval seconds, and only stats the file
+        unless its size or modification time changed. Appended rows are parsed
+        on their own; any other edit is diffed against the rows last read.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.poll_interval:
+            return False
+        self._last_poll = now
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) == self._signature:
+            return False
+
+        classes = self.classes  # rows deferred at startup are needed for the diff
+        previous = self._raw
+        raw = self._read_file()
+        if previous and raw.startswith(previous) and previous.endswith(b"\n"):
+            added = self._read_rows(raw[len(previous):], fieldnames=self.fieldnames)
+            removed_keys = []
+        else:
+            current = defaultdict(int)
+            for row in self._read_rows(raw):
+                current[_row_key(row)] += 1
+            added = []
+            removed_keys = []
+            for key in set(current) | set(self._file_ids):
+                difference = current.get(key, 0) - len(self._file_ids.get(key, ()))
+                if difference > 0:
+                    added.extend(dict(key) for _ in range(difference))
+                elif difference < 0:
+                    removed_keys.extend([key] * -difference)
+
+        removed = []
+        for key in removed_keys:
+            class_id = self._file_ids[key].pop()
+            if not self._file_ids[key]:
+                del self._file_ids[key]
+            # Classes already cancelled through the API stay cancelled
+            if class_id in classes:
+                removed.append(classes.pop(class_id))
+        for row in added:
+            self._file_ids[_row_key(row)].append(self._store(row))
+
+        if added or removed:
+            self.index.update(added=added, removed=removed)
+        return bool(added or removed)
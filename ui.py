@@ -0,0 +1,517 @@
+"""Pygame screens of the Room Finder kiosk.
+
+Importing this module starts pygame and loads fonts, so main.py only imports
+it when the UI is opened.
+"""
+import pygame
+import sys
+from pygame.locals import *
+from availability import TIME_SLOTS, DAYS
+import core
+from rendering import DirtyRenderer, PathAnimation
+from layout import GridLayout
+from core import ROOM_COORDINATES, GRID_SIZE, precompute_routes, route_to_room
+import assets
+
+# The screens main.py opens
+__all__ = ["home_window", "main"]
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BLUE = (0, 102, 204)
+TRANSPARENT = (255, 255, 255, 0)  # Fully transparent white
+HOVER_COLOR = (0, 140, 255)
+CLICK_COLOR = (0, 80, 160)
+
+# Fonts
+pygame.init()
+FONT = pygame.font.Font(None, 18)
+LARGE_FONT = pygame.font.Font(None, 24)
+
+# Button dimensions
+BUTTON_WIDTH = 200
+BUTTON_HEIGHT = 40
+BUTTON_SPACING = 20
+
+# Draw text
+def draw_text(surface, text, color, x, y, font=FONT):
+    text_obj = font.render(text, True, color)
+    surface.blit(text_obj, (x, y))
+
+# Draw button
+def draw_button(surface, rect, text, color, text_color):
+    pygame.draw.rect(surface, color, rect)
+    draw_text(surface, text, text_color, rect.x + 10, rect.y + 5)
+
+def draw_grid(surface, grid_size):
+    cell_size = 50
+    transparent_surface = pygame.Surface((grid_size * cell_size, grid_size * cell_size), pygame.SRCALPHA)
+    for x in range(0, grid_size * cell_size, cell_size):
+        pygame.draw.line(transparent_surface, BLACK, (x, 0), (x, grid_size * cell_size), 1)
+    for y in range(0, grid_size * cell_size, cell_size):
+        pygame.draw.line(transparent_surface, BLACK, (0, y), (grid_size * cell_size, y), 1)
+    surface.blit(transparent_surface, (0, 0))
+
+
+def visualize_path(surface, path, start, destination, cell_size=50):
+    """Visualize A* pathfinding with a moving dot, 5 cells per second; returns early on QUIT."""
+    # Grid, start and destination are drawn once; the dot trail is stamped onto the same layer
+    layer = surface.copy()
+    draw_grid(layer, GRID_SIZE)
+
+    # Highlight start and destination
+    pygame.draw.rect(layer, (0, 255, 0), (start[0] * cell_size, start[1] * cell_size, cell_size, cell_size))
+    pygame.draw.rect(layer, (255, 0, 0), (destination[0] * cell_size, destination[1] * cell_size, cell_size, cell_size))
+
+    dot = pygame.Surface((10, 10), pygame.SRCALPHA)
+    pygame.draw.circle(dot, BLUE, (5, 5), 5)
+    animation = PathAnimation(path, dot, layer, cell_size, offset=cell_size // 2 - 5, speed=5)
+    renderer = DirtyRenderer(surface, layer)
+
+    animation.start(pygame.time.get_ticks())
+    while not animation.finished(pygame.time.get_ticks()):
+        for rect in animation.update(pygame.time.get_ticks()):
+            renderer.invalidate(rect)
+        renderer.render([animation.widget()])
+        for event in renderer.wait_events(timeout=0):
+            if event.type == QUIT:
+                return
+
+def show_map_window_with_guide(room_name, origin=None):
+    map_window = pygame.display.set_mode((1200, 700))
+    pygame.display.set_caption(f"Map for {room_name}")
+    map_window.fill(WHITE)
+
+    origin = origin or core.KIOSK
+    start = ROOM_COORDINATES[origin]
+    destination = ROOM_COORDINATES.get(room_name)
+
+    if not destination:
+        print("Room not found!")
+        return
+
+    path = route_to_room(room_name, origin)
+    if not path:
+        print(f"No walkable route from {origin} to {room_name}")
+
+    try:
+        # Load background image 
+        background_image = assets.load_image("C:/Users/Asus/OneDrive/Desktop/myenv/AIwithHome/AI_final.proj/mapict.jpg", (1200, 700))
+    except Exception as e:
+        print(f"Error loading image: {e}")
+        return
+
+    try:
+        # Load the marker image to replace the dot
+        marker_image = assets.load_image("C:/Users/Asus/OneDrive/Desktop/myenv/AIwithHome/AI_final.proj/images.png", (40, 40), alpha=True)  # Resize to appropriate size
+    except Exception as e:
+        print(f"Error loading marker image: {e}")
+        return
+
+    # Return button setup
+    button_width, button_height = 150, 50
+    margin = 20
+    return_button_rect = pygame.Rect(
+        (1200 - button_width) // 2,  # Centered horizontally
+        margin,  # Positioned with a margin from the top
+        button_width,
+        button_height
+    )
+
+    font = pygame.font.Font(None, 36)  # Define font for the button
+
+    # Map with start and destination highlighted; drawn once, markers go on top
+    cell_size = 50
+    background = pygame.Surface((1200, 700))
+    background.fill(WHITE)
+    background.blit(background_image, (0, 0))
+    pygame.draw.rect(background, (0, 255, 0), (start[0] * cell_size, start[1] * cell_size, cell_size, cell_size))
+    pygame.draw.rect(background, (255, 0, 0), (destination[0] * cell_size, destination[1] * cell_size, cell_size, cell_size))
+
+    # Main loop
+    renderer = DirtyRenderer(map_window, background)
+    # The marker image glides along the path at 10 cells per second, leaving a marker on each cell
+    animation = PathAnimation(path, marker_image, background, cell_size, speed=10)
+    animation.start(pygame.time.get_ticks())
+    waiting = True
+
+    while waiting:
+        now = pygame.time.get_ticks()
+        for rect in animation.update(now):
+            renderer.invalidate(rect)
+
+        # Only the moving marker, newly passed cells and a changed button hover are redrawn
+        mouse_pos = pygame.mouse.get_pos()
+        hover = return_button_rect.collidepoint(mouse_pos)
+        widgets = [button_widget(return_button_rect, "Home", HOVER_COLOR if hover else BLUE, WHITE, font)]
+        if animation.path:
+            widgets.insert(0, animation.widget())
+        renderer.render(widgets)
+
+        # Once the whole path is shown, sleep until there is input
+        animating = not animation.finished(now)
+        for event in renderer.wait_events(timeout=0 if animating else None):
+            if event.type == QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == MOUSEBUTTONDOWN:
+                if return_button_rect.collidepoint(event.pos):
+                    waiting = False
+                    home_window()  # Return to the home window
+
+def draw_button_with_outline(screen, rect, text, bg_color, text_color, outline_color, font):
+    pygame.draw.rect(screen, bg_color, rect)
+    pygame.draw.rect(screen, outline_color, rect, 2)
+    text_surf = font.render(text, True, text_color)
+    text_rect = text_surf.get_rect(center=rect.center)
+    screen.blit(text_surf, text_rect)
+
+# Available Rooms Screen
+def available_rooms_screen(available_rooms, refresh=None):
+    """Show the free rooms as buttons; `refresh`, if given, is called every frame for an updated list."""
+    screen_width, screen_height = 1200, 700
+    available_window = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption("Available Rooms")
+    
+    # Load the background image
+    bg_image = assets.load_image("C:/Users/Asus/OneDrive/Desktop/myenv/AIwithHome/AI_final.proj/AI2.jpg", (screen_width, screen_height))  # Scaled to fit the screen
+
+    button_width = 200
+    button_height = 50
+    button_spacing = 10
+    font = pygame.font.Font(None, 36)
+
+    running = True
+    selected_room = None
+
+    # Grid settings; the layout works out the button rects once per change of the list or scroll
+    cols = 3  # Number of columns for the grid
+    nav_height = 80  # Room at the bottom for the page buttons
+    layout = GridLayout(len(available_rooms), cols, button_width, button_height,
+                        (0, 0, screen_width, screen_height - nav_height), spacing=button_spacing)
+
+    # Page buttons, shown when the rooms don't fit on one screen
+    nav_y = screen_height - nav_height + (nav_height - button_height) // 2
+    prev_rect = pygame.Rect(screen_width // 2 - 280, nav_y, 140, button_height)
+    page_rect = pygame.Rect(screen_width // 2 - 120, nav_y, 240, button_height)
+    next_rect = pygame.Rect(screen_width // 2 + 140, nav_y, 140, button_height)
+
+    renderer = DirtyRenderer(available_window, bg_image)
+
+    while running:
+        # Pick up timetable changes made while this screen is open
+        if refresh is not None:
+            rooms_now = refresh()
+            if rooms_now != available_rooms:
+                available_rooms = rooms_now
+                layout.set_count(len(available_rooms))
+
+        hovered = layout.hit(pygame.mouse.get_pos())
+
+        # Draw the room buttons in view; only buttons whose hover changed are repainted
+        buttons = [
+            button_widget(pygame.Rect(rect), available_rooms[index], BLUE if index != hovered else (0, 0, 180), WHITE, font)
+            for index, rect in layout.items()
+        ]
+        if layout.pages > 1:
+            buttons.append(button_widget(prev_rect, "< Prev", BLUE, WHITE, font))
+            buttons.append(button_widget(page_rect, f"Page {layout.page_number} of {layout.pages}", WHITE, BLACK, font))
+            buttons.append(button_widget(next_rect, "Next >", BLUE, WHITE, font))
+        renderer.render(buttons)
+
+        # Event handling; wake up every half second to check the timetable for changes
+        for event in renderer.wait_events(timeout=500 if refresh is not None else None):
+            if event.type == QUIT:
+                pygame.quit()
+                sys.exit()
+
+            if event.type == MOUSEWHEEL:
+                layout.scroll(-event.y)
+
+            # Handling room selection on click
+            if event.type == MOUSEBUTTONDOWN:
+                if event.button == 1:  # Left click
+                    if layout.pages > 1 and prev_rect.collidepoint(event.pos):
+                        layout.page(-1)
+                    elif layout.pages > 1 and next_rect.collidepoint(event.pos):
+                        layout.page(1)
+                    else:
+                        index = layout.hit(event.pos)  # The button under the click, if any
+                        if index is not None:
+                            selected_room = available_rooms[index]  # Set the selected room
+                            print(f"Selected room: {selected_room}")
+                            show_map_window_with_guide(selected_room)  # Show the map with guide
+                            running = False  # Stop the loop after selection
+                            break
+
+    pygame.quit()
+
+    # Handle user input for room selection
+    waiting = True
+    while waiting:
+        for event in pygame.event.get():
+            if event.type == MOUSEBUTTONDOWN:
+                if event.button == 1:
+                    for i, room in enumerate(available_rooms):
+                        room_button_rect = pygame.Rect(50, 100 + i * 60, 200, 40)
+                        if room_button_rect.collidepoint(event.pos):
+                            show_map_window_with_guide(room)
+
+                    waiting = False  # Stop the loop after handling an event
+
+
+# Draw Dropdown
+def draw_dropdown(surface, rect, options, selected_value, border_color, bg_color, font=FONT):
+    pygame.draw.rect(surface, border_color, rect, 2)
+    draw_text(surface, selected_value, BLACK, rect.x + 10, rect.y + 5, font)
+
+    if options:
+        for i, option in enumerate(options):
+            dropdown_rect = pygame.Rect(rect.x, rect.y + 40 + i * 40, rect.width, 40)
+            pygame.draw.rect(surface, bg_color, dropdown_rect)
+            draw_text(surface, option, BLACK, dropdown_rect.x + 10, dropdown_rect.y + 5, font)
+
+def draw_error_message(screen, message):
+    font = pygame.font.Font(None, 36)  # Default font and size 36
+    text = font.render(message, True, (255, 0, 0))  # Red color for the error message
+    screen.blit(text, (100, 250))  # Position the text at (100, 250)
+
+# Function to draw modern buttons with rounded corners and an outline
+def draw_button_with_outline(surface, rect, text, bg_color, text_color, outline_color=None, hover=False):
+    if outline_color:
+        pygame.draw.rect(surface, outline_color, rect, border_radius=10)  # Draw the outline
+    pygame.draw.rect(surface, bg_color, rect.inflate(-4, -4), border_radius=10)  # Draw the button (slightly smaller for the outline effect)
+    text_obj = FONT.render(text, True, text_color)
+    text_rect = text_obj.get_rect(center=rect.center)
+    surface.blit(text_obj, text_rect)
+
+
+# Helper functions for loading GIF frames and drawing UI
+def load_gif_frames(gif_path):
+    """Load frames from a GIF as Pygame surfaces scaled to the screen (cached, see assets.py)."""
+    return assets.load_gif_frames(gif_path, (screen_width, screen_height))
+
+def draw_text(surface, text, color, x, y, font):
+    """Draw text on the surface at the specified position."""
+    text_surface = font.render(text, True, color)
+    surface.blit(text_surface, (x, y))
+
+def draw_button_with_outline(surface, rect, text, bg_color, text_color, outline_color, font=None):
+    """Draw a button with an outline."""
+    pygame.draw.rect(surface, outline_color, rect.inflate(4, 4))  # Outline
+    pygame.draw.rect(surface, bg_color, rect)  # Button background
+    if font:
+        text_surface = font.render(text, True, text_color)
+        surface.blit(text_surface, (rect.x + (rect.width - text_surface.get_width()) // 2,
+                                    rect.y + (rect.height - text_surface.get_height()) // 2))
+
+def button_widget(rect, text, bg_color, text_color, font, outline_color=BLACK):
+    """A button as a DirtyRenderer widget; the outline reaches 2px past `rect`."""
+    def draw(surface):
+        draw_button_with_outline(surface, rect, text, bg_color, text_color, outline_color, font=font)
+    return rect.inflate(4, 4), (text, bg_color), draw
+
+# Main home window function
+def home_window():
+    """Display the home screen with an animated background and a Get Started button."""
+    pygame.init()
+    screen_width, screen_height = 1200, 700
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption("Room Finder - Home")
+    if core.ROUTE_TABLE is None:
+        precompute_routes()
+
+    # Load GIF frames
+    gif_path = "C:/Users/Asus/OneDrive/Desktop/myenv/AIwithHome/AI_final.proj/AI .gif"  # Path to your GIF
+    gif_frames = load_gif_frames(gif_path)
+    if not gif_frames:
+        print("Failed to load GIF frames!")
+        return
+
+    current_frame = 0
+    frame_delay = 50  # Delay in milliseconds between frames
+    last_update = pygame.time.get_ticks()
+
+    welcome_text = ""
+    get_started_text = "Get Started"
+    button_width, button_height = 200, 60
+    LARGE_FONT = pygame.font.Font(None, 48)
+
+    get_started_button_rect = pygame.Rect(
+        (screen_width - button_width) // 2,
+        (screen_height - button_height) // 2 + 50,
+        button_width,
+        button_height
+    )
+
+    running = True
+    while running:
+        # Update the frame if enough time has passed
+        now = pygame.time.get_ticks()
+        if now - last_update > frame_delay:
+            current_frame = (current_frame + 1) % len(gif_frames)
+            last_update = now
+
+        # Draw the current frame of the GIF
+        screen.blit(gif_frames[current_frame], (0, 0))
+
+        # Draw welcome text and button
+        draw_text(screen, welcome_text, (0, 0, 0), screen_width // 2 - 100, screen_height // 2 - 50, LARGE_FONT)
+
+        mouse_pos = pygame.mouse.get_pos()
+        hover = get_started_button_rect.collidepoint(mouse_pos)
+        draw_button_with_outline(
+            screen,
+            get_started_button_rect,
+            get_started_text,
+            (173, 216, 230) if hover else (0, 0, 255),  # Hover color: light blue
+            (255, 255, 255),
+            (0, 0, 0),
+            font=LARGE_FONT
+        )
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if hover:
+                    running = False
+
+        pygame.display.flip()
+
+    main()
+
+# Button sizes and positions
+button_width = 250
+button_height = 40
+button_spacing = 40
+screen_width, screen_height = 1200, 700
+
+# Center the buttons at the top of the screen
+time_button_rect = pygame.Rect((screen_width - button_width) // 2, 50, button_width, button_height)
+day_button_rect = pygame.Rect((screen_width - button_width) // 2, time_button_rect.bottom + button_spacing, button_width, button_height)
+submit_button_rect = pygame.Rect((screen_width - button_width) // 2, day_button_rect.bottom + button_spacing, button_width, button_height)
+
+
+# Main program loop
+def main():
+    # Classes added, moved or cancelled in the CSV show up without a restart
+    all_rooms, timetable = core.open_timetable()
+
+    screen_width, screen_height = 1200, 700
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption("Room Finder")
+    
+    # Load the background image
+    bg_image = assets.load_image("C:/Users/Asus/OneDrive/Desktop/myenv/AIwithHome/AI_final.proj/AI2.jpg", (screen_width, screen_height))  # bg image path
+
+    # Dropdown options
+    times = TIME_SLOTS
+    days = DAYS
+
+    selected_time = "Select Time"
+    selected_day = "Select Day"
+
+    time_dropdown_open = False
+    day_dropdown_open = False
+
+    # Button dimensions and placement
+    button_width = 270
+    button_height = 40
+    button_spacing = 20  # Reduced spacing for top placement
+
+    # Center top alignment
+    center_x = screen_width // 2
+    center_y = screen_height // 6  # Move elements closer to the top
+
+    time_button_rect = pygame.Rect(center_x - button_width // 2, center_y, button_width, button_height)
+    day_button_rect = pygame.Rect(center_x - button_width // 2, center_y + button_height + button_spacing, button_width, button_height)
+    submit_button_rect = pygame.Rect(center_x - button_width // 2, center_y + 2 * (button_height + button_spacing), button_width, button_height)
+
+    # Dropdown options hang below their button and scroll if they run off the screen
+    time_layout = GridLayout(len(times), 1, button_width, button_height,
+                             (time_button_rect.x, time_button_rect.bottom, button_width, screen_height - time_button_rect.bottom),
+                             center=False)
+    day_layout = GridLayout(len(days), 1, button_width, button_height,
+                            (day_button_rect.x, day_button_rect.bottom, button_width, screen_height - day_button_rect.bottom),
+                            center=False)
+
+    # Load a font
+    font = pygame.font.Font(None, 36)
+
+    renderer = DirtyRenderer(screen, bg_image)
+
+    running = True
+    while running:
+        mouse_pos = pygame.mouse.get_pos()
+
+        # Draw buttons
+        widgets = [
+            button_widget(time_button_rect, selected_time, (0, 0, 255), (255, 255, 255), font),
+            button_widget(day_button_rect, selected_day, (0, 0, 255), (255, 255, 255), font),
+            button_widget(submit_button_rect, "Find Available Rooms", (0, 0, 255), (255, 255, 255), font),
+        ]
+
+        # Draw dropdowns if open
+        if time_dropdown_open:
+            hovered = time_layout.hit(mouse_pos)
+            for i, rect in time_layout.items():
+                widgets.append(button_widget(pygame.Rect(rect), times[i], (173, 216, 230) if i == hovered else (255, 255, 255), (0, 0, 0), font))
+
+        if day_dropdown_open:
+            hovered = day_layout.hit(mouse_pos)
+            for i, rect in day_layout.items():
+                widgets.append(button_widget(pygame.Rect(rect), days[i], (173, 216, 230) if i == hovered else (255, 255, 255), (0, 0, 0), font))
+
+        # Only the regions that changed since the last frame are redrawn
+        renderer.render(widgets)
+
+        for event in renderer.wait_events():
+            if event.type == QUIT:
+                running = False
+
+            if event.type == MOUSEWHEEL:
+                if time_dropdown_open:
+                    time_layout.scroll(-event.y)
+                elif day_dropdown_open:
+                    day_layout.scroll(-event.y)
+
+            if event.type == MOUSEBUTTONDOWN and event.button == 1:
+                # A click on an open dropdown only picks an option
+                dropdown_was_open = time_dropdown_open or day_dropdown_open
+
+                # Time dropdown logic
+                if time_button_rect.collidepoint(event.pos):
+                    time_dropdown_open = not time_dropdown_open
+                    day_dropdown_open = False
+                elif time_dropdown_open:
+                    i = time_layout.hit(event.pos)
+                    if i is not None:
+                        selected_time = times[i]
+                        time_dropdown_open = False
+
+                # Day dropdown logic
+                if day_button_rect.collidepoint(event.pos):
+                    day_dropdown_open = not day_dropdown_open
+                    time_dropdown_open = False
+                elif day_dropdown_open:
+                    i = day_layout.hit(event.pos)
+                    if i is not None:
+                        selected_day = days[i]
+                        day_dropdown_open = False
+
+                # Submit button logic
+                if submit_button_rect.collidepoint(event.pos) and not dropdown_was_open:
+                    if selected_time != "Select Time" and selected_day != "Select Day":
+                        def refresh(time=selected_time, day=selected_day):
+                            timetable.poll()
+                            return timetable.free_rooms(time, day)
+
+                        available_rooms_screen(refresh(), refresh)
+                        renderer.invalidate()  # the rooms screen drew over this one
+                    else:
+                        print("Error: Please select both time and day.")
+
+    pygame.quit()